@@ -0,0 +1,133 @@
+# bench/bench_finalize.py
+# finalize_columns 마이크로벤치마크 (API 호출 없음, 합성 데이터)
+# - 기존 구현(행 단위 iterrows 주소 + 컬럼별 정규식 숫자 변환)과 현재 land.finalize_columns 비교
+# - 결과가 같은지 확인한 뒤 best-of-N 시간 출력
+#
+# 사용 예)
+#   python bench/bench_finalize.py              → 50,000행(한 달치 전월세 규모)
+#   python bench/bench_finalize.py -n 200000 -r 5
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import land  # noqa: E402
+
+REGIONS = ["서울특별시_강남구", "서울특별시_송파구", "경기도_성남시_분당구", "경기도_용인시_수지구"]
+
+# ==========================
+# 합성 item (RTMS 아파트 전월세 응답 형태, iter_rtms 출력과 동일하게 빈 값은 None)
+# ==========================
+def make_items(n: int, seed: int = 0) -> list[dict]:
+    rnd = random.Random(seed)
+    items = []
+    for _ in range(n):
+        road = rnd.random() < 0.9
+        items.append({
+            "umdNm": rnd.choice(["역삼동", "잠실동", "정자동", "풍덕천동"]),
+            "jibun": rnd.choice([f"{rnd.randint(1, 999)}-{rnd.randint(1, 30)}", str(rnd.randint(1, 999)), None]),
+            "aptNm": f"단지{rnd.randint(1, 300)}",
+            "excluUseAr": f"{rnd.uniform(20, 200):.4f}",
+            "floor": str(rnd.randint(-1, 40)),
+            "deposit": f"{rnd.randint(1000, 150000):,}",
+            "monthlyRent": str(rnd.choice([0, 0, 30, 80, 150])),
+            "buildYear": str(rnd.randint(1975, 2024)),
+            "contractTerm": rnd.choice([None, "25.03~27.03"]),
+            "contractType": rnd.choice([None, "신규", "갱신"]),
+            "preDeposit": rnd.choice([None, "50,000"]),
+            "preMonthlyRent": rnd.choice([None, "0", "60"]),
+            "dealYear": "2025",
+            "dealMonth": "9",
+            "dealDay": str(rnd.randint(1, 30)),
+            "roadNm": rnd.choice(["테헤란로", "올림픽로", "정자일로"]) if road else None,
+            "roadNmBonbun": f"{rnd.randint(1, 500):05d}" if road else None,
+            "roadNmBubun": rnd.choice(["00000", f"{rnd.randint(1, 20):05d}"]) if road else None,
+        })
+    return items
+
+# ==========================
+# 기존 구현 (비교 기준)
+# ==========================
+_NULLS = {"": None, "None": None, "none": None, "NULL": None, "null": None, "NaN": None, "nan": None, "-": None}
+
+def legacy_to_int_series(s: pd.Series) -> pd.Series:
+    return (
+        pd.to_numeric(
+            s.astype(str)
+             .str.replace(",", "", regex=False)
+             .str.replace(r"\s+", "", regex=True)
+             .replace(_NULLS),
+            errors="coerce"
+        ).astype("Int64")
+    )
+
+def legacy_to_float_series(s: pd.Series) -> pd.Series:
+    return pd.to_numeric(
+        s.astype(str)
+         .str.replace(",", "", regex=False)
+         .str.replace(r"\s+", "", regex=True)
+         .replace(_NULLS),
+        errors="coerce"
+    )
+
+def legacy_finalize_columns(df: pd.DataFrame, region_name: pd.Series, type_label: str) -> pd.DataFrame:
+    parts = region_name.astype(str).str.split("_", n=1)
+    df["유형"] = type_label
+    df["시/도"] = parts.str[0].to_numpy(dtype=object)
+    df["구/시"] = parts.str[1].fillna("").str.replace("_", " ", regex=False).to_numpy(dtype=object)
+    for c in land.INT_COLS:
+        if c in df.columns:
+            df[c] = legacy_to_int_series(df[c])
+    for c in land.FLOAT_COLS:
+        if c in df.columns:
+            df[c] = legacy_to_float_series(df[c])
+    df["주소"] = [
+        land.compose_address(gu_si=g, jibun=row.get("지번", ""), road=row.get("도로명", ""))
+        for g, (_, row) in zip(df["구/시"], df.iterrows())
+    ]
+    for c in land.FINAL_COLS:
+        if c not in df.columns:
+            df[c] = pd.NA
+    return land.apply_final_display(df[land.FINAL_COLS].copy())
+
+# ==========================
+# 실행
+# ==========================
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main():
+    ap = argparse.ArgumentParser(description="finalize_columns 기존/현재 구현 비교")
+    ap.add_argument("-n", "--rows", type=int, default=50_000, help="행 수 (기본 50000)")
+    ap.add_argument("-r", "--repeat", type=int, default=3, help="반복 횟수 (최솟값 사용)")
+    args = ap.parse_args()
+
+    items = make_items(args.rows)
+    regions = pd.Series([REGIONS[i * len(REGIONS) // len(items)] for i in range(len(items))], dtype=object)
+    base = land.normalize_items("apt_rt", items)
+    label = land.SHEET_NAMES["apt_rt"]
+
+    old = legacy_finalize_columns(base.copy(), regions, label)
+    new = land.finalize_columns(base.copy(), regions, label)
+    pd.testing.assert_frame_equal(old, new)
+
+    t_old = best_of(lambda: legacy_finalize_columns(base.copy(), regions, label), args.repeat)
+    t_new = best_of(lambda: land.finalize_columns(base.copy(), regions, label), args.repeat)
+    print(f"[i] rows={len(base):,} pandas={pd.__version__}")
+    print(f"    legacy : {t_old * 1000:8.1f} ms")
+    print(f"    current: {t_new * 1000:8.1f} ms  (x{t_old / t_new:.1f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+# bench/bench_pipeline.py
+# 파이프라인 단계별 오프라인 벤치마크 (실제 API 호출 없음 — bench/mock_servers.py 대역 서버 사용)
+# - 규모: 1x(한 달치, 지역 2개) / 10x / 100x — 지역당 건수는 같고 지역 수만 늘림 (bench/synth.py)
+# - 단계(실제 코드 경로 그대로):
+#     fetch          land.collect_month           (RTMS 대역 서버, 페이지 병렬, 응답 캐시 끔)
+#     normalize      land.build_month_frames
+#     xlsx_write     land.write_month_xlsx        / xlsx_read    land.read_month_output
+#     parquet_write  dataset.write_month          / parquet_read dataset.read_month   (pyarrow 있을 때)
+#     geocode        pending_addresses → geocode_addresses(카카오 대역) → apply_coords (빈 캐시에서 시작)
+#     geojson        sheet_features → write_geojson (GeoJSON + 컴팩트 + 타일 + 검색 요약/색인 + manifest)
+# - 결과: bench/results/pipeline_<시각>.json (환경/설정/단계별 초·행수·요청수) → --compare로 이전 결과와 비교
+#
+# 사용 예)
+#   python bench/bench_pipeline.py                          → 1x, 10x 전체 단계
+#   python bench/bench_pipeline.py -s 100x --stages fetch,normalize,parquet_write,parquet_read
+#   python bench/bench_pipeline.py --latency 30 --error-rate 0.02 -w 16
+#   python bench/bench_pipeline.py --compare bench/results/pipeline_20251101_120000.json   (느려지면 종료 코드 1)
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "bench"))
+import dataset  # noqa: E402
+import geocode_and_export as ge  # noqa: E402
+import geocode_store  # noqa: E402
+import http_session  # noqa: E402
+import land  # noqa: E402
+import synth  # noqa: E402
+from mock_servers import KakaoServer, RtmsServer  # noqa: E402
+
+STAGES = ["fetch", "normalize", "xlsx_write", "xlsx_read", "parquet_write", "parquet_read", "geocode", "geojson"]
+RESULTS_DIR = ROOT / "bench" / "results"
+YM = "202511"
+VERSION = "v2511010000"
+RETRY_WAIT = 0.05  # 대역 서버 오류 재시도 대기(초) — 실제 백오프(1~8초)를 기다리면 벤치가 지연 측정이 아니게 됨
+
+# ==========================
+# 측정
+# ==========================
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def best_of(fn, repeat: int):
+    """repeat번 중 가장 빠른 시간 (반환값은 마지막 실행 것)"""
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        out, dt = timed(fn)
+        best = min(best, dt)
+    return out, best
+
+
+def rows_of(frames: dict[str, pd.DataFrame]) -> int:
+    return sum(len(df) for df in frames.values())
+
+# ==========================
+# 규모 1개 실행
+# ==========================
+def run_scale(label: str, scale: int, stages: list[str], args, rtms: RtmsServer, kakao: KakaoServer) -> list[dict]:
+    work = Path(tempfile.mkdtemp(prefix=f"bench_{label}_"))
+    try:
+        return _run_scale(label, synth.regions(scale), stages, args, rtms, kakao, work)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def _run_scale(label: str, regions: dict[str, str], stages: list[str], args,
+               rtms: RtmsServer, kakao: KakaoServer, work: Path) -> list[dict]:
+    results: list[dict] = []
+    state: dict = {}
+
+    def record(stage: str, seconds: float, rows: int, server: RtmsServer | KakaoServer | None = None, **extra):
+        r = {"scale": label, "stage": stage, "seconds": round(seconds, 4), "rows": rows,
+             "rows_per_s": round(rows / seconds) if seconds > 0 else None, **extra}
+        if server is not None:
+            r.update(requests=server.stats["requests"], errors=server.stats["errors"], bytes=server.stats["bytes"])
+        results.append(r)
+        print(f"[i] {label:>4} {stage:<13} {seconds:8.3f}s  rows={rows:,}" +
+              (f"  req={r['requests']:,} err={r['errors']:,}" if server is not None else ""))
+
+    # 대역 서버 응답 item을 미리 생성(합성 시간이 fetch 측정에 섞이지 않게)
+    for lawd_cd in regions.values():
+        for key in land.SHEET_NAMES:
+            rtms.items(key, lawd_cd, YM)
+
+    # fetch는 다른 단계의 입력 → 요청하지 않았어도 한 번은 수집
+    def fetch():
+        rtms.reset_stats()
+        return land.collect_month(YM, regions, args.workers)[0]
+    results_raw, dt = timed(fetch)
+    n_items = sum(len(v[0]) for v in results_raw.values())
+    if "fetch" in stages:
+        record("fetch", dt, n_items, rtms, regions=len(regions))
+
+    frames, dt = best_of(lambda: land.build_month_frames(regions, results_raw), args.repeat if "normalize" in stages else 1)
+    if "normalize" in stages:
+        record("normalize", dt, rows_of(frames))
+    sheets = lambda: {land.SHEET_NAMES[k]: frames[k].copy() for k in land.SHEET_NAMES}
+
+    if "xlsx_write" in stages or "xlsx_read" in stages:
+        xlsx = work / f"실거래_{YM}_{VERSION}.xlsx"
+        _, dt = best_of(lambda: land.write_month_xlsx(xlsx, frames), args.repeat)
+        if "xlsx_write" in stages:
+            record("xlsx_write", dt, rows_of(frames), bytes=xlsx.stat().st_size)
+        if "xlsx_read" in stages:
+            back, dt = best_of(lambda: land.read_month_output(xlsx), args.repeat)
+            record("xlsx_read", dt, rows_of(back))
+
+    if ("parquet_write" in stages or "parquet_read" in stages) and not dataset.available():
+        print("[!] pyarrow 없음 → parquet 단계 건너뜀")
+    elif "parquet_write" in stages or "parquet_read" in stages:
+        root = work / "dataset"
+        _, dt = best_of(lambda: dataset.write_month(root, dataset.TRADES, YM, sheets(), VERSION), args.repeat)
+        size = sum(p.stat().st_size for p in root.rglob("*.parquet"))
+        if "parquet_write" in stages:
+            record("parquet_write", dt, rows_of(frames), bytes=size)
+        if "parquet_read" in stages:
+            back, dt = best_of(lambda: dataset.read_month(root, dataset.TRADES, YM), args.repeat)
+            record("parquet_read", dt, rows_of(back))
+
+    if "geocode" in stages or "geojson" in stages:
+        def geocode():
+            kakao.reset_stats()
+            geo = sheets()
+            for df in geo.values():
+                ge.prepare_sheet(df)
+            cache_path = work / f"geocode_{time.perf_counter_ns()}" / geocode_store.DB_NAME
+            cache_path.parent.mkdir()
+            cache = ge.load_cache(cache_path)
+            addrs = ge.pending_addresses(geo.values(), cache)
+            ge.geocode_addresses(addrs, "bench", cache, workers=args.workers)
+            ge.save_cache(cache)
+            for df in geo.values():
+                ge.apply_coords(df, cache)
+            cache.close()
+            state["addrs"] = len(addrs)
+            return geo
+        geo, dt = best_of(geocode, args.repeat if "geocode" in stages else 1)
+        if "geocode" in stages:
+            record("geocode", dt, state["addrs"], kakao, sheet_rows=rows_of(geo))
+
+        if "geojson" in stages:
+            def export():
+                out = work / f"export_{time.perf_counter_ns()}" / "data" / YM[:4] / "geojson" / f"실거래_{YM}_{VERSION}.geojson"
+                out.parent.mkdir(parents=True)
+                ge.write_geojson(out, (ge.sheet_features(name, df) for name, df in geo.items()))
+                ge.flush_search_index()  # 실제 실행처럼 끝에 검색 색인 1번
+                return out
+            out, dt = best_of(export, args.repeat)
+            record("geojson", dt, rows_of(geo), bytes=out.stat().st_size)
+
+    return results
+
+# ==========================
+# 결과 저장/비교
+# ==========================
+def environment() -> dict:
+    def git(*cmd):
+        try:
+            return subprocess.run(["git", *cmd], cwd=ROOT, capture_output=True, text=True, timeout=10).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            return None
+    try:
+        import pyarrow
+        pa_version = pyarrow.__version__
+    except ImportError:
+        pa_version = None
+    return {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "git": git("rev-parse", "--short", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(), "pandas": pd.__version__, "pyarrow": pa_version,
+        "platform": platform.platform(), "cpus": os.cpu_count(),
+    }
+
+
+def compare(results: list[dict], base_path: Path, threshold: float) -> list[str]:
+    """같은 (규모, 단계)끼리 시간 비교 → threshold배보다 느려진 항목 설명 목록"""
+    base = {(r["scale"], r["stage"]): r for r in json.loads(base_path.read_text(encoding="utf-8"))["results"]}
+    slower = []
+    print(f"[i] 비교 기준: {base_path}")
+    for r in results:
+        b = base.get((r["scale"], r["stage"]))
+        if b is None or not b["seconds"]:
+            continue
+        ratio = r["seconds"] / b["seconds"]
+        mark = "  ← 느려짐" if ratio > threshold else ""
+        print(f"    {r['scale']:>4} {r['stage']:<13} {b['seconds']:8.3f}s → {r['seconds']:8.3f}s  x{ratio:.2f}{mark}")
+        if mark:
+            slower.append(f"{r['scale']} {r['stage']} x{ratio:.2f}")
+    return slower
+
+
+def main():
+    ap = argparse.ArgumentParser(description="파이프라인 단계별 오프라인 벤치마크 (RTMS/카카오 대역 서버)")
+    ap.add_argument("-s", "--scales", default="1x,10x", help=f"쉼표 구분 ({', '.join(synth.SCALES)})")
+    ap.add_argument("--stages", default=",".join(STAGES), help=f"쉼표 구분 ({', '.join(STAGES)})")
+    ap.add_argument("-r", "--repeat", type=int, default=1, help="로컬 단계 반복 횟수(가장 빠른 값 기록, fetch는 1회)")
+    ap.add_argument("-w", "--workers", type=int, default=land.MAX_WORKERS, help="수집/지오코딩 스레드 수")
+    ap.add_argument("--latency", type=float, default=0.0, help="대역 서버 요청당 지연(ms)")
+    ap.add_argument("--jitter", type=float, default=0.0, help="지연 편차(ms, ±)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="대역 서버 오류 응답 비율 (0~1, 재시도 경로 측정)")
+    ap.add_argument("-o", "--out", type=Path, help="결과 JSON 경로 (기본 bench/results/pipeline_<시각>.json)")
+    ap.add_argument("--compare", type=Path, help="이전 결과 JSON과 비교 (느려진 단계가 있으면 종료 코드 1)")
+    ap.add_argument("--threshold", type=float, default=1.25, help="--compare에서 느려짐으로 볼 배율")
+    args = ap.parse_args()
+
+    scales = [s.strip() for s in args.scales.split(",") if s.strip()]
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in scales if s not in synth.SCALES] + [s for s in stages if s not in STAGES]
+    if unknown:
+        ap.error(f"알 수 없는 규모/단계: {', '.join(unknown)}")
+
+    # 실제 코드 경로 그대로, 바깥으로 나가는 것만 대역 서버로
+    land.SERVICE_KEY_ENC = "bench"
+    land.USE_CACHE = land.FROM_CACHE = False
+    land.request_rtms.retry.wait = land.wait_exponential(multiplier=RETRY_WAIT, max=RETRY_WAIT * 4)
+    ge.LOCAL_MODE = "off"          # 오프라인 색인 없이 전부 카카오(대역)로
+    ge.BACKOFF_BASE = RETRY_WAIT
+    ge.GEOJSON_INDENT = None
+    http_session.configure(pool_size=args.workers * land.PAGE_WORKERS)
+
+    kw = dict(latency_ms=args.latency, jitter_ms=args.jitter, error_rate=args.error_rate)
+    results = []
+    with RtmsServer(**kw) as rtms, KakaoServer(**kw) as kakao:
+        land.ENDPOINTS = rtms.endpoints(land.ENDPOINTS)
+        ge.KAKAO_ADDRESS_URL = kakao.url
+        for label in scales:
+            results.extend(run_scale(label, synth.SCALES[label], stages, args, rtms, kakao))
+
+    out = args.out or RESULTS_DIR / f"pipeline_{datetime.now():%Y%m%d_%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    config = {k: v for k, v in vars(args).items() if k not in ("out", "compare")}
+    report = {"meta": environment(), "config": {**config, "ym": YM}, "results": results}
+    out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"[✓] Saved: {out}")
+
+    if args.compare:
+        slower = compare(results, args.compare, args.threshold)
+        if slower:
+            print(f"[!] 느려진 단계 {len(slower)}개 (>{args.threshold:g}배): {', '.join(slower)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+# bench/mock_servers.py
+# 오프라인 벤치마크용 RTMS / 카카오 주소 검색 대역 서버 (로컬 HTTP, 표준 라이브러리만 사용)
+# - RTMS: /<엔드포인트 이름>?serviceKey=&LAWD_CD=&DEAL_YMD=&pageNo=&numOfRows=
+#     → 실제 응답과 같은 XML(response/header/body/items/item, numOfRows/pageNo/totalCount), 페이지 나눔
+#     엔드포인트 이름(getRTMSDataSvcAptRent 등)은 land.ENDPOINTS URL의 마지막 경로를 그대로 사용
+#     item은 bench/synth.py가 (엔드포인트, LAWD_CD, 월)로 결정적으로 생성 → 같은 질의는 항상 같은 응답
+# - 카카오: /v2/local/search/address.json?query= → {"documents": [...], "meta": {...}}
+# - 공통: 지연(latency_ms ± jitter_ms), 오류율(error_rate — 일부 요청을 503/429/API 오류 코드로 응답)
+#     요청/오류 수는 server.stats에 누적 (벤치 결과에 함께 기록)
+#
+# 사용 예)
+#   python bench/mock_servers.py --latency 20 --error-rate 0.01   → 두 서버를 띄우고 주소 출력 (Ctrl+C로 종료)
+#
+#   from mock_servers import RtmsServer, KakaoServer
+#   with RtmsServer(latency_ms=20) as rtms, KakaoServer() as kakao:
+#       land.ENDPOINTS = rtms.endpoints(land.ENDPOINTS)
+#       ge.KAKAO_ADDRESS_URL = kakao.url
+
+from __future__ import annotations
+
+import abc
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import synth  # noqa: E402
+
+# land.ENDPOINTS URL 마지막 경로 → 시트 키 (land.py BASE_* 와 같은 이름)
+RTMS_PATHS = {
+    "getRTMSDataSvcAptTradeDev": "apt_tr",
+    "getRTMSDataSvcAptRent": "apt_rt",
+    "getRTMSDataSvcRHTrade": "rh_tr",
+    "getRTMSDataSvcRHRent": "rh_rt",
+    "getRTMSDataSvcSHTrade": "sh_tr",
+    "getRTMSDataSvcSHRent": "sh_rt",
+}
+KAKAO_PATH = "/v2/local/search/address.json"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive (http_session 커넥션 풀이 실제처럼 재사용)
+    disable_nagle_algorithm = True  # 헤더/본문을 따로 쓰므로 끄지 않으면 keep-alive 요청마다 지연 ACK(~40ms) 대기
+
+    def log_message(self, fmt, *args):  # 요청마다 stderr 출력하지 않음
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: dict | None = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server: MockServer = self.server.owner
+        url = urlsplit(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        server.delay()
+        fault = server.fault()
+        try:
+            server.handle(self, url.path, params, fault)
+        except Exception as e:  # 대역 서버 버그는 500으로 (벤치가 멈추지 않게)
+            server.count("errors")
+            self._send(500, f"{type(e).__name__}: {e}".encode("utf-8"), "text/plain; charset=utf-8")
+
+
+class MockServer(abc.ABC):
+    """127.0.0.1 임의 포트의 ThreadingHTTPServer (with 문으로 시작/종료) — 하위 클래스가 handle 구현"""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.latency_ms, self.jitter_ms, self.error_rate = latency_ms, jitter_ms, error_rate
+        self._rnd = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "bytes": 0}
+        self._httpd: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    # ---- 시작/종료 ----
+    def start(self) -> "MockServer":
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.owner = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # ---- 지연/오류/집계 ----
+    def count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += n
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats = {k: 0 for k in self.stats}
+
+    def delay(self) -> None:
+        if self.latency_ms > 0 or self.jitter_ms > 0:
+            with self._lock:
+                ms = self.latency_ms + self._rnd.uniform(-self.jitter_ms, self.jitter_ms)
+            time.sleep(max(0.0, ms) / 1000)
+
+    def fault(self) -> str | None:
+        """이번 요청에 낼 오류 종류 (없으면 None)"""
+        with self._lock:
+            self.stats["requests"] += 1
+            if self.error_rate <= 0 or self._rnd.random() >= self.error_rate:
+                return None
+            self.stats["errors"] += 1
+            return self._rnd.choice(self.FAULTS)
+
+    FAULTS: tuple[str, ...] = ("503",)
+
+    @abc.abstractmethod
+    def handle(self, h: _Handler, path: str, params: dict, fault: str | None) -> None:
+        """요청 1건 응답 (path/params: 요청 경로와 쿼리, fault: 이번 요청에 낼 오류 종류 또는 None)"""
+
+    def reply(self, h: _Handler, status: int, body: bytes, content_type: str, headers: dict | None = None):
+        self.count("bytes", len(body))
+        h._send(status, body, content_type, headers)
+
+
+class RtmsServer(MockServer):
+    """
+    RTMS 실거래 API 대역. 오류 종류: 503(HTTP), api(헤더 resultCode=99 — land.APICallError로 재시도)
+    volume: 지역·엔드포인트·월마다 item 수 배율 (기본 1 = synth.MONTH_VOLUME)
+    """
+    FAULTS = ("503", "api")
+
+    def __init__(self, volume: float = 1.0, **kw):
+        super().__init__(**kw)
+        self.volume = volume
+        self._items: dict[tuple[str, str, str], list[dict]] = {}
+
+    def endpoints(self, endpoints: dict[str, str]) -> dict[str, str]:
+        """land.ENDPOINTS와 같은 키 → 이 서버 URL (경로 이름은 그대로)"""
+        return {k: f"{self.base_url}/{url.rstrip('/').rsplit('/', 1)[-1]}" for k, url in endpoints.items()}
+
+    def items(self, key: str, lawd_cd: str, ym: str) -> list[dict]:
+        cached = self._items.get((key, lawd_cd, ym))
+        if cached is None:
+            n = round(synth.MONTH_VOLUME[key] * self.volume)
+            cached = self._items.setdefault((key, lawd_cd, ym), synth.rtms_items(key, lawd_cd, ym, n))
+        return cached
+
+    def handle(self, h, path, params, fault):
+        key = RTMS_PATHS.get(path.rstrip("/").rsplit("/", 1)[-1])
+        if key is None:
+            return self.reply(h, 404, b"not found", "text/plain")
+        if fault == "503":
+            return self.reply(h, 503, b"Service Unavailable", "text/plain")
+        if fault == "api" or not params.get("serviceKey"):
+            body = synth.rtms_xml([], 1, 0, 0, code="99", msg="LIMITED NUMBER OF SERVICE REQUESTS EXCEEDS ERROR")
+            return self.reply(h, 200, body, "application/xml;charset=UTF-8")
+        page, rows = int(params.get("pageNo", 1)), int(params.get("numOfRows", 10))
+        items = self.items(key, params.get("LAWD_CD", ""), params.get("DEAL_YMD", ""))
+        body = synth.rtms_xml(items[(page - 1) * rows: page * rows], page, rows, len(items))
+        self.reply(h, 200, body, "application/xml;charset=UTF-8")
+
+
+class KakaoServer(MockServer):
+    """카카오 주소 검색 대역. 오류 종류: 503, 429(Retry-After: 0 → 클라이언트는 BACKOFF_BASE 백오프)"""
+    FAULTS = ("503", "429")
+
+    def __init__(self, not_found_rate: float = 0.02, **kw):
+        super().__init__(**kw)
+        self.not_found_rate = not_found_rate
+
+    @property
+    def url(self) -> str:
+        return self.base_url + KAKAO_PATH
+
+    def handle(self, h, path, params, fault):
+        if path != KAKAO_PATH:
+            return self.reply(h, 404, b"not found", "text/plain")
+        if not h.headers.get("Authorization", "").startswith("KakaoAK "):
+            return self.reply(h, 401, b'{"errorType":"AccessDeniedError"}', "application/json")
+        if fault == "503":
+            return self.reply(h, 503, b'{"errorType":"ServiceUnavailable"}', "application/json")
+        if fault == "429":
+            return self.reply(h, 429, b'{"errorType":"RateLimitExceeded"}', "application/json", {"Retry-After": "0"})
+        docs = synth.kakao_documents(params.get("query", ""), self.not_found_rate)
+        body = json.dumps({"documents": docs, "meta": {"total_count": len(docs), "pageable_count": len(docs),
+                                                       "is_end": True}}, ensure_ascii=False)
+        self.reply(h, 200, body.encode("utf-8"), "application/json;charset=UTF-8")
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="RTMS/카카오 대역 서버 실행 (벤치마크/오프라인 개발용)")
+    ap.add_argument("--latency", type=float, default=0.0, help="요청당 지연(ms)")
+    ap.add_argument("--jitter", type=float, default=0.0, help="지연 편차(ms, ±)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="오류 응답 비율 (0~1)")
+    args = ap.parse_args(argv)
+    kw = dict(latency_ms=args.latency, jitter_ms=args.jitter, error_rate=args.error_rate)
+    with RtmsServer(**kw) as rtms, KakaoServer(**kw) as kakao:
+        print(f"[i] RTMS : {rtms.base_url}/<{'|'.join(RTMS_PATHS)}>")
+        print(f"[i] Kakao: {kakao.url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            print(f"[i] RTMS {rtms.stats} / Kakao {kakao.stats}")
+
+
+if __name__ == "__main__":
+    main()
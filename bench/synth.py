@@ -0,0 +1,126 @@
+# bench/synth.py
+# 벤치마크용 합성 데이터 — RTMS 응답 item / XML, 지역 목록, 카카오 주소 검색 결과
+# - 한 달 규모(1x): data/2025 실거래_202511(강남구 + 분당구, 3,580건)의 엔드포인트별 건수를 지역 2개로 나눈 값
+#     10x/100x는 같은 지역당 건수로 지역 수를 늘림(실제로 수집 지역이 늘어나는 모양 그대로)
+# - 같은 지역 안에서는 단지/번지 풀에서 골라 주소가 반복됨(지오코딩 캐시/중복 제거가 실제처럼 동작)
+# - 모두 (지역 코드, 엔드포인트, 월, seed)로 결정적 → 서버를 다시 띄워도 같은 응답
+#
+# 사용 예)
+#   import synth
+#   regions = synth.regions(10)                          → {"서울특별시_강남구": "11680", ...} (지역 20개)
+#   items = synth.rtms_items("apt_rt", "11680", "202511") → 지역 1개 한 달치 item 목록
+#   synth.rtms_xml(items[:1000], page=1, rows=1000, total=len(items))
+
+from __future__ import annotations
+
+import hashlib
+import random
+from xml.sax.saxutils import escape
+
+# 1x 지역당 건수 (실거래_202511 3,580건 / 지역 2개)
+MONTH_VOLUME = {"apt_tr": 88, "apt_rt": 1245, "rh_tr": 18, "rh_rt": 206, "sh_tr": 2, "sh_rt": 232}
+SCALES = {"1x": 1, "10x": 10, "100x": 100}
+
+SEOUL_GU = [
+    "강남구", "강동구", "강북구", "강서구", "관악구", "광진구", "구로구", "금천구", "노원구", "도봉구",
+    "동대문구", "동작구", "마포구", "서대문구", "서초구", "성동구", "성북구", "송파구", "양천구", "영등포구",
+    "용산구", "은평구", "종로구", "중구", "중랑구",
+]
+DONGS = ["역삼동", "대치동", "개포동", "삼성동", "도곡동", "일원동", "수서동", "세곡동", "자곡동", "율현동"]
+BRANDS = ["래미안", "자이", "힐스테이트", "푸르지오", "아이파크", "롯데캐슬", "더샵", "e편한세상", "센트레빌", "현대"]
+ROADS = ["테헤란로", "언주로", "선릉로", "도곡로", "삼성로", "남부순환로", "영동대로", "봉은사로"]
+COMPLEXES_PER_REGION = 300
+
+
+def regions(scale: int) -> dict[str, str]:
+    """지역 2 × scale개: 서울 25개 구를 먼저, 그 뒤는 "경기도_벤치시_N구" (LAWD_CD는 5자리 가짜 코드)"""
+    out = {}
+    for i in range(2 * scale):
+        name = f"서울특별시_{SEOUL_GU[i]}" if i < len(SEOUL_GU) else f"경기도_벤치시_{i}구"
+        out[name] = f"{11000 + i * 10:05d}"
+    return out
+
+
+def _rng(*parts) -> random.Random:
+    return random.Random(hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest())
+
+
+def _complexes(lawd_cd: str) -> list[dict]:
+    rnd = _rng("complex", lawd_cd)
+    out = []
+    for i in range(COMPLEXES_PER_REGION):
+        road = rnd.random() < 0.9
+        out.append({
+            "name": f"{rnd.choice(DONGS)[:-1]}{rnd.choice(BRANDS)}{rnd.randint(1, 5)}차",
+            "umdNm": rnd.choice(DONGS),
+            "jibun": f"{rnd.randint(1, 999)}-{rnd.randint(1, 30)}" if rnd.random() < 0.7 else str(rnd.randint(1, 999)),
+            "roadNm": rnd.choice(ROADS) if road else None,
+            "roadNmBonbun": f"{rnd.randint(1, 500):05d}" if road else None,
+            "roadNmBubun": rnd.choice(["00000", f"{rnd.randint(1, 20):05d}"]) if road else None,
+            "buildYear": str(rnd.randint(1975, 2024)),
+        })
+    return out
+
+
+def rtms_items(key: str, lawd_cd: str, ym: str, n: int | None = None, seed: int = 0) -> list[dict]:
+    """엔드포인트(land.SHEET_NAMES 키) 하나, 지역 하나, 한 달치 item (RTMS 응답 태그 그대로, 빈 값은 None)"""
+    n = MONTH_VOLUME[key] if n is None else n
+    rnd = _rng("items", key, lawd_cd, ym, seed)
+    pool = _complexes(lawd_cd)
+    trade = key.endswith("_tr")
+    items = []
+    for _ in range(n):
+        c = rnd.choice(pool)
+        area = rnd.uniform(20, 200)
+        item = {
+            "umdNm": c["umdNm"], "jibun": c["jibun"],
+            "roadNm": c["roadNm"], "roadNmBonbun": c["roadNmBonbun"], "roadNmBubun": c["roadNmBubun"],
+            "buildYear": c["buildYear"],
+            "dealYear": ym[:4], "dealMonth": str(int(ym[4:])), "dealDay": str(rnd.randint(1, 28)),
+        }
+        if key.startswith("apt"):
+            item.update({"aptNm": c["name"], "aptDong": rnd.choice([None, f"{rnd.randint(101, 120)}동"]),
+                         "excluUseAr": f"{area:.4f}", "floor": str(rnd.randint(1, 40))})
+        elif key.startswith("rh"):
+            item.update({"mhouseNm": c["name"], "houseType": rnd.choice(["연립", "다세대"]),
+                         "excluUseAr": f"{area / 2:.2f}", "floor": str(rnd.randint(1, 6)),
+                         "landAr": f"{area / 3:.2f}"})
+        else:
+            item.update({"totalFloorAr": f"{area * 1.5:.2f}", "plottageAr": f"{area:.2f}",
+                         "houseType": rnd.choice(["단독", "다가구"])})
+        if trade:
+            item["dealAmount"] = f"{int(area * rnd.uniform(800, 3000)):,}"
+        else:
+            item.update({
+                "deposit": f"{rnd.randint(1000, 150000):,}",
+                "monthlyRent": str(rnd.choice([0, 0, 30, 80, 150])),
+                "contractTerm": rnd.choice([None, f"{ym[2:4]}.{ym[4:]}~{int(ym[2:4]) + 2}.{ym[4:]}"]),
+                "contractType": rnd.choice([None, "신규", "갱신"]),
+                "preDeposit": rnd.choice([None, "50,000"]),
+                "preMonthlyRent": rnd.choice([None, "0", "60"]),
+            })
+        items.append(item)
+    return items
+
+
+def rtms_xml(items: list[dict], page: int, rows: int, total: int,
+             code: str = "000", msg: str = "OK") -> bytes:
+    """RTMS 응답 XML (response/header/body/items/item + numOfRows/pageNo/totalCount)"""
+    parts = [f"<?xml version=\"1.0\" encoding=\"UTF-8\" standalone=\"yes\"?><response><header>"
+             f"<resultCode>{code}</resultCode><resultMsg>{escape(msg)}</resultMsg></header><body><items>"]
+    for it in items:
+        parts.append("<item>")
+        parts.extend(f"<{k}>{escape(v)}</{k}>" if v is not None else f"<{k}></{k}>" for k, v in it.items())
+        parts.append("</item>")
+    parts.append(f"</items><numOfRows>{rows}</numOfRows><pageNo>{page}</pageNo><totalCount>{total}</totalCount></body></response>")
+    return "".join(parts).encode("utf-8")
+
+
+def kakao_documents(query: str, not_found_rate: float = 0.02) -> list[dict]:
+    """주소 질의 → 카카오 주소 검색 documents (질의 해시로 정한 서울 근처 좌표, 일부는 결과 없음)"""
+    h = int(hashlib.sha1(query.encode("utf-8")).hexdigest(), 16)
+    if (h % 10_000) / 10_000 < not_found_rate:
+        return []
+    x = 126.8 + (h >> 16) % 400_000 / 1_000_000
+    y = 37.4 + (h >> 40) % 300_000 / 1_000_000
+    return [{"address_name": query, "address_type": "REGION_ADDR", "x": f"{x:.6f}", "y": f"{y:.6f}"}]
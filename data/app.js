@@ -1,12 +1,17 @@
 (function () {
   // --- Constants & Config ---
   const MANIFEST_URL = 'manifest.json';
+  const SEARCH_INDEX_URL = 'search_index.json'; // search_index.py (optional)
   const DEFAULT_CENTER = { lat: 37.4979, lng: 127.0276 }; // Gangnam
   const DEFAULT_LEVEL = 6;
+  // ?api=http://127.0.0.1:8765 → query_server.py: only the trades inside the viewport are fetched
+  const API_BASE = new URLSearchParams(location.search).get('api');
+  const API_PAGE = 5000; // rows per request (server max)
+  const API_MAX_PAGES = 4; // viewport cap; zoom in for the rest
 
   // --- State ---
   const state = {
-    manifest: [], // [{path, label}, ...]
+    manifest: [], // [{path, label, sha256, count, bbox, compact?}, ...]
     loadedData: {}, // { path: [features...] }
     activeDatasets: new Set(), // Set<path>
     filters: {
@@ -20,7 +25,12 @@
   let map = null;
   let clusterer = null;
   let markers = []; // Current markers on map
+  let aggOverlays = []; // Tile aggregate bubbles (zoomed-out tiled view)
   let infoWindows = []; // To close open windows
+  const tileSources = {}; // { manifest path: Promise<tile source> } (tiles.js)
+  let viewKey = ''; // Tiles/aggregates shown for the current viewport
+  let apiSeq = 0; // Latest API request; older responses are dropped
+  let searchIndex = null; // Promise<search.js searcher | null>
 
   // --- Initialization ---
   function init() {
@@ -44,6 +54,13 @@
 
     // 4. Setup Event Listeners
     setupEventListeners();
+
+    // 5. Tiled datasets follow the viewport: refetch only when the visible tile set changes
+    kakao.maps.event.addListener(map, 'idle', () => {
+      if (API_BASE) { updateMap(); return; }
+      if (!tiledItems().length) return;
+      tileViews().then(({ key }) => { if (key !== viewKey) updateMap(); });
+    });
   }
 
   // --- Data Loading ---
@@ -55,6 +72,7 @@
       state.manifest = await res.json();
 
       renderDatasetList(state.manifest);
+      openSearchIndex(); // warm up autocomplete
     } catch (e) {
       console.error(e);
       listEl.innerHTML = '<div class="loading-text" style="color:red">데이터 목록 로딩 실패</div>';
@@ -95,13 +113,30 @@
 
   async function fetchGeoJSON(path) {
     // Fix path for local server: ../data/2025 -> ./2025
-    const cleanPath = path.replace('../data/', './');
+    const fixPath = (p) => p.replace('../data/', './');
+    const cleanPath = fixPath(path);
 
     if (state.loadedData[cleanPath]) return state.loadedData[cleanPath];
 
     updateStatus(`데이터 로딩 중... (${cleanPath})`);
+
+    // Content hash from the manifest as a query string, so a re-export is never served stale from cache
+    const withHash = (p, hash) => (hash ? `${p}?v=${hash.slice(0, 12)}` : p);
+
+    // Prefer the compact columnar file (compact.js) when the manifest lists one
+    const item = state.manifest.find(m => m.path === path);
+    if (item && item.compact && window.RealEstateCompact) {
+      try {
+        const features = await window.RealEstateCompact.load(item.compact, (p) => withHash(fixPath(p), item.compact.sha256));
+        state.loadedData[cleanPath] = features;
+        return features;
+      } catch (e) {
+        console.warn(`Compact load failed, falling back to GeoJSON: ${cleanPath}`, e);
+      }
+    }
+
     try {
-      const res = await fetch(cleanPath);
+      const res = await fetch(withHash(cleanPath, item && item.sha256));
       const json = await res.json();
       const features = json.features || [];
       state.loadedData[cleanPath] = features;
@@ -112,16 +147,81 @@
     }
   }
 
+  // --- Query API (query_server.py) ---
+  // Active datasets + filters + viewport bbox as one paged query; returns features like fetchGeoJSON
+  async function fetchApiFeatures(paths) {
+    // Nothing ticked in a filter set matches nothing (an empty htype=/deal= would mean "any" to a naive server)
+    if (!state.filters.housingType.size || !state.filters.transactionType.size) return { features: [], more: false };
+    const b = viewBounds();
+    const qs = new URLSearchParams({
+      bbox: [b.west, b.south, b.east, b.north].join(','),
+      source: paths.join(','),
+      htype: [...state.filters.housingType].join(','),
+      deal: [...state.filters.transactionType].join(','),
+      limit: API_PAGE
+    });
+    let features = [];
+    for (let page = 0; page < API_MAX_PAGES; page++) {
+      const res = await fetch(`${API_BASE}/api/trades?${qs}`);
+      if (!res.ok) throw new Error(`API ${res.status}: ${(await res.json()).error}`);
+      const json = await res.json();
+      features = features.concat(json.features);
+      if (json.next == null) return { features, more: false };
+      qs.set('cursor', json.next);
+    }
+    return { features, more: true };
+  }
+
+  // --- Tiled datasets (tiles.js / map_tiles.py) ---
+  // Manifest items with a tile pyramid: only the tiles inside the viewport are fetched
+  function tiledItems() {
+    if (API_BASE || !window.RealEstateTiles) return [];
+    return state.manifest.filter(m => m.tiles && state.activeDatasets.has(m.path));
+  }
+
+  function openTiles(item) {
+    if (!tileSources[item.path]) {
+      const url = new URL(item.tiles.path.replace('../data/', './'), location.href).toString();
+      tileSources[item.path] = window.RealEstateTiles.open(url, item.tiles.sha256)
+        .catch((e) => { delete tileSources[item.path]; throw e; });
+    }
+    return tileSources[item.path];
+  }
+
+  function viewBounds() {
+    const b = map.getBounds();
+    const sw = b.getSouthWest(), ne = b.getNorthEast();
+    return { west: sw.getLng(), south: sw.getLat(), east: ne.getLng(), north: ne.getLat() };
+  }
+
+  // Per tiled dataset: leaf tile keys or aggregates for the viewport, plus a key to detect changes
+  async function tileViews() {
+    const bounds = viewBounds(), level = map.getLevel();
+    const views = [];
+    for (const item of tiledItems()) {
+      const src = await openTiles(item);
+      views.push({ item, src, view: src.view(bounds, level) });
+    }
+    const key = views.map(({ item, view }) => view.mode === 'agg'
+      ? `${item.path}@${view.zoom}:${view.items.map(a => a.key).join(',')}`
+      : `${item.path}:${view.keys.join(',')}`).join('|');
+    return { key, views };
+  }
+
   // --- Filtering & Rendering ---
+  function housingGroup(hType) {
+    if (hType.includes('아파트')) return '아파트';
+    if (hType.includes('연립') || hType.includes('다세대')) return '연립다세대';
+    if (hType.includes('단독') || hType.includes('다가구')) return '단독다가구';
+    if (hType.includes('오피스텔')) return '오피스텔';
+    return hType;
+  }
+
   function isFeatureVisible(f) {
     const p = f.properties || {};
 
     // Housing Type Filter
-    let hType = p['주택유형'] || '기타';
-    if (hType.includes('아파트')) hType = '아파트';
-    else if (hType.includes('연립') || hType.includes('다세대')) hType = '연립다세대';
-    else if (hType.includes('단독') || hType.includes('다가구')) hType = '단독다가구';
-    else if (hType.includes('오피스텔')) hType = '오피스텔';
+    const hType = housingGroup(p['주택유형'] || '기타');
 
     if (!state.filters.housingType.has(hType)) return false;
 
@@ -140,21 +240,62 @@
   async function updateMap() {
     updateStatus('데이터 처리 중...');
 
-    // 1. Gather all features from active datasets
+    // 1. Gather all features from active datasets (tiled ones: viewport tiles only)
     let allFeatures = [];
-    const paths = Array.from(state.activeDatasets);
+    const tiled = new Set(tiledItems().map(m => m.path));
+    const paths = Array.from(state.activeDatasets).filter(p => !tiled.has(p));
+
+    if (API_BASE) {
+      if (!paths.length) {
+        renderMarkers([]);
+        renderAggregates([]);
+        updateStatus('표시된 데이터: 0건');
+        return;
+      }
+      const seq = ++apiSeq;
+      try {
+        const { features, more } = await fetchApiFeatures(paths);
+        if (seq !== apiSeq) return; // the viewport moved on meanwhile
+        state.loadedData = { api: features }; // search / data panel: current viewport only
+        renderMarkers(features); // already filtered server-side
+        renderAggregates([]);
+        updateStatus(`표시된 데이터: ${features.length.toLocaleString()}건` + (more ? ' (일부 — 확대하면 전체 표시)' : ''));
+      } catch (e) {
+        console.error(e);
+        updateStatus('API 조회 실패 — query_server.py 실행 여부 확인');
+      }
+      if (state.selectedTarget) showDataPanel(state.selectedTarget);
+      return;
+    }
 
     for (const path of paths) {
       const features = await fetchGeoJSON(path);
       allFeatures = allFeatures.concat(features);
     }
 
+    const aggregates = [];
+    if (tiled.size) {
+      const { key, views } = await tileViews();
+      viewKey = key;
+      for (const { item, src, view } of views) {
+        if (view.mode === 'agg') {
+          aggregates.push(...await src.aggregates(view)); // precomputed clusters (clusters.json)
+          continue;
+        }
+        updateStatus(`타일 로딩 중... (${item.label}, ${view.keys.length}개)`);
+        allFeatures = allFeatures.concat(await src.features(view.keys));
+        state.loadedData[item.path] = src.loadedFeatures(); // search / data panel
+      }
+    }
+
     // 2. Filter features
     const filtered = allFeatures.filter(isFeatureVisible);
 
-    // 3. Render Markers
+    // 3. Render Markers (+ per-tile aggregates when zoomed out)
     renderMarkers(filtered);
-    updateStatus(`표시된 데이터: ${filtered.length.toLocaleString()}건`);
+    const aggCount = renderAggregates(aggregates);
+    updateStatus(`표시된 데이터: ${filtered.length.toLocaleString()}건` +
+      (aggCount ? ` + 축소 화면 군집 ${aggCount.toLocaleString()}건 (미리 계산, 유형 필터만 적용)` : ''));
 
     // 4. Update Data Panel if open
     if (state.selectedTarget) {
@@ -242,6 +383,52 @@
     markers = newMarkers;
   }
 
+  // Points with the same key (same zoom and grid cell) from several months are merged; the filters
+  // are applied through the per-kind entries (k: {"주택유형|거래구분": [count, max price]}).
+  // Only the housing/transaction type filters exist here, and both are applied, so bubble counts
+  // match what the markers would show. Returns the visible count.
+  function renderAggregates(items) {
+    aggOverlays.forEach(o => o.setMap(null));
+    aggOverlays = [];
+
+    const accept = (hType, tType) =>
+      state.filters.housingType.has(housingGroup(hType)) && state.filters.transactionType.has(tType);
+    const merged = new Map();
+    for (const a of items) {
+      const { n, max } = window.RealEstateTiles.sumKinds(a.k, accept);
+      if (!n) continue;
+      const m = merged.get(a.key) || { n: 0, lng: 0, lat: 0, py: 0, pyN: 0, max: null, names: new Set() };
+      const saleN = Object.entries(a.k || {}).reduce((s, [kind, [c]]) => s + (kind.endsWith('|매매') ? c : 0), 0);
+      m.n += n;
+      m.lng += a.c[0] * n;
+      m.lat += a.c[1] * n;
+      if (max != null) m.max = Math.max(m.max ?? max, max);
+      (a.names || []).forEach(name => m.names.add(name)); // 단지 counted once across months
+      // a.py is the median 평당가 of the 매매 trades in the cell (all housing types) → months combined:
+      // mean of the monthly medians weighted by their 매매 counts (an approximation of the overall median)
+      if (a.py != null && saleN) { m.py += a.py * saleN; m.pyN += saleN; }
+      merged.set(a.key, m);
+    }
+
+    let total = 0;
+    merged.forEach(m => {
+      total += m.n;
+      let price = '';
+      if (m.pyN && state.filters.transactionType.has('매매')) {
+        price = `<div class="agg-price">평당 ${Math.round(m.py / m.pyN).toLocaleString()}만</div>`;
+      } else if (m.max) {
+        price = `<div class="agg-price">최고 ${(m.max / 10000).toFixed(1).replace(/\.0$/, '')}억</div>`;
+      }
+      const overlay = new kakao.maps.CustomOverlay({
+        map: map,
+        position: new kakao.maps.LatLng(m.lat / m.n, m.lng / m.n),
+        content: `<div class="agg-bubble"${m.names.size ? ` title="단지 ${m.names.size.toLocaleString()}곳"` : ''}>${m.n.toLocaleString()}건${price}</div>`
+      });
+      aggOverlays.push(overlay);
+    });
+    return total;
+  }
+
   function showInfoWindow(marker, props) {
     // Close others
     infoWindows.forEach(iw => iw.close());
@@ -287,6 +474,13 @@
     else if (tType === '전세') colorClass = 'deal-jeonse';
     else if (tType === '월세') colorClass = 'deal-monthly';
 
+    // Lot number hidden/unparsable → geocoded to the 법정동 centroid, not the parcel itself
+    const approx = p['좌표기준'] === '법정동' ? `
+        <div class="info-row">
+          <span class="info-label">위치</span>
+          <span class="info-val">${p['법정동'] || ''} 대표 좌표 (지번 비공개)</span>
+        </div>` : '';
+
     return `
       <div class="info-window">
         <div class="info-title">${name}</div>
@@ -309,7 +503,7 @@
         <div class="info-row">
           <span class="info-label">계약일</span>
           <span class="info-val">${date}</span>
-        </div>
+        </div>${approx}
       </div>
     `;
   }
@@ -360,7 +554,7 @@
 
       debounceTimer = setTimeout(() => {
         performSearch(query);
-      }, 300);
+      }, searchIndex ? 50 : 300); // the index answers per keystroke; scans are debounced harder
     });
 
     // Hide search results when clicking outside
@@ -389,29 +583,41 @@
     });
   }
 
-  function performSearch(query) {
-    const searchResults = document.getElementById('search-results');
-
-    // Gather all features
-    let allFeatures = [];
-    Object.values(state.loadedData).forEach(features => {
-      allFeatures = allFeatures.concat(features);
-    });
+  // --- Search (search.js / search_index.py) ---
+  // Prebuilt index over every month: autocomplete without loading features first
+  function openSearchIndex() {
+    if (!searchIndex) {
+      searchIndex = window.RealEstateSearch
+        ? window.RealEstateSearch.open(new URL(SEARCH_INDEX_URL, location.href).toString())
+          .catch((e) => { console.warn('Search index unavailable, scanning loaded data', e); return null; })
+        : Promise.resolve(null);
+    }
+    return searchIndex;
+  }
 
-    // Filter by name (unique names)
+  // Fallback without an index: unique names in the loaded features
+  function scanLoaded(query) {
     const uniqueNames = new Set();
     const matches = [];
-
-    for (const f of allFeatures) {
-      const p = f.properties || {};
-      const name = p['단지명/건물명'] || p['건물명'] || p['주소'] || '';
-
-      if (name.includes(query) && !uniqueNames.has(name)) {
-        uniqueNames.add(name);
-        matches.push({ name, feature: f });
-        if (matches.length >= 10) break; // Limit to 10 results
+    for (const features of Object.values(state.loadedData)) {
+      for (const f of features) {
+        const p = f.properties || {};
+        const name = p['단지명/건물명'] || p['건물명'] || p['주소'] || '';
+        if (name.includes(query) && !uniqueNames.has(name)) {
+          uniqueNames.add(name);
+          const [lng, lat] = f.geometry.coordinates;
+          matches.push({ name, lng, lat });
+          if (matches.length >= 10) return matches; // Limit to 10 results
+        }
       }
     }
+    return matches;
+  }
+
+  async function performSearch(query) {
+    const searchResults = document.getElementById('search-results');
+    const index = await openSearchIndex();
+    const matches = index ? index.query(query, 10) : scanLoaded(query);
 
     if (matches.length === 0) {
       searchResults.innerHTML = '<li class="search-item" style="color:#999; cursor:default">검색 결과가 없습니다</li>';
@@ -419,11 +625,12 @@
       return;
     }
 
+    // Highlight match (literal query only; index hits may differ in spacing or be 초성)
+    const regex = new RegExp(`(${query.replace(/[.*+?^${}()|[\]\\]/g, '\\$&')})`, 'gi');
     searchResults.innerHTML = matches.map(item => {
-      // Highlight match
-      const regex = new RegExp(`(${query})`, 'gi');
       const highlighted = item.name.replace(regex, '<span class="search-highlight">$1</span>');
-      return `<li class="search-item" data-name="${item.name}">${highlighted}</li>`;
+      const meta = item.region ? `<span class="search-meta">${item.region} · ${item.n.toLocaleString()}건</span>` : '';
+      return `<li class="search-item" data-name="${item.name}">${highlighted}${meta}</li>`;
     }).join('');
 
     searchResults.classList.remove('hidden');
@@ -431,16 +638,13 @@
     // Add click listeners
     searchResults.querySelectorAll('.search-item').forEach((li, index) => {
       li.addEventListener('click', () => {
-        const targetName = matches[index].name;
-        const targetFeature = matches[index].feature;
+        const { name: targetName, lng, lat } = matches[index];
 
         // Select and Move
         state.selectedTarget = targetName;
 
-        // Pan to location
-        const coords = targetFeature.geometry.coordinates;
-        const latLng = new kakao.maps.LatLng(coords[1], coords[0]);
-        map.panTo(latLng);
+        // Pan to location (tiled datasets load the tiles there on idle)
+        map.panTo(new kakao.maps.LatLng(lat, lng));
         map.setLevel(3); // Zoom in
 
         // Show Data
@@ -0,0 +1,82 @@
+// compact.js — map_export.py 컴팩트 포맷(.rtc) 디코더
+// window.RealEstateCompact.load(entry) → GeoJSON과 같은 모양의 feature 배열
+//   feature.geometry.coordinates / feature.properties['거래금액'] 등 기존 코드 그대로 사용 가능
+//   (속성은 타입 배열에서 그때그때 읽는 getter → 객체 생성/JSON 파싱 비용 없음)
+// entry: manifest 항목의 compact 값 { path, gz?, br?, count }
+(function (global) {
+  const MAGIC = 'RTC1';
+  const I32_NULL = -2147483648;
+  const ARRAYS = { u8: Uint8Array, u16: Uint16Array, u32: Uint32Array, i32: Int32Array, f64: Float64Array };
+
+  function decode(buffer) {
+    const bytes = new Uint8Array(buffer);
+    if (String.fromCharCode(bytes[0], bytes[1], bytes[2], bytes[3]) !== MAGIC) {
+      throw new Error('compact 형식 오류');
+    }
+    const headLen = new DataView(buffer).getUint32(4, true);
+    const header = JSON.parse(new TextDecoder().decode(bytes.subarray(8, 8 + headLen)));
+    const base = 8 + headLen + ((8 - ((8 + headLen) % 8)) % 8);
+    const n = header.count;
+    const view = (type, offset, length) => new ARRAYS[type](buffer, base + offset, length);
+
+    const coords = view('f64', header.coords.offset, n * 2);
+    const getters = header.columns.map((c) => {
+      if (c.type === 'null') return () => null;
+      if (c.type === 'dict') {
+        const codes = view(c.codes, c.offset, n);
+        const values = c.values;
+        return (i) => (codes[i] ? values[codes[i] - 1] : null);
+      }
+      if (c.type === 'i32') {
+        const arr = view('i32', c.offset, n);
+        const scale = c.scale || 1;
+        return scale === 1
+          ? (i) => (arr[i] === I32_NULL ? null : arr[i])
+          : (i) => (arr[i] === I32_NULL ? null : arr[i] / scale);
+      }
+      const arr = view('f64', c.offset, n);
+      return (i) => (Number.isNaN(arr[i]) ? null : arr[i]);
+    });
+
+    function Properties(i) { this._i = i; }
+    header.columns.forEach((c, k) => {
+      const get = getters[k];
+      Object.defineProperty(Properties.prototype, c.name, { get() { return get(this._i); } });
+    });
+    function Point(i) { this._i = i; }
+    Point.prototype.type = 'Point';
+    Object.defineProperty(Point.prototype, 'coordinates', {
+      get() { return [coords[2 * this._i], coords[2 * this._i + 1]]; }
+    });
+
+    const features = new Array(n);
+    for (let i = 0; i < n; i++) {
+      features[i] = { type: 'Feature', geometry: new Point(i), properties: new Properties(i) };
+    }
+    return features;
+  }
+
+  async function gunzip(buffer) {
+    const b = new Uint8Array(buffer);
+    if (b[0] !== 0x1f || b[1] !== 0x8b) return buffer; // 서버가 이미 풀어서 준 경우
+    const stream = new Blob([buffer]).stream().pipeThrough(new DecompressionStream('gzip'));
+    return new Response(stream).arrayBuffer();
+  }
+
+  // .gz를 받아 브라우저에서 풀기(DecompressionStream 지원 시) → 실패하면 원본 .rtc
+  async function load(entry, resolve = (p) => p) {
+    if (entry.gz && typeof DecompressionStream !== 'undefined') {
+      try {
+        const res = await fetch(resolve(entry.gz));
+        if (res.ok) return decode(await gunzip(await res.arrayBuffer()));
+      } catch (e) {
+        console.warn('[compact] gz 로드 실패, 원본으로 재시도', e);
+      }
+    }
+    const res = await fetch(resolve(entry.path));
+    if (!res.ok) throw new Error('compact 로드 실패: ' + entry.path);
+    return decode(await res.arrayBuffer());
+  }
+
+  global.RealEstateCompact = { decode, load };
+})(typeof window !== 'undefined' ? window : globalThis);
@@ -0,0 +1,87 @@
+// search.js — search_index.py 단지/건물명 검색 색인 로더
+// window.RealEstateSearch.open(indexUrl) → 검색기 (indexUrl: search_index.json, 있으면 .gz를 받아 풀어 씀)
+//   s.query(q, limit=10) → [{id, name, region, lng, lat, n, ym}] (거래 건수 많은 순)
+//     q가 초성만(ㄱ~ㅎ, 2글자 이상)이면 초성 검색: "ㄹㅁㅇ" → 래미안…
+//   s.count                → 단지 수
+// 색인 조각(2글자) 중 id 목록이 가장 짧은 것만 훑고, id가 건수 순이라 limit개 찾으면 바로 끝
+// (한 글자 질의는 전체를 건수 순으로 훑되 limit개 찾으면 끝)
+(function (global) {
+  const CHO = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ';
+  const CHO_ONLY = /^[ㄱ-ㅎ]+$/;
+
+  // search_index.py normalize와 같은 규칙 (NFC, 소문자, 공백/괄호/-_.,· 제거)
+  const normalize = (s) => String(s).normalize('NFC').toLowerCase().replace(/[\s()[\]\-_.,·]+/g, '');
+
+  function chosung(s) {
+    let out = '';
+    for (const c of s) {
+      const code = c.charCodeAt(0);
+      out += code >= 0xac00 && code <= 0xd7a3 ? CHO[Math.floor((code - 0xac00) / 588)] : c;
+    }
+    return out;
+  }
+
+  async function fetchIndex(indexUrl) {
+    if (typeof DecompressionStream !== 'undefined') {
+      try {
+        const res = await fetch(indexUrl + '.gz', { cache: 'no-cache' });
+        if (res.ok) {
+          const stream = res.body.pipeThrough(new DecompressionStream('gzip'));
+          return await new Response(stream).json();
+        }
+      } catch (e) {
+        console.warn('[search] gz 로드 실패, 원본으로 재시도', e);
+      }
+    }
+    const res = await fetch(indexUrl, { cache: 'no-cache' });
+    if (!res.ok) throw new Error('검색 색인 로드 실패: ' + indexUrl);
+    return res.json();
+  }
+
+  async function open(indexUrl) {
+    const index = await fetchIndex(indexUrl);
+    const items = index.items;
+    const norms = items.map((x) => normalize(x[0]));
+    let chos = null; // 초성 검색을 처음 할 때 계산
+    const decoded = { grams: new Map(), cho: new Map() };
+
+    // 차분 인코딩된 id 목록 → id 배열 (조각별 1회)
+    function postings(kind, key) {
+      const cache = decoded[kind];
+      if (!cache.has(key)) {
+        const deltas = index[kind][key];
+        let id = 0;
+        cache.set(key, deltas ? deltas.map((d, i) => (id = i ? id + d : d)) : []);
+      }
+      return cache.get(key);
+    }
+
+    function query(q, limit = 10) {
+      q = normalize(q || '');
+      if (!q) return [];
+      const cho = CHO_ONLY.test(q);
+      if (cho && q.length < 2) return [];
+      const kind = cho ? 'cho' : 'grams';
+      let best = null; // 훑을 id 목록 (null = 전체)
+      for (let i = 0; i + 2 <= q.length; i++) {
+        const ids = postings(kind, q.slice(i, i + 2));
+        if (!ids.length) return [];
+        if (!best || ids.length < best.length) best = ids;
+      }
+      if (cho && !chos) chos = norms.map(chosung);
+      const hay = cho ? chos : norms;
+      const out = [];
+      for (const id of best || norms.keys()) {
+        if (!hay[id].includes(q)) continue;
+        const [name, region, lng, lat, n, ym] = items[id];
+        out.push({ id, name, region, lng, lat, n, ym });
+        if (out.length >= limit) break;
+      }
+      return out;
+    }
+
+    return { query, count: index.count, months: index.months };
+  }
+
+  global.RealEstateSearch = { open, normalize, chosung };
+})(typeof window !== 'undefined' ? window : globalThis);
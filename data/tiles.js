@@ -0,0 +1,159 @@
+// tiles.js — map_tiles.py 타일 피라미드 로더 (compact.js 필요)
+// window.RealEstateTiles.open(indexUrl, hash?) → 타일 소스
+//   src.view(bounds, level)   → { mode:'tiles', keys:[...] } 또는 { mode:'agg', zoom, items:[{key,n,c,py,k}] }
+//   src.features(keys)        → 해당 리프 타일 feature 배열(타일별 캐시, 이미 받은 타일은 다시 요청 안 함)
+//   src.loadedFeatures()      → 지금까지 받은 모든 타일의 feature (검색/상세 패널용)
+//   src.loadedKeys()          → 지금까지 받은 리프 타일 "x/y" 목록
+//   src.retain(keys)          → keys 밖의 받은 타일은 버림(화면을 떠난 타일 — 메모리가 계속 늘지 않게)
+//   src.aggregates(view)      → 축소 화면('agg') 표시용 점 [{key, c:[lng,lat], k:{"주택유형|거래구분":[건수, 최고가]}, names?, py?}]
+//                                clusters.json의 줌별 군집(names: 셀 안 단지 이름) 우선, 없으면 index.json 타일 집계(py: 매매 평당가 중앙값)
+//                                key가 같으면(같은 줌·같은 셀/타일) 여러 달을 합쳐도 됨 (단지 수는 names 합집합으로)
+//   src.groups(keys)          → 리프 타일 keys 안의 거래로 묶은 단지 그룹 [{name, lng, lat, k}] (clusters.json, 없으면 null)
+//                                (clusters.json은 단지 × 타일 단위 → 이름이 같으면 합침, 좌표는 건수 가중 평균)
+//   src.index                 → index.json ({leaf, zooms, base, count, ranges, tiles}) — 타일 경로: <base><leaf>/<x>/<y>.rtc
+// bounds: { west, south, east, north } (경위도), level: 카카오맵 레벨(1~14)
+(function (global) {
+  const MAX_LEAF_TILES = 36; // 화면 안 리프 타일이 이보다 많으면 집계 표시
+
+  // 카카오맵 레벨 → 웹 메르카토르 줌 (레벨 3 ≈ 줌 17)
+  const levelToZoom = (level) => 20 - level;
+
+  function tileXY(lng, lat, z) {
+    const n = 2 ** z;
+    const r = (Math.max(-85.05112878, Math.min(85.05112878, lat)) * Math.PI) / 180;
+    const x = Math.floor(((lng + 180) / 360) * n);
+    const y = Math.floor(((1 - Math.asinh(Math.tan(r)) / Math.PI) / 2) * n);
+    return [Math.min(n - 1, Math.max(0, x)), Math.min(n - 1, Math.max(0, y))];
+  }
+
+  // bounds 안의 z 타일 중 index에 있는 것만 "x/y" 목록으로
+  function keysIn(tiles, bounds, z) {
+    const [x0, y0] = tileXY(bounds.west, bounds.north, z);
+    const [x1, y1] = tileXY(bounds.east, bounds.south, z);
+    const keys = [];
+    for (let x = x0; x <= x1; x++) {
+      for (let y = y0; y <= y1; y++) {
+        if (tiles[`${x}/${y}`]) keys.push(`${x}/${y}`);
+      }
+    }
+    return keys;
+  }
+
+  async function open(indexUrl, hash) {
+    const bust = (u) => (hash ? `${u}?v=${hash.slice(0, 12)}` : u);
+    const res = await fetch(bust(indexUrl));
+    if (!res.ok) throw new Error('tile index 로드 실패: ' + indexUrl);
+    const index = await res.json();
+    const leaf = index.leaf;
+    const base = index.base || ''; // 버전 폴더(map_tiles.py) — 예전 index.json은 없음
+    const cache = new Map(); // "x/y" → Promise<feature[]>
+    const done = new Map();  // "x/y" → feature[] (받기 끝난 타일)
+    let clusters = null;     // Promise<clusters.json | null>
+
+    function loadClusters() {
+      if (!index.clusters) return Promise.resolve(null);
+      if (!clusters) {
+        const url = new URL(index.clusters.path, indexUrl).toString();
+        const h = index.clusters.sha256;
+        clusters = fetch(h ? `${url}?v=${h.slice(0, 12)}` : url)
+          .then((res) => (res.ok ? res.json() : null))
+          .catch(() => null)
+          .then((c) => {
+            if (c) c.kindMap = (entries) => Object.fromEntries(entries.map(([i, n, max]) => [c.kinds[i], [n, max]]));
+            else clusters = null; // 실패하면 다음에 다시 시도
+            return c;
+          });
+      }
+      return clusters;
+    }
+
+    async function aggregates(view) {
+      const c = await loadClusters();
+      if (c && c.zooms[view.zoom]) {
+        const inView = new Set(view.items.map((a) => a.key));
+        return c.zooms[view.zoom]
+          .filter(([lng, lat]) => inView.has(tileXY(lng, lat, view.zoom).join('/')))
+          .map(([lng, lat, cell, members, entries]) => ({
+            key: `${view.zoom}:${cell}`, c: [lng, lat], k: c.kindMap(entries),
+            names: Array.isArray(members) ? [...new Set(members.map((i) => c.groups[i][0]))] : [] // 예전 형식: 단지 수만
+          }));
+      }
+      return view.items.map((a) => ({
+        key: `${view.zoom}:${a.key}`, c: a.c, py: a.py,
+        k: Object.fromEntries(Object.entries(a.k).map(([kind, n]) => [kind, [n, null]]))
+      }));
+    }
+
+    async function groups(keys) {
+      const c = await loadClusters();
+      if (!c) return null;
+      const set = new Set(keys);
+      const byName = new Map();
+      for (const [name, lng, lat, tile, entries] of c.groups) {
+        if (!set.has(tile)) continue;
+        const n = entries.reduce((s, [, cnt]) => s + cnt, 0);
+        const g = byName.get(name) || { name, lng: 0, lat: 0, n: 0, k: {} };
+        g.lng += lng * n; g.lat += lat * n; g.n += n;
+        for (const [kind, [cnt, max]] of Object.entries(c.kindMap(entries))) {
+          const e = g.k[kind] || [0, null];
+          g.k[kind] = [e[0] + cnt, max == null ? e[1] : Math.max(e[1] ?? max, max)];
+        }
+        byName.set(name, g);
+      }
+      return [...byName.values()].map(({ name, lng, lat, n, k }) => ({ name, lng: lng / n, lat: lat / n, k }));
+    }
+
+    function view(bounds, level) {
+      const keys = keysIn(index.tiles[leaf], bounds, leaf);
+      if (keys.length <= MAX_LEAF_TILES) return { mode: 'tiles', keys };
+      const z = Math.max(index.zooms[0], Math.min(leaf, levelToZoom(level)));
+      const items = keysIn(index.tiles[z], bounds, z).map((key) => ({ key, ...index.tiles[z][key] }));
+      return { mode: 'agg', zoom: z, items };
+    }
+
+    function tile(key) {
+      if (!cache.has(key)) {
+        const path = new URL(`${base}${leaf}/${key}.rtc`, indexUrl).toString();
+        const p = global.RealEstateCompact.load({ path: bust(path), gz: bust(path + '.gz') })
+          .then((fs) => { done.set(key, fs); return fs; })
+          .catch((e) => { cache.delete(key); throw e; });
+        cache.set(key, p);
+      }
+      return cache.get(key);
+    }
+
+    async function features(keys) {
+      const parts = await Promise.all(keys.map(tile));
+      return parts.flat();
+    }
+
+    function retain(keys) {
+      const keep = new Set(keys);
+      for (const key of [...cache.keys()]) {
+        if (!keep.has(key)) { cache.delete(key); done.delete(key); }
+      }
+    }
+
+    return {
+      index, view, features, aggregates, groups, retain,
+      loadedFeatures: () => [...done.values()].flat(),
+      loadedKeys: () => [...done.keys()]
+    };
+  }
+
+  // k({"주택유형|거래구분": [건수, 최고가]}) 중 accept(주택유형, 거래구분)인 것만 합산 → {n, max, deals}
+  function sumKinds(k, accept) {
+    let n = 0, max = null;
+    const deals = [];
+    for (const [kind, [count, m]] of Object.entries(k || {})) {
+      const [hType, tType] = kind.split('|');
+      if (!accept(hType, tType)) continue;
+      n += count;
+      if (m != null) max = Math.max(max ?? m, m);
+      if (!deals.includes(tType)) deals.push(tType);
+    }
+    return { n, max, deals };
+  }
+
+  global.RealEstateTiles = { open, tileXY, levelToZoom, sumKinds, MAX_LEAF_TILES };
+})(typeof window !== 'undefined' ? window : globalThis);
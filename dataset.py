@@ -0,0 +1,179 @@
+# dataset.py
+# land.py / geocode_and_export.py 공용 월별 Parquet 데이터셋
+# - 레이아웃: <root>/<stage>/year=YYYY/month=MM/sheet=<시트명>/part-<버전>.parquet
+#     stage: "trades"(land.py 수집 결과), "geocoded"(geocode_and_export.py 좌표 추가 결과)
+#     버전: land.py 출력 파일명과 같은 vYYMMDDHHMM
+# - 파티션마다 최신 버전 1개만 유지 (새 버전 저장 후 이전 part 삭제)
+# - 월 디렉터리의 _sheets.json: {"version": 버전, "sheets": [시트명, ...]} — 그 달의 현재 버전과 시트 목록(순서 = 엑셀 시트 순서)
+#     write_month는 달 전체를 새 버전으로 교체 (frames에 없는 시트 디렉터리는 삭제 → 버전이 섞인 달이 생기지 않음)
+#     (예전 형식: 시트명 목록만 → 버전은 part 파일 중 최신)
+# - dtype(Int64/float64/datetime64) 그대로 저장 → 다시 읽을 때 변환 불필요
+# - xlsx는 필요할 때만 이 데이터셋에서 내보냄 (land.py --xlsx / --export-xlsx)
+#
+# 필요: pip install pyarrow  (없으면 available()이 False → 호출 측에서 xlsx로 대체)
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+import run_report
+
+try:
+    import pyarrow  # noqa: F401  (pandas.to_parquet/read_parquet 엔진)
+    _HAVE_PYARROW = True
+except ModuleNotFoundError:
+    _HAVE_PYARROW = False
+
+DEFAULT_ROOT = Path("data") / "dataset"
+TRADES = "trades"
+GEOCODED = "geocoded"
+
+_PART_RE = re.compile(r"part-(v\d{10})\.parquet$")
+META_NAME = "_sheets.json"
+
+
+def available() -> bool:
+    """pyarrow 설치 여부"""
+    return _HAVE_PYARROW
+
+
+def month_dir(root: Path, stage: str, ym: str) -> Path:
+    return Path(root) / stage / f"year={ym[:4]}" / f"month={ym[4:6]}"
+
+
+def _atomic_write(path: Path, write) -> None:
+    """같은 폴더 임시 파일에 write(tmp) → os.replace (중단돼도 반쪽 파일이 남지 않게)"""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+        run_report.add_bytes(path, path.stat().st_size)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _latest_part(sheet_dir: Path) -> Path | None:
+    parts = sorted(p for p in sheet_dir.glob("part-*.parquet") if _PART_RE.search(p.name))
+    return parts[-1] if parts else None
+
+# ==========================
+# 쓰기
+# ==========================
+def write_month(root: Path, stage: str, ym: str, frames: dict[str, pd.DataFrame], version: str) -> list[Path]:
+    """
+    {시트명: DataFrame} → 시트별 part-<version>.parquet (임시 파일 → 교체, 이전 버전 삭제)
+    frames가 그 달의 전체 시트 — 없는 시트는 삭제(일부 시트만 쓰면 그 달은 그 시트들만 남음).
+    빈 시트도 컬럼만 있는 파일로 저장(읽을 때 시트 목록 유지).
+    순서: 새 part 전부 → _sheets.json 교체 → 이전 part/시트 삭제
+      (중간에 멈춰도 _sheets.json이 가리키는 버전의 part는 모두 남아 있음 — 남은 새 part는 다음 쓰기 때 정리)
+    """
+    mdir = month_dir(root, stage, ym)
+    out = []
+    for sheet, df in frames.items():
+        sheet_dir = mdir / f"sheet={sheet}"
+        sheet_dir.mkdir(parents=True, exist_ok=True)
+        path = sheet_dir / f"part-{version}.parquet"
+        _atomic_write(path, lambda tmp: df.reset_index(drop=True).to_parquet(
+            tmp, engine="pyarrow", index=False, compression="zstd"))
+        out.append(path)
+    meta = {"version": version, "sheets": list(frames.keys())}
+    _atomic_write(mdir / META_NAME,
+                  lambda tmp: Path(tmp).write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8"))
+    keep = set(out)
+    for sheet_dir in mdir.glob("sheet=*"):
+        if sheet_dir.name.split("=", 1)[1] not in frames:
+            shutil.rmtree(sheet_dir, ignore_errors=True)
+            continue
+        for old in sheet_dir.glob("part-*.parquet"):
+            if old not in keep:
+                old.unlink(missing_ok=True)
+    return out
+
+# ==========================
+# 읽기
+# ==========================
+def list_months(root: Path, stage: str) -> list[str]:
+    """데이터셋에 있는 월(YYYYMM) 목록 (오름차순)"""
+    base = Path(root) / stage
+    months = []
+    for ydir in base.glob("year=*"):
+        for mdir in ydir.glob("month=*"):
+            if any(mdir.glob("sheet=*/part-*.parquet")):
+                months.append(ydir.name.split("=", 1)[1] + mdir.name.split("=", 1)[1])
+    return sorted(months)
+
+
+def _month_meta(mdir: Path) -> dict:
+    """_sheets.json → {"version": 버전 또는 None, "sheets": [...] 또는 None}"""
+    try:
+        meta = json.loads((mdir / META_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"version": None, "sheets": None}
+    if isinstance(meta, list):  # 예전 형식(시트 순서만)
+        return {"version": None, "sheets": meta}
+    return {"version": meta.get("version"), "sheets": meta.get("sheets")}
+
+
+def month_version(root: Path, stage: str, ym: str) -> str | None:
+    """
+    해당 월의 버전(vYYMMDDHHMM, _sheets.json에 기록된 것), 없으면 None.
+    예전 형식(버전 기록 없음)이면 part 파일 중 최신.
+    """
+    mdir = month_dir(root, stage, ym)
+    version = _month_meta(mdir)["version"]
+    if version is not None:
+        return version if any(mdir.glob(f"sheet=*/part-{version}.parquet")) else None
+    versions = [
+        _PART_RE.search(p.name).group(1)
+        for p in mdir.glob("sheet=*/part-*.parquet")
+        if _PART_RE.search(p.name)
+    ]
+    return max(versions) if versions else None
+
+
+def month_sheets(root: Path, stage: str, ym: str) -> list[str]:
+    """해당 월의 시트 목록 (저장 순서). 예전 형식이면 기록 순서 + 나머지 디렉터리 이름순"""
+    mdir = month_dir(root, stage, ym)
+    meta = _month_meta(mdir)
+    names = sorted(d.name.split("=", 1)[1] for d in mdir.glob("sheet=*"))
+    if meta["version"] is not None:
+        return [n for n in meta["sheets"] if n in names]
+    order = meta["sheets"] or []
+    return [n for n in order if n in names] + [n for n in names if n not in order]
+
+
+def read_month(root: Path, stage: str, ym: str, sheets: list[str] | None = None) -> dict[str, pd.DataFrame]:
+    """
+    해당 월 → {시트명: DataFrame}. sheets를 주면 그 시트만.
+    시트 목록/순서와 버전은 _sheets.json 기준 (기록된 버전의 part만 읽음 — 다른 버전이 섞이지 않음).
+    읽는 도중 다른 프로세스가 새 버전으로 바꿔 이전 part가 지워지면 _sheets.json을 다시 읽어 처음부터.
+    기록된 시트의 part가 없으면(달이 깨짐) FileNotFoundError — 빠진 시트를 조용히 건너뛰지 않음.
+    """
+    mdir = month_dir(root, stage, ym)
+    for attempt in range(2):
+        version = _month_meta(mdir)["version"]
+        out, lost = {}, None
+        for sheet in month_sheets(root, stage, ym):
+            if sheets and sheet not in sheets:
+                continue
+            sheet_dir = mdir / f"sheet={sheet}"
+            part = sheet_dir / f"part-{version}.parquet" if version is not None else _latest_part(sheet_dir)
+            try:
+                out[sheet] = pd.read_parquet(part, engine="pyarrow")
+            except (FileNotFoundError, TypeError):  # TypeError: _latest_part → None
+                lost = sheet
+                break
+        if lost is None:
+            return out
+        if _month_meta(mdir)["version"] == version:
+            break  # 버전이 그대로인데 part가 없음 → 다시 읽어도 같음
+    raise FileNotFoundError(f"{month_dir(root, stage, ym)}: 시트 {lost}의 part-{version} 없음 (달 데이터 손상)")
@@ -1,22 +1,40 @@
 # 실행 python geocode_and_export.py -d data/2025
+#      python geocode_and_export.py --dataset                → land.py가 만든 Parquet 데이터셋(data/dataset)의 모든 월
+#      python geocode_and_export.py --dataset --months 202509 --xlsx → 지정 월만, geocoded 엑셀도 생성
+#      python geocode_and_export.py -d data/2025 -w 8 --rps 10 → 지오코딩 스레드 8개, 카카오 초당 10건 이하
+#      python geocode_and_export.py -d data/2025 --local only  → 카카오 없이 캐시 기반 번지 색인으로만(오프라인)
+#      python geocode_and_export.py --rebuild-manifest        → data/manifest.json 전체 재구성(평소엔 저장한 파일만 갱신)
+#      python geocode_and_export.py --dataset --prometheus out/geocode.prom → 실행 보고서(기본 data/_cache/reports/)에 더해
+#                                                             Prometheus 텍스트도 저장 (단계별 시간, 요청/재시도, 캐시 적중률 등)
 
 # batch_geocode_and_export.py
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
 import re
 import sys
 import time
-from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator
 
 import numpy as np
 import pandas as pd
 import requests
 
+import dataset
+import geocode_store
+import http_session
+import map_export
+import map_tiles
+import search_index
+import parcel_index
+import run_report
+
 # ── 콘솔 인코딩(윈도우 한글) ───────────────────────────────────────
 try:
     sys.stdout.reconfigure(encoding="utf-8", errors="replace")  # type: ignore[attr-defined]
@@ -90,6 +108,25 @@ def jsonify(v):
         return v.item()
     return v
 
+_JSON_NATIVE = {str, int, float, bool, type(None)}
+
+def json_values(s: pd.Series) -> list:
+    """
+    jsonify를 컬럼 전체에 한 번에 적용 → 파이썬 값 리스트.
+    날짜 dtype은 한 번에 문자열로, 숫자/불리언 dtype은 object 변환(파이썬 int/float),
+    object 컬럼은 기본 타입이 아닌 값(날짜, numpy 스칼라 등)만 jsonify.
+    """
+    na = s.isna().to_numpy()
+    if pd.api.types.is_datetime64_any_dtype(s):
+        vals = s.dt.strftime("%Y-%m-%d").to_numpy(dtype=object)
+    else:
+        vals = s.to_numpy(dtype=object, copy=True)
+        if s.dtype == object:
+            for i in [i for i, v in enumerate(vals) if type(v) not in _JSON_NATIVE]:
+                vals[i] = jsonify(vals[i])
+    vals[na] = None
+    return vals.tolist()
+
 def build_address(row: pd.Series) -> str | None:
     addr = row.get("주소")
     if isinstance(addr, str) and addr.strip():
@@ -101,6 +138,95 @@ def build_address(row: pd.Series) -> str | None:
             parts.append(v.strip())
     return " ".join(parts) if parts else None
 
+ADDRESS_PART_COLS = ["구/시", "법정동", "도로명", "지번"]
+
+def _str_values(df: pd.DataFrame, col: str) -> list[str]:
+    """문자열 값만 strip, 나머지(숫자/결측/컬럼 없음)는 "" — build_address와 같은 규칙"""
+    if col not in df.columns:
+        return [""] * len(df)
+    return [v.strip() if isinstance(v, str) else "" for v in df[col].tolist()]
+
+def address_series(df: pd.DataFrame) -> pd.Series:
+    """build_address를 시트 전체에 한 번에 적용 (행 단위 apply 대신 컬럼 리스트 결합)"""
+    parts = [_str_values(df, c) for c in ADDRESS_PART_COLS]
+    joined = [" ".join(p for p in row if p) or None for row in zip(*parts)]
+    addr = [a or j for a, j in zip(_str_values(df, "주소"), joined)]
+    return pd.Series(addr, index=df.index, dtype=object)
+
+# ── 정규 주소 키 (캐시 키 = 카카오 질의) ───────────────────────────
+# "시도 시군구 법정동 본번-부번" (부번 0이면 생략, 앞 0 제거, 산 지번은 "산12-3")
+#   - 시도는 시/도 컬럼, 없으면 LAWD_CD 목록(region_name)의 구/시 → 시도
+#   - 지번이 없으면 "시도 시군구 도로명 건물번호"
+#   - 지번 비공개(1**), BL- 등 해석 불가 → 그 문자열로는 요청하지 않고 "시도 시군구 법정동"(법정동 대표 좌표)
+#     이렇게 받은 좌표는 그 필지 위치가 아님 → 행의 좌표기준 컬럼(GeoJSON/데이터셋 속성)에 "법정동"으로 남김
+# 같은 필지가 공백/서울 접두어/지번 표기 차이로 다른 캐시 키가 되는 것을 막음.
+LAWD_CSV = Path(__file__).with_name("LAWD_서울_경기.csv")
+_LOT_RE = r"(?:^|\s)(산\s*)?0*(\d+)(?:-0*(\d+))?$"
+_ROAD_RE = r"^(\S+?(?:로|길))\s*0*(\d+)(?:-0*(\d+))?$"
+_DONG_RE = r"^(\S+?(?:동|가|리))\s"
+_sido_by_gu: dict[str, str] | None = None
+
+def sido_by_gu() -> dict[str, str]:
+    """구/시 → 시도 (LAWD_CD CSV의 region_name "서울특별시_강남구", "경기도_성남시_분당구"; 이름이 겹치면 제외)"""
+    global _sido_by_gu
+    if _sido_by_gu is None:
+        pairs = [("서울특별시", gu) for gu in SEOUL_GU]
+        if LAWD_CSV.exists():
+            regions = pd.read_csv(LAWD_CSV, encoding="utf-8-sig", dtype=str)["region_name"].dropna()
+            pairs += [tuple(r.split("_", 1)) for r in regions if "_" in r]
+        found: dict[str, set[str]] = {}
+        for sido, gu in pairs:
+            found.setdefault(gu.replace("_", " "), set()).add(sido)
+        _sido_by_gu = {gu: next(iter(v)) for gu, v in found.items() if len(v) == 1}
+    return _sido_by_gu
+
+def _text_col(df: pd.DataFrame, col: str) -> pd.Series:
+    return pd.Series(_str_values(df, col), index=df.index, dtype=object).str.replace(r"\s+", " ", regex=True)
+
+def _lot(bon: pd.Series, bu: pd.Series) -> pd.Series:
+    """본번/부번(앞 0 제거됨) → "본번-부번" (부번 0/없음 → "본번")"""
+    bu = bu.fillna("")
+    return bon + ("-" + bu).where(bu.ne("") & bu.ne("0"), "")
+
+def geocode_keys(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    행별 지오코딩 키 → DataFrame[key, exact, legacy, basis]
+      key: 정규 주소 키 (만들 수 없으면 None), exact: 필지/건물 단위 키인지
+      legacy: 예전 캐시 키(build_address 문자열) — 이미 받아 둔 좌표 재사용용
+      basis: 좌표 기준 — "지번" / "도로명" / "법정동"(법정동 대표 좌표) / "주소"(주소 문자열 그대로) / None
+    """
+    legacy = address_series(df)
+    sido, gu, dong = _text_col(df, "시/도"), _text_col(df, "구/시"), _text_col(df, "법정동")
+    jibun, road = _text_col(df, "지번"), _text_col(df, "도로명")
+
+    sido = sido.mask(sido.eq(""), gu.map(sido_by_gu()).fillna(""))
+    dong = dong.mask(dong.eq(""), jibun.str.extract(_DONG_RE)[0].fillna(""))
+    area = (sido + " " + gu).str.strip()
+    area_dong = (area + " " + dong).str.strip()
+
+    lot = jibun.str.extract(_LOT_RE)
+    san = pd.Series(np.where(lot[0].notna(), "산", ""), index=df.index, dtype=object)
+    parcel = (area_dong + " " + san + _lot(lot[1], lot[2])).where(lot[1].notna() & dong.ne("") & gu.ne(""))
+    rd = road.str.extract(_ROAD_RE)
+    by_road = (area + " " + rd[0] + " " + _lot(rd[1], rd[2])).where(rd[0].notna() & gu.ne(""))
+
+    key = parcel.fillna(by_road)
+    exact = key.notna()
+    basis = pd.Series(np.where(parcel.notna(), "지번", np.where(by_road.notna(), "도로명", None)), index=df.index, dtype=object)
+    dong_only = key.isna() & gu.ne("")
+    key = key.fillna(area_dong.where(gu.ne("")))
+    basis[dong_only] = "법정동"
+    # 구/시 컬럼이 없는 엑셀 → 주소 문자열 그대로
+    rest = key.isna() & legacy.notna()
+    if rest.any():
+        key[rest] = [normalize_addr(" ".join(a.split())) for a in legacy[rest]]
+        basis[rest] = "주소"
+    key = key.astype(object).where(key.notna(), None)
+    return pd.DataFrame({"key": key, "exact": exact, "legacy": legacy, "basis": basis}, index=df.index)
+
+# 좌표가 어느 단위의 위치인지 ("법정동"이면 법정동 대표 좌표 — 지도에서 따로 표시)
+BASIS_COL = "좌표기준"
+
 def parse_sheet_meta(sheet_name: str) -> tuple[str, str | None]:
     if "_" in sheet_name:
         a, b = sheet_name.split("_", 1)
@@ -108,10 +234,37 @@ def parse_sheet_meta(sheet_name: str) -> tuple[str, str | None]:
     return sheet_name, None
 
 # ── 카카오 지오코딩 ───────────────────────────────────────────────
+KAKAO_ADDRESS_URL = "https://dapi.kakao.com/v2/local/search/address.json"
+
+# 동시 지오코딩 설정 (명령행 -w / --rps 로 덮어쓰기 가능)
+GEOCODE_WORKERS = 8        # 동시 요청 스레드 수
+GEOCODE_RPS = 10.0         # 카카오 초당 최대 요청 수 (0 이하면 제한 없음)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+MAX_RETRIES = 4            # 429/5xx/연결 오류 재시도 횟수
+BACKOFF_BASE = 1.0         # 재시도 대기(초): BACKOFF_BASE * 2^시도 (Retry-After 헤더가 있으면 그 값)
+FAILURE_RETRY_AFTER = 6 * 60 * 60  # 실패한 주소는 이 시간(초) 동안 다시 요청하지 않음
+
+# 오프라인 색인(parcel_index.py): 캐시의 근처 번지 좌표로 추정 → 못 찾은 것만 카카오 요청
+#   "off": 사용 안 함 / "first": 색인 먼저(기본) / "only": 색인만(카카오 요청 없음, 키 불필요)
+# 추정값은 provider=parcel-index로 따로 저장 → 확정 좌표가 아님:
+#   off면 캐시에 없는 것으로 보고 카카오로 다시 확인, first면 LOCAL_TTL_DAYS가 지난 추정값만 카카오로 확인
+LOCAL_MODE = "first"
+ROAD_DB: Path | None = None  # 도로명주소 DB 추출본 CSV (명령행 --road-db)
+LOCAL_PROVIDER = "parcel-index"
+LOCAL_TTL_DAYS = 30.0  # 명령행 --local-ttl
+
+# 통합 GeoJSON 들여쓰기 (None이면 공백 없는 한 줄, 명령행 --geojson-compact)
+GEOJSON_INDENT: int | None = 2
+# 지도 타일 피라미드(map_tiles.py, data/YYYY/tiles/<stem>/) 생성 여부 (명령행 --no-tiles)
+WRITE_TILES = True
+# 실행 보고서(run_report.py) 경로 (명령행 --report / --prometheus, None이면 기본 위치 / 저장 안 함)
+REPORT_PATH: Path | None = None
+PROMETHEUS_PATH: Path | None = None
+
 def geocode_kakao(addr: str, rest_key: str) -> tuple[float | None, float | None]:
-    url = "https://dapi.kakao.com/v2/local/search/address.json"
+    url = KAKAO_ADDRESS_URL
     headers = {"Authorization": f"KakaoAK {rest_key}"}
-    r = requests.get(url, headers=headers, params={"query": addr}, timeout=10)
+    r = http_session.get(url, headers=headers, params={"query": addr}, read_timeout=10)
     r.raise_for_status()
     docs = r.json().get("documents", [])
     if not docs:
@@ -119,37 +272,337 @@ def geocode_kakao(addr: str, rest_key: str) -> tuple[float | None, float | None]
     x = float(docs[0]["x"]); y = float(docs[0]["y"])
     return y, x  # lat, lng
 
-# ── 캐시 로드/세이브 (주소→좌표) ───────────────────────────────────
-def load_cache(cache_path: Path) -> dict[str, list[float|None]]:
-    if cache_path.exists():
+# ── 캐시 로드/세이브 (주소→좌표, geocode_store.py SQLite) ──────────────
+# 폴더 공용 address_cache.sqlite. 같은 폴더의 예전 address_cache.json은 처음 열 때 자동으로 가져옴.
+# 실패 기록(주소별 마지막 실패 시각/횟수)도 같은 파일 → FAILURE_RETRY_AFTER가 지나기 전에는 다시 요청하지 않음.
+# (좌표 없음(검색 결과 0건)은 실패가 아니라 정상 결과 → 캐시에 [None, None])
+GEOCODER_PROVIDER = "kakao"
+GEOCODER_VERSION = "local/v2/search/address"
+
+def load_cache(cache_path: Path) -> geocode_store.GeocodeStore:
+    return geocode_store.GeocodeStore.open(cache_path)
+
+def save_cache(cache: geocode_store.GeocodeStore):
+    # 주소 1건씩 upsert된 내용을 commit (파일 전체를 다시 쓰지 않음)
+    cache.commit()
+
+# ── 지오코딩 엔진 (동시 요청 + 호스트 한도 + 재시도) ────────────────────
+class FatalGeocodeError(RuntimeError):
+    """키 오류(401/403) 등 계속해도 소용없는 오류 → 배치 중단"""
+
+def _retry_after(resp: requests.Response | None) -> float | None:
+    try:
+        return max(0.0, float(resp.headers.get("Retry-After"))) if resp is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def geocode_with_retry(query: str, kakao_key: str) -> tuple[float | None, float | None]:
+    """
+    429/5xx/연결 오류는 지수 백오프로 MAX_RETRIES번까지 재시도.
+    429면 카카오 호스트 한도 자체를 멈춰 다른 스레드도 같이 쉬게 함.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            return geocode_kakao(query, kakao_key)
+        except requests.HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            if status in (401, 403):
+                raise FatalGeocodeError(f"카카오 인증 오류(HTTP {status}) — REST 키를 확인하세요") from e
+            if status not in RETRY_STATUS or attempt == MAX_RETRIES:
+                raise
+            run_report.count("geocode_retries", reason=str(status))
+            wait = _retry_after(e.response) or BACKOFF_BASE * 2 ** attempt
+            limiter = http_session.host_limiter(KAKAO_ADDRESS_URL)
+            if status == 429 and limiter.rate > 0:
+                limiter.pause(wait)  # 다음 acquire()가 wait만큼 대기
+                continue
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == MAX_RETRIES:
+                raise
+            run_report.count("geocode_retries", reason=type(e).__name__)
+            wait = BACKOFF_BASE * 2 ** attempt
+        time.sleep(wait)
+
+def cache_missing(cache: geocode_store.GeocodeStore, addrs: Iterable[str]) -> list[str]:
+    """캐시에 없는 주소 + 다시 확인할 색인 추정값(LOCAL_MODE / LOCAL_TTL_DAYS 기준)"""
+    if LOCAL_MODE == "only":
+        return cache.missing(addrs)
+    before = None
+    if LOCAL_MODE != "off":
+        before = datetime.fromtimestamp(time.time() - LOCAL_TTL_DAYS * 86400, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return cache.missing(addrs, recheck_provider=LOCAL_PROVIDER, recheck_before=before)
+
+def geocode_addresses(
+    addrs: list[str],
+    kakao_key: str,
+    cache: geocode_store.GeocodeStore,
+    normalize_seoul: bool = True,
+    workers: int = GEOCODE_WORKERS,
+    autosave_every: int = 50,
+) -> int:
+    """
+    캐시에 없는(최근 실패도 아닌) 주소를 workers개 스레드로 지오코딩 → cache에 반영.
+    요청 속도는 http_session 호스트 한도(set_rate_limit)로 제어.
+    결과는 완료 순서와 무관하게 addrs 순서대로 반영(자동 저장 시점의 캐시 내용도 항상 동일).
+    반환: 새로 요청한 주소 수
+    """
+    todo = cache_missing(cache, addrs)
+    recent = cache.failed_since(todo, time.time() - FAILURE_RETRY_AFTER)
+    todo = [a for a in todo if a not in recent]
+    if recent:
+        run_report.count("geocode_skipped", len(recent), reason="recent_failure")
+    if todo and LOCAL_MODE != "off":
+        todo = geocode_local(todo, cache)
+    if not todo or LOCAL_MODE == "only":
+        return 0
+
+    # 표기만 다른 주소(예: "강남구 ..." / "서울특별시 강남구 ...")는 정규화한 질의 기준으로 한 번만 요청
+    queries: dict[str, list[str]] = {}
+    for addr in todo:
+        queries.setdefault(normalize_addr(addr, enable=normalize_seoul), []).append(addr)
+
+    def work(query: str):
         try:
-            data = json.loads(cache_path.read_text(encoding="utf-8"))
-            if isinstance(data, dict):
-                return {str(k): v for k, v in data.items()}
+            return geocode_with_retry(query, kakao_key), None
+        except FatalGeocodeError:
+            raise
         except Exception as e:
-            warn(f"캐시 로드 실패: {cache_path.name} | {e}")
-    return {}
+            return None, e
+
+    since_save = 0
+    ex = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        for (query, group), (coords, exc) in zip(queries.items(), ex.map(work, queries)):
+            run_report.count("geocode_kakao", result="error" if exc else "found" if coords[0] is not None else "not_found")
+            for addr in group:
+                if exc is None:
+                    cache.put(addr, *coords, provider=GEOCODER_PROVIDER, version=GEOCODER_VERSION)
+                    cache.clear_failure(addr)
+                    if cache.path in _local_index:
+                        _local_index[cache.path].add(addr, *coords)
+                else:
+                    err(f"geocode error: {addr}", exc)
+                    cache.record_failure(addr, f"{type(exc).__name__}: {exc}")
+            since_save += 1
+            if since_save >= autosave_every:
+                save_cache(cache)
+                since_save = 0
+    finally:
+        ex.shutdown(wait=True, cancel_futures=True)
+    return len(queries)
+
+_road_db_index: parcel_index.ParcelIndex | None = None
+_local_index: dict[Path, parcel_index.ParcelIndex] = {}  # 캐시 파일별 색인 (실행당 1번 구축, 카카오 결과는 추가)
+
+def local_index(cache: geocode_store.GeocodeStore) -> parcel_index.ParcelIndex:
+    """캐시 파일의 번지 색인 (처음 한 번만 build_local_index)"""
+    idx = _local_index.get(cache.path)
+    if idx is None:
+        idx = _local_index[cache.path] = build_local_index(cache)
+    return idx
+
+def build_local_index(cache: geocode_store.GeocodeStore) -> parcel_index.ParcelIndex:
+    """캐시(카카오/예전 캐시 좌표, 색인 추정값 제외) + 도로명주소 DB(ROAD_DB) → 번지 색인"""
+    global _road_db_index
+    idx = parcel_index.ParcelIndex()
+    if ROAD_DB is not None:
+        if _road_db_index is None:
+            _road_db_index = parcel_index.ParcelIndex()
+            log(f"도로명주소 DB 로드: {ROAD_DB} ({_road_db_index.load_road_db(ROAD_DB)}건)")
+        idx = _road_db_index.copy()
+    idx.add_many(cache.items(exclude_provider=LOCAL_PROVIDER))  # 같은 번지는 받아 둔 좌표 우선
+    return idx
+
+def geocode_local(addrs: list[str], cache: geocode_store.GeocodeStore) -> list[str]:
+    """
+    오프라인 색인으로 찾은 주소는 cache에 반영(provider=parcel-index, version=방법) → 못 찾은 주소 반환.
+    이미 캐시에 있는 주소(기한이 지난 추정값)는 다시 추정하지 않고 그대로 반환 → 카카오로 확인.
+    """
+    idx = local_index(cache)
+    recheck = set(cache.get_many(addrs))
+    rest, methods = [], {}
+    for addr in addrs:
+        hit = None if addr in recheck else idx.lookup(addr)
+        if hit is None:
+            rest.append(addr)
+            continue
+        lat, lng, method = hit
+        cache.put(addr, lat, lng, provider=LOCAL_PROVIDER, version=method)
+        methods[method] = methods.get(method, 0) + 1
+    for method, n in methods.items():
+        run_report.count("geocode_local", n, method=method)
+    run_report.count("geocode_local", len(rest), method="miss")
+    if methods:
+        save_cache(cache)
+        log(f"  - 오프라인 색인: {len(addrs) - len(rest)}/{len(addrs)}건 ({', '.join(f'{k}={v}' for k, v in methods.items())})")
+    return rest
+
+# ── 시트 지오코딩 (엑셀/데이터셋 공용) ─────────────────────────────
+def prepare_sheet(df: pd.DataFrame) -> None:
+    """lat/lng/좌표기준 컬럼 보장 + 금액류 정규화 (제자리, 여러 번 호출해도 결과 같음)"""
+    for c in ["lat", "lng"]:
+        if c not in df.columns: df[c] = pd.NA
+    if BASIS_COL not in df.columns: df[BASIS_COL] = pd.Series(None, index=df.index, dtype=object)
+    for c in ["거래금액","보증금","월세"]:
+        if c in df.columns:
+            df[c] = df[c].apply(to_int_or_none)
+
+def pending_addresses(
+    sheets: Iterable[pd.DataFrame],
+    cache: geocode_store.GeocodeStore,
+    report: bool = True,
+) -> list[str]:
+    """
+    좌표가 비어 있는 행의 정규 주소 키 중 캐시에 없는 것 (중복 제거, 처음 나온 순서).
+    예전 캐시 키(원본 주소 문자열)로 받아 둔 좌표가 있으면 정규 키로 복사 → 요청하지 않음.
+    report: 캐시 적중/미스를 실행 보고서에 집계 (계획 단계에서 이미 센 주소를 다시 볼 때는 False)
+    """
+    seen: dict[str, str | None] = {}  # 정규 키 → 예전 키(필지/건물 단위일 때만)
+    for df in sheets:
+        need = df["lat"].isna() | df["lng"].isna()
+        keys = geocode_keys(df[need])
+        for key, exact, legacy in zip(keys["key"], keys["exact"], keys["legacy"]):
+            if key is not None:
+                seen.setdefault(key, legacy if exact and legacy and legacy != key else None)
+    missing = cache_missing(cache, seen)
+    legacy = {k: seen[k] for k in missing if seen[k]}
+    if legacy and cache.alias(legacy):
+        missing = cache_missing(cache, missing)
+    if report:
+        run_report.count("geocode_cache", len(seen) - len(missing), result="hit")
+        run_report.count("geocode_cache", len(missing), result="miss")
+    return missing
+
+def apply_coords(df: pd.DataFrame, cache: geocode_store.GeocodeStore) -> None:
+    """
+    캐시 좌표를 좌표 없는 행에 반영 (제자리, 정규 주소 키 기준) + 좌표기준 컬럼(geocode_keys의 basis).
+    시트의 고유 주소 → 좌표 표를 만든 뒤 get_indexer로 행에 한 번에 붙임(행 단위 조회 없음).
+    """
+    need = (df["lat"].isna() | df["lng"].isna()).to_numpy()
+    if not need.any():
+        return
+    keys = geocode_keys(df[need])
+    addr = keys["key"]
+    uniq = pd.Index(addr.dropna().unique())
+    found = cache.get_many(uniq)
+    coords = [found.get(a) or [None, None] for a in uniq]
+    lat = np.array([c[0] if c[0] and c[1] else np.nan for c in coords] + [np.nan], dtype=float)
+    lng = np.array([c[1] if c[0] and c[1] else np.nan for c in coords] + [np.nan], dtype=float)
+    idx = uniq.get_indexer(addr)  # 주소 없음/캐시 없음 → -1 → 끝의 NaN
+    hit = ~np.isnan(lat[idx])
+    if not hit.any():
+        return
+    rows = df.index[need][hit]
+    df.loc[rows, "lat"] = lat[idx][hit]
+    df.loc[rows, "lng"] = lng[idx][hit]
+    if BASIS_COL not in df.columns:
+        df[BASIS_COL] = pd.Series(None, index=df.index, dtype=object)
+    df.loc[rows, BASIS_COL] = keys["basis"].to_numpy()[hit]
 
-def save_cache(cache_path: Path, cache: dict[str, list[float|None]]):
-    # 보기 좋게 줄바꿈 + 정렬
-    cache_path.write_text(json.dumps(cache, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+# GeoJSON 속성 (시트/주택유형/거래유형 다음 순서)
+FEATURE_COLS = [
+    "구/시", "법정동", "단지명/건물명", "도로명", "지번", "주소", "계약년월", "계약일", "층", "동",
+    "전용면적", "대지면적", "거래금액", "보증금", "월세", "건축년도", "임차기간", "갱신여부",
+    "기존 보증금", "기존 월세", "년", "월", "일", BASIS_COL,
+]
+
+def sheet_features(sheet_name: str, df: pd.DataFrame) -> list[dict]:
+    """좌표 있는 행 → GeoJSON Point feature 목록 (컬럼 단위로 JSON 값 변환 후 행으로 묶음)"""
+    sub = df.dropna(subset=["lat", "lng"])
+    n = len(sub)
+    htype, deal = parse_sheet_meta(sheet_name)
+    names = ["시트", "주택유형", "거래유형", *FEATURE_COLS]
+    cols = [[sheet_name] * n, [htype] * n, [deal] * n] + [
+        json_values(sub[c]) if c in sub.columns else [None] * n for c in FEATURE_COLS
+    ]
+    lng = sub["lng"].astype(float).tolist()
+    lat = sub["lat"].astype(float).tolist()
+    return [
+        {"type": "Feature", "geometry": {"type": "Point", "coordinates": [x, y]}, "properties": dict(zip(names, row))}
+        for x, y, row in zip(lng, lat, zip(*cols))
+    ]
+
+def geocode_sheets(
+    sheets: dict[str, pd.DataFrame],
+    kakao_key: str,
+    workers: int,
+    normalize_seoul: bool,
+    cache: geocode_store.GeocodeStore,
+    autosave_every: int,
+) -> Iterator[list[dict]]:
+    """
+    {시트명: DataFrame}의 각 시트에 lat/lng 채움(제자리) → 시트마다 GeoJSON feature 목록을 내보냄(제너레이터).
+    다 소비해야 모든 시트에 좌표가 채워짐 (write_geojson에 그대로 넘기면 시트 단위로 바로 저장).
+    cache는 in/out 파라미터(변경됨), autosave_every개 지오코딩마다 commit.
+    (process_*/run_*은 geocode_planned로 미리 주소를 한 번에 지오코딩 → 여기서는 캐시만 반영)
+    """
+    for df in sheets.values():
+        prepare_sheet(df)
+
+    # 지오코딩(캐시 활용, 동시 요청) — 모든 시트의 주소를 모아 한 번에
+    # (호출하는 쪽이 geocode_planned로 먼저 지오코딩 → 보통 남은 주소 없음, 캐시 적중은 계획 단계에서 집계)
+    addrs = pending_addresses(sheets.values(), cache, report=False)
+    if addrs:
+        log(f"  - 지오코딩 대상 주소: {len(addrs)}개")
+    geocode_addresses(
+        addrs, kakao_key, cache,
+        normalize_seoul=normalize_seoul, workers=workers, autosave_every=autosave_every,
+    )
+
+    for sheet_name, df in sheets.items():
+        log(f"  - 시트: {sheet_name} (rows={len(df)})")
+
+        # 좌표 반영
+        apply_coords(df, cache)
+
+        # GeoJSON feature (시트 단위)
+        yield sheet_features(sheet_name, df)
+
+def geocode_planned(
+    workbooks: list[dict[str, pd.DataFrame]],
+    kakao_key: str,
+    workers: int,
+    normalize_seoul: bool,
+    cache: geocode_store.GeocodeStore,
+    autosave_every: int,
+) -> int:
+    """
+    배치 계획 단계: 처리할 모든 파일(월)의 시트에서 캐시에 없는 주소를 한 번에 모아 지오코딩.
+    같은 단지 주소가 매달/시트마다 반복되므로 파일별로 따로 모으는 것보다 요청이 줄어듦.
+    이후 파일별 geocode_sheets는 캐시 반영만 함. 반환: 요청한 주소 수
+    """
+    frames = [df for sheets in workbooks for df in sheets.values()]
+    with run_report.stage("geocode", files=len(workbooks)) as st:
+        for df in frames:
+            prepare_sheet(df)
+        addrs = pending_addresses(frames, cache)
+        log(f"지오코딩 계획: 파일 {len(workbooks)}개, 시트 {len(frames)}개 → 새 주소 {len(addrs)}개")
+        n = geocode_addresses(
+            addrs, kakao_key, cache,
+            normalize_seoul=normalize_seoul, workers=workers, autosave_every=autosave_every,
+        )
+        save_cache(cache)
+        st["rows"] = len(addrs)
+    return n
 
 # ── 단일 파일 처리 ────────────────────────────────────────────────
 def process_excel_file(
     infile: Path,
     kakao_key: str,
-    cooldown: float = 0.2,
+    workers: int = GEOCODE_WORKERS,
     include_sheets: list[str] | None = None,
     normalize_seoul: bool = True,
-    cache: dict[str, list[float|None]] | None = None,
+    cache: geocode_store.GeocodeStore | None = None,
     cache_path: Path | None = None,
     autosave_every: int = 50,
+    sheets: dict[str, pd.DataFrame] | None = None,
 ) -> tuple[Path, Path] | None:
     """
     멀티시트 엑셀 1개 처리 → geocoded/에 *_geocoded.xlsx, geojson/에 *.geojson 생성.
     이미 geocoded 파일이 있으면 None 반환(스킵).
-    cache: 주소→[lat, lng] (None 허용). 캐시는 in/out 파라미터(변경됨).
+    cache: 주소→[lat, lng] 저장소(None 허용 → cache_path에서 열기). 캐시는 in/out 파라미터(변경됨).
     autosave_every: N개 주소 지오코딩할 때마다 캐시를 디스크에 주기 저장.
+    sheets: 이미 읽어 둔 시트(run_batch 계획 단계) → 엑셀을 다시 읽지 않음.
     """
     if not infile.exists():
         warn(f"파일 없음: {infile}")
@@ -173,130 +626,222 @@ def process_excel_file(
         return None
 
     # 파일별 캐시 경로 기본값(폴더 공용 캐시)
-    if cache is None:
-        cache = {}
     if cache_path is None:
-        cache_path = out_dir / "address_cache.json"
+        cache_path = out_dir / geocode_store.DB_NAME
+    if cache is None:
+        cache = load_cache(cache_path)
 
     # 엑셀 읽기
     log(f"처리 시작: {infile.name}")
+    if sheets is None:
+        with run_report.stage("read", file=infile.name) as st:
+            sheets = read_excel_sheets(infile, include_sheets)
+            st["rows"] = sum(len(df) for df in sheets.values())
+        geocode_planned([sheets], kakao_key, workers=workers, normalize_seoul=normalize_seoul,
+                        cache=cache, autosave_every=autosave_every)
+    xls = sheets
+    rows = sum(len(df) for df in xls.values())
+
+    # 시트 단위로 좌표 반영 + GeoJSON 저장
+    with run_report.stage("export", file=infile.name) as st:
+        write_geojson(out_geojson, geocode_sheets(
+            xls, kakao_key=kakao_key, workers=workers, normalize_seoul=normalize_seoul,
+            cache=cache, autosave_every=autosave_every,
+        ))
+        st["rows"] = rows
+
+    # 시트 유지하여 엑셀로 기록
+    with run_report.stage("save_xlsx", file=infile.name) as st:
+        with pd.ExcelWriter(out_xls, engine="openpyxl") as writer:
+            for sheet_name, df in xls.items():
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
+        run_report.add_bytes(out_xls, out_xls.stat().st_size)
+        st["rows"] = rows
+
+    # 남은 캐시 저장
+    save_cache(cache)
+    log(f"  저장 완료: {out_xls}")
+    return out_xls, out_geojson
+
+def read_excel_sheets(infile: Path, include_sheets: list[str] | None = None) -> dict[str, pd.DataFrame]:
     xls = pd.read_excel(infile, sheet_name=None, dtype=object)
     if include_sheets:
         xls = {k: v for k, v in xls.items() if k in include_sheets}
         log(f"선택 시트만 처리: {list(xls.keys())}")
+    return xls
 
-    writer = pd.ExcelWriter(out_xls, engine="openpyxl")
-    all_features = []
-    geocoded_count_since_save = 0
+def write_geojson(out_geojson: Path, feature_chunks: Iterable[list[dict]]):
+    """
+    통합 GeoJSON + 컴팩트 포맷(compact/*.rtc, map_export.py) + 타일(tiles/<stem>/, map_tiles.py)
+    + 검색 요약(search/<stem>.json, search_index.py) 저장 + manifest 갱신 (검색 색인은 flush_search_index로 실행 끝에 1번).
+    feature_chunks: 시트별 feature 목록(geocode_sheets) → 받는 대로 GeoJSON에 이어 쓰고 버림
+    (임시 파일에 한 번 쓰고 교체, 컴팩트 포맷은 시트마다 컬럼별 사전 코드로 인코딩해 두었다가 마지막에 합쳐 저장)
+    """
+    compact = map_export.CompactBuilder()
+    ranges: dict[str, list[str] | None] = {}
+    with map_export.GeoJSONWriter(out_geojson, indent=GEOJSON_INDENT) as gj:
+        for features in feature_chunks:
+            gj.write(features)
+            compact.add(features)
+            feature_ranges(features, ranges)
+    log(f"  저장 완료: {out_geojson} (points={gj.count})")
 
-    for sheet_name, df in xls.items():
-        log(f"  - 시트: {sheet_name} (rows={len(df)})")
+    # 컴팩트 포맷(프런트엔드 기본 로딩 경로)
+    paths = map_export.write_compact(map_export.compact_path_for(out_geojson), compact)
+    log(f"  저장 완료: {paths['rtc']} ({', '.join(f'{k}={p.stat().st_size:,}B' for k, p in paths.items())})")
 
-        # lat/lng 보장
-        for c in ["lat", "lng"]:
-            if c not in df.columns: df[c] = pd.NA
-
-        # 금액류 정규화(있을 때만)
-        for c in ["거래금액","보증금","월세"]:
-            if c in df.columns:
-                df[c] = df[c].apply(to_int_or_none)
-
-        need_mask = df["lat"].isna() | df["lng"].isna()
-
-        # 고유 주소 모음
-        addrs: list[str] = (
-            df.loc[need_mask]
-              .apply(build_address, axis=1)
-              .dropna()
-              .astype(str)
-              .unique()
-              .tolist()
-        )
+    # 타일 피라미드(프런트엔드가 화면 안 타일만 요청)
+    if WRITE_TILES:
+        index_path = map_tiles.write_tiles(map_tiles.tiles_dir_for(out_geojson), compact)
+        log(f"  저장 완료: {index_path.parent} (leaf z{map_tiles.LEAF_ZOOM})")
 
-        # 지오코딩(캐시 활용)
-        for addr in addrs:
-            if addr in cache:
-                continue
-            try:
-                q = normalize_addr(addr, enable=normalize_seoul)
-                lat, lng = geocode_kakao(q, kakao_key)
-                cache[addr] = [lat, lng]
-                geocoded_count_since_save += 1
-                if geocoded_count_since_save >= autosave_every:
-                    save_cache(cache_path, cache)
-                    geocoded_count_since_save = 0
-                time.sleep(cooldown)
-            except Exception as e:
-                err(f"geocode error: {addr}", e)
-                cache[addr] = [None, None]
+    # 검색 색인용 달별 단지 요약(search_index.py — 실행 끝 flush_search_index에서 통합 색인에 합침)
+    search_index.write_summary(out_geojson, compact)
 
-        # 좌표 반영
-        for i, row in df[need_mask].iterrows():
-            addr = build_address(row)
-            if not addr: continue
-            lat, lng = cache.get(addr, [None, None])
-            if lat and lng:
-                df.at[i, "lat"] = lat
-                df.at[i, "lng"] = lng
-
-        # GeoJSON feature 축적
-        htype, deal = parse_sheet_meta(sheet_name)
-        for _, r in df.dropna(subset=["lat","lng"]).iterrows():
-            props = {
-                "시트": sheet_name,
-                "주택유형": htype,
-                "거래유형": deal,
-                "구/시": jsonify(r.get("구/시")),
-                "법정동": jsonify(r.get("법정동")),
-                "단지명/건물명": jsonify(r.get("단지명/건물명")),
-                "도로명": jsonify(r.get("도로명")),
-                "지번": jsonify(r.get("지번")),
-                "주소": jsonify(r.get("주소")),
-                "계약년월": jsonify(r.get("계약년월")),
-                "계약일": jsonify(r.get("계약일")),
-                "층": jsonify(r.get("층")),
-                "동": jsonify(r.get("동")),
-                "전용면적": jsonify(r.get("전용면적")),
-                "대지면적": jsonify(r.get("대지면적")),
-                "거래금액": jsonify(r.get("거래금액")),
-                "보증금": jsonify(r.get("보증금")),
-                "월세": jsonify(r.get("월세")),
-                "건축년도": jsonify(r.get("건축년도")),
-                "임차기간": jsonify(r.get("임차기간")),
-                "갱신여부": jsonify(r.get("갱신여부")),
-                "기존 보증금": jsonify(r.get("기존 보증금")),
-                "기존 월세": jsonify(r.get("기존 월세")),
-                "년": jsonify(r.get("년")),
-                "월": jsonify(r.get("월")),
-                "일": jsonify(r.get("일")),
-            }
-            all_features.append({
-                "type":"Feature",
-                "geometry":{"type":"Point","coordinates":[float(r["lng"]), float(r["lat"])]},
-                "properties":props
-            })
+    # ★ manifest 갱신(이 파일 항목만 upsert — 다른 GeoJSON은 다시 읽지 않음)
+    update_manifest(out_geojson, {
+        "size": gj.size, "count": gj.count, "sha256": gj.sha256, "bbox": gj.bbox, **ranges,
+    })
 
-        # 시트 유지하여 엑셀로 기록
-        df.to_excel(writer, sheet_name=sheet_name, index=False)
+# ── Parquet 데이터셋 처리 (land.py 출력) ───────────────────────────
+def geocoded_current(root: Path, ym: str, include_sheets: list[str] | None = None) -> bool:
+    """
+    geocoded/의 그 달이 trades/와 같은 버전이고, 처리할 시트(include_sheets, 없으면 trades 전체)를 모두 가졌는지.
+    (--sheets 로 일부만 처리한 달은 나머지 시트가 없으므로, 전체 실행 때 다시 처리됨)
+    """
+    version = dataset.month_version(root, dataset.TRADES, ym)
+    if version is None or dataset.month_version(root, dataset.GEOCODED, ym) != version:
+        return False
+    wanted = [s for s in dataset.month_sheets(root, dataset.TRADES, ym) if not include_sheets or s in include_sheets]
+    return set(wanted) <= set(dataset.month_sheets(root, dataset.GEOCODED, ym))
 
-    # 남은 캐시 저장
-    save_cache(cache_path, cache)
 
-    writer.close()
-    log(f"  저장 완료: {out_xls}")
+def process_dataset_month(
+    root: Path,
+    ym: str,
+    kakao_key: str,
+    workers: int = GEOCODE_WORKERS,
+    include_sheets: list[str] | None = None,
+    normalize_seoul: bool = True,
+    cache: geocode_store.GeocodeStore | None = None,
+    cache_path: Path | None = None,
+    autosave_every: int = 50,
+    write_xlsx: bool = False,
+    sheets: dict[str, pd.DataFrame] | None = None,
+) -> Path | None:
+    """
+    데이터셋 trades/의 한 달 → geocoded/에 같은 버전으로 저장 + data/YYYY/geojson/에 *.geojson 생성.
+    geocoded 쪽이 이미 같은 버전이고 처리할 시트를 모두 가졌으면 None 반환(스킵).
+    write_xlsx: data/YYYY/geocoded/*_geocoded.xlsx도 생성(예전 출력과 동일한 위치).
+    sheets: 이미 읽어 둔 시트(run_dataset 계획 단계) → 다시 읽지 않음.
+    """
+    version = dataset.month_version(root, dataset.TRADES, ym)
+    if version is None:
+        warn(f"데이터셋에 없음: {ym}")
+        return None
+    if geocoded_current(root, ym, include_sheets):
+        log(f"[SKIP] 이미 지오코딩됨: {ym} ({version})")
+        return None
+
+    stem = f"실거래_{ym}_{version}"
+    out_dir = Path(root).parent / ym[:4]
+    out_geo_dir = out_dir / "geojson"
+    out_geo_dir.mkdir(parents=True, exist_ok=True)
+    out_geojson = out_geo_dir / f"{stem}.geojson"
+
+    if cache_path is None:
+        cache_path = out_dir / geocode_store.DB_NAME
+    if cache is None:
+        cache = load_cache(cache_path)
 
-    # 통합 GeoJSON 저장 (예쁘게: indent=2, 키 정렬)
-    all_gj = {"type":"FeatureCollection","features":all_features}
-    out_geojson.write_text(json.dumps(all_gj, ensure_ascii=False, indent=2, sort_keys=False), encoding="utf-8")
-    log(f"  저장 완료: {out_geojson} (points={len(all_features)})")
+    log(f"처리 시작: {ym} ({version})")
+    if sheets is None:
+        with run_report.stage("read", ym=ym) as st:
+            sheets = dataset.read_month(root, dataset.TRADES, ym, include_sheets)
+            st["rows"] = sum(len(df) for df in sheets.values())
+        geocode_planned([sheets], kakao_key, workers=workers, normalize_seoul=normalize_seoul,
+                        cache=cache, autosave_every=autosave_every)
+    rows = sum(len(df) for df in sheets.values())
+    with run_report.stage("export", ym=ym) as st:
+        write_geojson(out_geojson, geocode_sheets(
+            sheets, kakao_key=kakao_key, workers=workers, normalize_seoul=normalize_seoul,
+            cache=cache, autosave_every=autosave_every,
+        ))
+        save_cache(cache)
+        st["rows"] = rows
 
-    # 통합 GeoJSON 저장 후
-    out_geojson.write_text(json.dumps(all_gj, ensure_ascii=False, indent=2), encoding="utf-8")
+    with run_report.stage("save_dataset", ym=ym) as st:
+        for df in sheets.values():
+            for c in ["lat", "lng"]:
+                df[c] = pd.to_numeric(df[c], errors="coerce")
+        dataset.write_month(root, dataset.GEOCODED, ym, sheets, version)
+        st["rows"] = rows
+    log(f"  저장 완료: {dataset.month_dir(root, dataset.GEOCODED, ym)}")
 
-    # ★ manifest 갱신
-    write_manifest(out_geojson.parent)
+    if write_xlsx:
+        out_xls_dir = out_dir / "geocoded"
+        out_xls_dir.mkdir(parents=True, exist_ok=True)
+        out_xls = out_xls_dir / f"{stem}_geocoded.xlsx"
+        with run_report.stage("save_xlsx", ym=ym) as st:
+            with pd.ExcelWriter(out_xls, engine="openpyxl") as writer:
+                for sheet_name, df in sheets.items():
+                    df.to_excel(writer, sheet_name=sheet_name, index=False)
+            run_report.add_bytes(out_xls, out_xls.stat().st_size)
+            st["rows"] = rows
+        log(f"  저장 완료: {out_xls}")
+    return out_geojson
 
-    return out_xls, out_geojson
+def run_dataset(
+    root: Path,
+    kakao_key: str,
+    months: list[str] | None = None,
+    workers: int = GEOCODE_WORKERS,
+    include_sheets: list[str] | None = None,
+    normalize_seoul: bool = True,
+    autosave_every: int = 50,
+    write_xlsx: bool = False,
+):
+    """데이터셋의 월(지정 없으면 전체)을 순서대로 처리. 주소 캐시는 연도 폴더 공용(data/YYYY/address_cache.sqlite)"""
+    if not dataset.available():
+        raise SystemExit("Parquet 데이터셋을 읽으려면 pyarrow가 필요합니다. (pip install pyarrow)")
+    all_months = dataset.list_months(root, dataset.TRADES)
+    months = [m for m in all_months if not months or m in months]
+    if not months:
+        warn(f"처리할 월이 없습니다: {root}")
+        return
+
+    log(f"총 {len(months)}개월 검사(geocoded 버전이 다를 때만 처리): {months}")
+    for year in sorted({m[:4] for m in months}):
+        cache_path = Path(root).parent / year / geocode_store.DB_NAME
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache = load_cache(cache_path)
+        log(f"캐시 로드: {cache_path} (entries={len(cache)})")
+
+        # 계획: 처리할 달(geocoded가 최신이 아닌 달)을 모두 읽어 새 주소를 한 번에 지오코딩
+        with run_report.stage("read", year=year) as st:
+            pending = {
+                ym: dataset.read_month(root, dataset.TRADES, ym, include_sheets)
+                for ym in months
+                if ym[:4] == year
+                and not geocoded_current(root, ym, include_sheets)
+            }
+            st["rows"] = sum(len(df) for sheets in pending.values() for df in sheets.values())
+        if not pending:
+            log(f"[SKIP] {year}: 모두 지오코딩됨")
+            continue
+        geocode_planned(
+            list(pending.values()), kakao_key, workers=workers, normalize_seoul=normalize_seoul,
+            cache=cache, autosave_every=autosave_every,
+        )
+        for ym, sheets in pending.items():
+            process_dataset_month(
+                root=root, ym=ym, kakao_key=kakao_key, workers=workers,
+                include_sheets=include_sheets, normalize_seoul=normalize_seoul,
+                cache=cache, autosave_every=autosave_every,
+                write_xlsx=write_xlsx, sheets=sheets,
+            )
+        save_cache(cache)
+        log(f"캐시 저장 완료: {cache_path.name} (entries={len(cache)})")
 
 # ── 디렉터리 배치 처리 ────────────────────────────────────────────
 def find_excel_files(directory: Path, recursive: bool = False) -> Iterable[Path]:
@@ -311,7 +856,7 @@ def find_excel_files(directory: Path, recursive: bool = False) -> Iterable[Path]
 def run_batch(
     directory: Path,
     kakao_key: str,
-    cooldown: float = 0.2,
+    workers: int = GEOCODE_WORKERS,
     include_sheets: list[str] | None = None,
     normalize_seoul: bool = True,
     recursive: bool = False,
@@ -324,109 +869,277 @@ def run_batch(
         return
 
     # 폴더 공용 캐시 파일
-    cache_path = directory / "address_cache.json"
+    cache_path = directory / geocode_store.DB_NAME
     cache = load_cache(cache_path)
     log(f"캐시 로드: {cache_path.name} (entries={len(cache)})")
 
     files.sort(key=lambda p: p.name)
     log(f"총 {len(files)}개 파일 검사(geocoded 없을 때만 처리):")
+    pending: dict[Path, dict[str, pd.DataFrame]] = {}
     for f in files:
         out_xls_dir = f.parent / "geocoded"
         out_xls = out_xls_dir / f"{f.stem}_geocoded.xlsx"
         if out_xls.exists():
             log(f"[SKIP] {f.name} → 이미 존재: geocoded/{f.stem}_geocoded.xlsx")
             continue
+        with run_report.stage("read", file=f.name) as st:
+            pending[f] = read_excel_sheets(f, include_sheets)
+            st["rows"] = sum(len(df) for df in pending[f].values())
+
+    # 계획: 모든 대상 파일의 새 주소를 한 번에 지오코딩 → 파일별로는 캐시 반영만
+    if pending:
+        geocode_planned(
+            list(pending.values()), kakao_key, workers=workers, normalize_seoul=normalize_seoul,
+            cache=cache, autosave_every=autosave_every,
+        )
+    for f, sheets in pending.items():
         process_excel_file(
             infile=f,
             kakao_key=kakao_key,
-            cooldown=cooldown,
+            workers=workers,
             include_sheets=include_sheets,
             normalize_seoul=normalize_seoul,
             cache=cache,
             cache_path=cache_path,
             autosave_every=autosave_every,
+            sheets=sheets,
         )
 
     # 배치 종료 시 최종 캐시 저장(한 번 더 안전하게)
-    save_cache(cache_path, cache)
+    save_cache(cache)
     log(f"캐시 저장 완료: {cache_path.name} (entries={len(cache)})")
 
-def write_manifest(geojson_dir: Path):
+# ── manifest (data/manifest.json) ─────────────────────────────────
+# 항목: {path, label, month, version, size, count, sha256, bbox, months, dates, compact?, tiles?}
+#   bbox = [서, 남, 동, 북], months = [첫 계약년월, 끝 계약년월], dates = [첫 계약일, 끝 계약일]
+# 같은 달의 예전 버전(실거래_YYYYMM_v…)은 최신 버전 하나로 합침(파일은 지우지 않음)
+MANIFEST_NAME = "manifest.json"
+_VERSION_RE = re.compile(r"_(v\d{10})$")
+
+def feature_ranges(features: list[dict], ranges: dict | None = None) -> dict:
+    """feature 목록의 계약년월/계약일 최소~최대를 ranges({"months", "dates"})에 누적"""
+    ranges = {} if ranges is None else ranges
+    for name, col in (("months", "계약년월"), ("dates", "계약일")):
+        vals = [v for f in features if isinstance(v := (f.get("properties") or {}).get(col), str) and v]
+        if not vals:
+            ranges.setdefault(name, None)
+            continue
+        lo, hi = min(vals), max(vals)
+        cur = ranges.get(name)
+        ranges[name] = [lo, hi] if cur is None else [min(cur[0], lo), max(cur[1], hi)]
+    return ranges
+
+def geojson_stats(path: Path) -> dict:
+    """저장된 GeoJSON을 다시 읽어 manifest 통계 계산 (전체 재구성용)"""
+    data = path.read_bytes()
+    features = json.loads(data).get("features", [])
+    xy = np.array([f["geometry"]["coordinates"][:2] for f in features], dtype=float).reshape(-1, 2)
+    bbox = [*map(float, xy.min(axis=0)), *map(float, xy.max(axis=0))] if len(xy) else None
+    return {
+        "size": len(data), "count": len(features), "sha256": hashlib.sha256(data).hexdigest(), "bbox": bbox,
+        **feature_ranges(features),
+    }
+
+def _series(item: dict) -> tuple[str, str]:
+    """manifest 항목 → (폴더, 버전 뗀 파일명): 같은 달의 버전들을 묶는 키"""
+    p = Path(item["path"])
+    return str(p.parent), _VERSION_RE.sub("", p.stem)
+
+def _version(item: dict) -> str:
+    m = _VERSION_RE.search(Path(item["path"]).stem)
+    return item.get("version") or (m.group(1) if m else "")
+
+def manifest_entry(geojson_path: Path, kakao_map_dir: Path, stats: dict) -> dict:
+    """GeoJSON 1개 → manifest 항목 (경로는 kakao-map 기준 상대 경로)"""
+    rel = lambda q: os.path.relpath(q.resolve(), kakao_map_dir.resolve()).replace(os.sep, "/")
+    m = re.search(r"(\d{6})", geojson_path.name)
+    item = {"path": rel(geojson_path), "label": f"{m.group(1)[:4]}.{m.group(1)[4:6]}" if m else geojson_path.stem}
+    if m:
+        item["month"] = m.group(1)
+    v = _VERSION_RE.search(geojson_path.stem)
+    if v:
+        item["version"] = v.group(1)
+    bbox = stats.get("bbox")
+    item.update({
+        "size": stats["size"], "count": stats["count"], "sha256": stats["sha256"],
+        "bbox": [round(x, 6) for x in bbox] if bbox else None,
+        "months": stats.get("months"), "dates": stats.get("dates"),
+    })
+
+    # 컴팩트 포맷이 있으면 함께 안내(프런트엔드는 compact 우선, 없으면 path의 GeoJSON)
+    rtc = map_export.compact_path_for(geojson_path)
+    if rtc.exists():
+        data = rtc.read_bytes()
+        compact = {"path": rel(rtc), "count": map_export.read_header(rtc)["count"], "size": len(data),
+                   "sha256": hashlib.sha256(data).hexdigest()}
+        for enc in ("gz", "br"):
+            q = rtc.with_name(f"{rtc.name}.{enc}")
+            if q.exists():
+                compact[enc] = rel(q)
+        item["compact"] = compact
+
+    # 타일 피라미드가 있으면 집계 index 경로(타일 경로는 index 기준 <base><z>/<x>/<y>.rtc)
+    tiles = map_tiles.tiles_dir_for(geojson_path) / map_tiles.INDEX_NAME
+    if tiles.exists():
+        item["tiles"] = {"path": rel(tiles), "sha256": hashlib.sha256(tiles.read_bytes()).hexdigest()}
+    return item
+
+def _latest_versions(items: list[dict]) -> list[dict]:
+    latest: dict[tuple[str, str], dict] = {}
+    for item in items:
+        key = _series(item)
+        if key not in latest or _version(item) >= _version(latest[key]):
+            latest[key] = item
+    return list(latest.values())
+
+_search_index_pending: set[Path] = set()  # 이번 실행에서 manifest를 저장한 data 폴더
+
+def _save_manifest(manifest_path: Path, items: list[dict]) -> None:
+    items = sorted(items, key=lambda x: (x["label"], x["path"]))
+    text = json.dumps(items, ensure_ascii=False, indent=2, sort_keys=False)
+    map_export.write_atomic(manifest_path, text.encode("utf-8"))
+    log(f"manifest.json updated → {manifest_path} (items={len(items)})")
+    # manifest의 달 목록이 바뀜 → 검색 색인은 실행 끝에 한 번만 다시 합침(달마다 전체를 합치지 않게)
+    _search_index_pending.add(manifest_path.parent)
+
+def flush_search_index() -> None:
+    """이번 실행에서 manifest가 바뀐 data 폴더마다 검색 색인(data/search_index.json) 1번 갱신 — 달별 요약만 읽음"""
+    while _search_index_pending:
+        search_index.write_index(_search_index_pending.pop())
+
+def update_manifest(out_geojson: Path, stats: dict) -> None:
     """
-    data/YYYY/geojson/*.geojson 전체를 스캔하여
-    data/manifest.json 하나로 갱신 (연도 누적)
+    방금 저장한 GeoJSON 항목만 data/manifest.json에 upsert (같은 달 예전 버전은 교체).
+    manifest가 없거나 깨져 있으면 rebuild_manifest로 전체 재구성.
     """
-    data_root = geojson_dir.parent.parent  # .../data
-    kakao_map_dir = data_root.parent / "kakao-map"
+    data_root = out_geojson.parent.parent.parent  # .../data
+    manifest_path = data_root / MANIFEST_NAME
+    try:
+        items = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        items = None
+    if not isinstance(items, list):
+        rebuild_manifest(data_root)
+        return
+
+    entry = manifest_entry(out_geojson, data_root.parent / "kakao-map", stats)
+    key = _series(entry)
+    same = [x for x in items if _series(x) == key and x["path"] != entry["path"]]
+    newer = [x for x in same if _version(x) > _version(entry)]
+    if newer:
+        warn(f"manifest에 더 새 버전이 있어 유지: {max(newer, key=_version)['path']}")
+    rest = [x for x in items if _series(x) != key]
+    _save_manifest(manifest_path, rest + _latest_versions([entry, *same]))
 
-    # data/<YYYY>/geojson/**/*.geojson 전부
-    items = []
-    for year_dir in sorted(
-        [p for p in data_root.iterdir() if p.is_dir() and re.fullmatch(r"\d{4}", p.name)],
-        key=lambda p: p.name
-    ):
+def rebuild_manifest(data_root: Path) -> None:
+    """
+    data/YYYY/geojson/*.geojson 전체를 스캔하여 data/manifest.json 재구성 (연도 누적)
+    파일마다 다시 읽어 통계 계산 → 처음 만들 때/수동 복구용(--rebuild-manifest)
+    """
+    kakao_map_dir = data_root.parent / "kakao-map"
+    paths = []
+    for year_dir in sorted(p for p in data_root.iterdir() if p.is_dir() and re.fullmatch(r"\d{4}", p.name)):
         gj_dir = year_dir / "geojson"
-        if not gj_dir.is_dir():
-            continue
-        for p in sorted(gj_dir.glob("*.geojson")):
-            m = re.search(r"(\d{6})", p.name)
-            label = f"{m.group(1)[:4]}.{m.group(1)[4:6]}" if m else p.stem
-            # kakao-map 기준 상대 경로
-            rel_path = os.path.relpath(p.resolve(), kakao_map_dir.resolve()).replace(os.sep, "/")
-            items.append({"path": rel_path, "label": label})
-
-    # label 기준 정렬
-    items.sort(key=lambda x: (x["label"], x["path"]))
-
-    manifest_path = data_root / "manifest.json"
-    manifest_path.write_text(
-        json.dumps(items, ensure_ascii=False, indent=2, sort_keys=False),
-        encoding="utf-8",
-    )
-    print(f"[i] manifest.json updated → {manifest_path} (items={len(items)})")
-    
+        if gj_dir.is_dir():
+            paths.extend(sorted(gj_dir.glob("*.geojson")))
+    rel = lambda q: os.path.relpath(q.resolve(), kakao_map_dir.resolve()).replace(os.sep, "/")
+    keep = _latest_versions([{"path": rel(p), "_file": p} for p in paths])  # 최신 버전 파일만 읽음
+    items = [manifest_entry(x["_file"], kakao_map_dir, geojson_stats(x["_file"])) for x in keep]
+    _save_manifest(data_root / MANIFEST_NAME, items)
+    flush_search_index()
+
 # ── CLI ────────────────────────────────────────────────────────────
 def main():
+    global LOCAL_MODE, LOCAL_TTL_DAYS, ROAD_DB, GEOJSON_INDENT, WRITE_TILES, REPORT_PATH, PROMETHEUS_PATH
     ap = argparse.ArgumentParser(
         description="부동산 엑셀(멀티시트) 지오코딩 배치: geocoded/에 *_geocoded.xlsx 없을 때만 처리 + geojson/에 *.geojson 생성 + 주소캐시"
     )
     g = ap.add_mutually_exclusive_group(required=True)
     g.add_argument("-i","--input", help="단일 엑셀 파일 경로")
     g.add_argument("-d","--dir", help="원본 엑셀 폴더(내의 모든 *.xlsx/*.xls 순차 처리)")
+    g.add_argument("--dataset", nargs="?", const=str(dataset.DEFAULT_ROOT),
+                   help=f"land.py Parquet 데이터셋 루트(기본: {dataset.DEFAULT_ROOT})")
+    g.add_argument("--rebuild-manifest", nargs="?", const=str(dataset.DEFAULT_ROOT.parent),
+                   help=f"data/YYYY/geojson 전체를 다시 읽어 manifest.json 재구성(기본: {dataset.DEFAULT_ROOT.parent})")
+
+    ap.add_argument("--months", nargs="*", help="--dataset: 처리할 월(YYYYMM). 지정 없으면 전체")
+    ap.add_argument("--xlsx", action="store_true", help="--dataset: geocoded/*_geocoded.xlsx도 생성")
 
-    ap.add_argument("--cooldown", type=float, default=0.2, help="지오코딩 요청 간 대기(초)")
+    ap.add_argument("-w","--workers", type=int, default=GEOCODE_WORKERS, help="동시 지오코딩 스레드 수")
+    ap.add_argument("--rps", type=float, default=GEOCODE_RPS, help="카카오 초당 최대 요청 수(0 이하면 제한 없음)")
+    ap.add_argument("--cooldown", type=float, default=None, help="(예전 옵션) 요청 간 최소 간격(초) → --rps 1/cooldown 과 같음")
+    ap.add_argument("--local", choices=["off", "first", "only"], default=LOCAL_MODE,
+                    help="오프라인 번지 색인: off=사용 안 함, first=색인 먼저(기본), only=색인만(카카오 요청/키 없음)")
+    ap.add_argument("--local-ttl", type=float, default=LOCAL_TTL_DAYS,
+                    help="색인 추정 좌표를 카카오로 다시 확인하기까지의 기간(일, --local first)")
+    ap.add_argument("--road-db", help="도로명주소 DB 추출본 CSV(시도,시군구,법정동,본번,부번,도로명,건물본번,건물부번,lat,lng)")
+    ap.add_argument("--geojson-compact", action="store_true", help="통합 GeoJSON을 들여쓰기 없이 저장(파일 크기/저장 시간 감소)")
+    ap.add_argument("--no-tiles", action="store_true", help="지도 타일 피라미드(data/YYYY/tiles/) 생성 안 함")
     ap.add_argument("--sheets", nargs="*", help="특정 시트만 처리(공백으로 구분). 지정 없으면 전체")
     ap.add_argument("--no-seoul-normalize", action="store_true", help="서울 구 단독 주소 자동 보정 끄기")
     ap.add_argument("--recursive", action="store_true", help="폴더 재귀 탐색")
     ap.add_argument("--keyring-service", default="kakao_rest_api", help="keyring 서비스명(기본: kakao_rest_api)")
     ap.add_argument("--keyring-user", default="default", help="keyring 사용자명(기본: default)")
     ap.add_argument("--autosave-every", type=int, default=50, help="캐시 주기 저장 간격(주소 N개마다 저장)")
+    ap.add_argument("--pool-size", type=int, default=http_session.POOL_SIZE, help="HTTP 커넥션 풀 크기(keep-alive 유지)")
+    ap.add_argument("--connect-timeout", type=float, default=http_session.CONNECT_TIMEOUT, help="HTTP 연결 타임아웃(초)")
+    ap.add_argument("--report", help=f"실행 보고서 JSON 경로(기본: {run_report.REPORT_DIR}/geocode_<시각>.json)")
+    ap.add_argument("--prometheus", help="실행 보고서를 Prometheus 텍스트 형식으로도 저장할 경로(.prom)")
 
     args = ap.parse_args()
-    kakao_key = get_kakao_key(service=args.keyring_service, user=args.keyring_user)
+    REPORT_PATH = Path(args.report).expanduser() if args.report else None
+    PROMETHEUS_PATH = Path(args.prometheus).expanduser() if args.prometheus else None
+    if args.rebuild_manifest:
+        rebuild_manifest(Path(args.rebuild_manifest).expanduser().resolve())
+        return
+    http_session.configure(pool_size=max(args.pool_size, args.workers), connect_timeout=args.connect_timeout)
+    rps = args.rps if args.cooldown is None else (1.0 / args.cooldown if args.cooldown > 0 else 0)
+    http_session.set_rate_limit(KAKAO_ADDRESS_URL, rps)
+    log(f"동시 지오코딩: workers={args.workers}, rps={rps:g}")
+    LOCAL_MODE = args.local
+    LOCAL_TTL_DAYS = args.local_ttl
+    GEOJSON_INDENT = None if args.geojson_compact else GEOJSON_INDENT
+    ROAD_DB = Path(args.road_db).expanduser() if args.road_db else None
+    WRITE_TILES = not args.no_tiles
+    if LOCAL_MODE == "only":
+        log("오프라인 모드: 카카오 요청 없이 번지 색인으로만 좌표 추정")
+        kakao_key = ""
+    else:
+        kakao_key = get_kakao_key(service=args.keyring_service, user=args.keyring_user)
 
     if args.input:
         infile = Path(args.input).expanduser().resolve()
         # 단일 파일도 폴더 공용 캐시 사용
-        cache_path = infile.parent / "address_cache.json"
+        cache_path = infile.parent / geocode_store.DB_NAME
         cache = load_cache(cache_path)
         process_excel_file(
             infile=infile,
             kakao_key=kakao_key,
-            cooldown=args.cooldown,
+            workers=args.workers,
             include_sheets=args.sheets,
             normalize_seoul=(not args.no_seoul_normalize),
             cache=cache,
             cache_path=cache_path,
             autosave_every=args.autosave_every,
         )
-        save_cache(cache_path, cache)
+        save_cache(cache)
+    elif args.dataset:
+        run_dataset(
+            root=Path(args.dataset).expanduser().resolve(),
+            kakao_key=kakao_key,
+            months=args.months,
+            workers=args.workers,
+            include_sheets=args.sheets,
+            normalize_seoul=(not args.no_seoul_normalize),
+            autosave_every=args.autosave_every,
+            write_xlsx=args.xlsx,
+        )
     else:
         directory = Path(args.dir).expanduser().resolve()
         run_batch(
             directory=directory,
             kakao_key=kakao_key,
-            cooldown=args.cooldown,
+            workers=args.workers,
             include_sheets=args.sheets,
             normalize_seoul=(not args.no_seoul_normalize),
             recursive=args.recursive,
@@ -434,4 +1147,14 @@ def main():
         )
 
 if __name__ == "__main__":
-    main()
+    run_report.start("geocode")
+    status = "error"
+    try:
+        main()
+        status = "ok"
+    except KeyboardInterrupt:
+        status = "interrupted"
+        warn("Interrupted by user")
+    finally:
+        flush_search_index()  # 실행 끝에 1번 (중단돼도 그때까지 저장한 달은 반영)
+        run_report.finish(REPORT_PATH, PROMETHEUS_PATH, status=status)
@@ -0,0 +1,319 @@
+# geocode_store.py
+# 주소 → 좌표 캐시 저장소 (SQLite) — address_cache.json 대체
+# - address_cache.json은 autosave마다 파일 전체(수만 줄, indent+sort_keys)를 다시 쓰고,
+#   쓰는 도중 중단되면 깨질 수 있음
+# - 여기서는 주소 1건 = 1행 upsert, autosave = commit (WAL 저널 → 바뀐 페이지만 추가 기록)
+# - 행마다 provider(지오코더)/version/resolved_at(UTC) 기록 → 나중에 지오코더를 바꿔도 출처 구분 가능
+# - 실패 기록(주소별 마지막 실패 시각/횟수/오류)도 같은 파일의 failures 테이블
+# - 처음 열 때 같은 폴더에 address_cache.json(및 address_failures.json)이 있으면 한 번만 가져옴
+#
+# 사용 예)
+#   store = GeocodeStore.open(Path("data/2025/address_cache.sqlite"))
+#   store["강남구 개포동 1163-4"] = [37.47, 127.05]      # dict처럼 사용 가능 (값: [lat, lng])
+#   store.get_many(["주소1", "주소2"])                   # 일괄 조회 → {주소: [lat, lng]}
+#   store.commit()
+#
+#   python geocode_store.py import data/2025/address_cache.json   → 같은 폴더 address_cache.sqlite
+#   python geocode_store.py export data/2025/address_cache.sqlite out.json
+#   python geocode_store.py stats data/2025/address_cache.sqlite
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator
+
+DB_NAME = "address_cache.sqlite"
+LEGACY_JSON = "address_cache.json"
+LEGACY_FAILURES_JSON = "address_failures.json"
+LEGACY_PROVIDER = "legacy-json"  # 가져온 JSON 항목(출처/시각 모름 → version/resolved_at 없음)
+
+_SQL_VARS = 900  # IN (...) 한 번에 넣는 주소 수 (SQLite 변수 한도 999 이하)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS geocode (
+    addr        TEXT PRIMARY KEY,
+    lat         REAL,
+    lng         REAL,
+    provider    TEXT,
+    version     TEXT,
+    resolved_at TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS failures (
+    addr      TEXT PRIMARY KEY,
+    failed_at REAL NOT NULL,
+    attempts  INTEGER NOT NULL,
+    error     TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+"""
+
+
+_UPSERT = (
+    "INSERT INTO geocode (addr, lat, lng, provider, version, resolved_at) VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(addr) DO UPDATE SET lat=excluded.lat, lng=excluded.lng, provider=excluded.provider, "
+    "version=excluded.version, resolved_at=excluded.resolved_at"
+)
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _chunks(items: list[str], size: int = _SQL_VARS) -> Iterator[list[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class GeocodeStore:
+    """
+    SQLite 주소 캐시. 기존 dict 캐시 자리에 그대로 쓸 수 있게
+    `in` / [] / get / len / 반복을 지원 (값은 [lat, lng], 좌표 없음은 [None, None]).
+    쓰기는 commit() 전까지 한 트랜잭션 → autosave는 commit 한 번.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    @classmethod
+    def open(cls, path: Path) -> "GeocodeStore":
+        """저장소 열기. 비어 있고 같은 폴더에 예전 JSON 캐시가 있으면 가져옴(최초 1회)"""
+        store = cls(path)
+        if store.meta("legacy_imported") is None:
+            legacy = store.path.with_name(LEGACY_JSON)
+            if legacy.exists() and len(store) == 0:
+                store.import_json(legacy)
+            failures = store.path.with_name(LEGACY_FAILURES_JSON)
+            if failures.exists():
+                store.import_failures_json(failures)
+            store.set_meta("legacy_imported", _now_iso())
+            store.commit()
+        return store
+
+    # ── dict 호환 ──
+    def __contains__(self, addr: object) -> bool:
+        return self.conn.execute("SELECT 1 FROM geocode WHERE addr = ?", (addr,)).fetchone() is not None
+
+    def __getitem__(self, addr: str) -> list[float | None]:
+        row = self.conn.execute("SELECT lat, lng FROM geocode WHERE addr = ?", (addr,)).fetchone()
+        if row is None:
+            raise KeyError(addr)
+        return [row[0], row[1]]
+
+    def __setitem__(self, addr: str, coords) -> None:
+        lat, lng = coords
+        self.put(addr, lat, lng)
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM geocode").fetchone()[0]
+
+    def __iter__(self) -> Iterator[str]:
+        return (r[0] for r in self.conn.execute("SELECT addr FROM geocode ORDER BY addr").fetchall())
+
+    def get(self, addr: str, default=None):
+        try:
+            return self[addr]
+        except KeyError:
+            return default
+
+    def items(self, exclude_provider: str | None = None) -> Iterator[tuple[str, list[float | None]]]:
+        """(주소, [lat, lng]) 주소순. exclude_provider: 이 provider가 만든 항목은 제외"""
+        if exclude_provider is None:
+            rows = self.conn.execute("SELECT addr, lat, lng FROM geocode ORDER BY addr").fetchall()
+        else:
+            rows = self.conn.execute(
+                "SELECT addr, lat, lng FROM geocode WHERE provider IS NOT ? ORDER BY addr", (exclude_provider,)
+            ).fetchall()
+        for addr, lat, lng in rows:
+            yield addr, [lat, lng]
+
+    # ── 조회/저장 ──
+    def put(self, addr: str, lat: float | None, lng: float | None,
+            provider: str | None = None, version: str | None = None) -> None:
+        """주소 1건 upsert (commit은 호출 측에서 모아서)"""
+        self.conn.execute(_UPSERT, (addr, lat, lng, provider, version, _now_iso()))
+
+    def put_many(self, rows: Iterable[tuple[str, float | None, float | None]],
+                 provider: str | None = None, version: str | None = None) -> None:
+        ts = _now_iso()
+        self.conn.executemany(_UPSERT, ((a, lat, lng, provider, version, ts) for a, lat, lng in rows))
+
+    def get_many(self, addrs: Iterable[str]) -> dict[str, list[float | None]]:
+        """일괄 조회 → 저장소에 있는 주소만 {주소: [lat, lng]}"""
+        out: dict[str, list[float | None]] = {}
+        for chunk in _chunks(list(dict.fromkeys(addrs))):
+            q = f"SELECT addr, lat, lng FROM geocode WHERE addr IN ({','.join('?' * len(chunk))})"
+            for addr, lat, lng in self.conn.execute(q, chunk):
+                out[addr] = [lat, lng]
+        return out
+
+    def missing(self, addrs: Iterable[str], recheck_provider: str | None = None,
+                recheck_before: str | None = None) -> list[str]:
+        """
+        저장소에 없는 주소 (중복 제거, 입력 순서 유지).
+        recheck_provider: 이 provider의 항목(추정값 등)도 없는 것으로 취급
+          — recheck_before(ISO UTC)를 주면 그보다 오래된 항목만
+        """
+        addrs = list(dict.fromkeys(addrs))
+        found: set[str] = set()
+        extra, args = "", []
+        if recheck_provider is not None:
+            extra = " AND NOT (provider IS ? AND (? IS NULL OR resolved_at IS NULL OR resolved_at < ?))"
+            args = [recheck_provider, recheck_before, recheck_before]
+        for chunk in _chunks(addrs):
+            q = f"SELECT addr FROM geocode WHERE addr IN ({','.join('?' * len(chunk))}){extra}"
+            found.update(r[0] for r in self.conn.execute(q, [*chunk, *args]))
+        return [a for a in addrs if a not in found]
+
+    def alias(self, pairs: dict[str, str]) -> int:
+        """
+        {새 키: 기존 키} — 기존 키의 좌표(provider/version/resolved_at 포함)를 새 키로 복사.
+        좌표가 있는 기존 항목만, 새 키가 이미 있으면 그대로 둠. 반환: 복사한 수
+        """
+        before = self.conn.total_changes
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO geocode (addr, lat, lng, provider, version, resolved_at) "
+            "SELECT ?, lat, lng, provider, version, resolved_at FROM geocode "
+            "WHERE addr = ? AND lat IS NOT NULL AND lng IS NOT NULL",
+            pairs.items(),
+        )
+        return self.conn.total_changes - before
+
+    def info(self, addr: str) -> dict | None:
+        """주소 1건의 전체 기록(provider/version/resolved_at 포함)"""
+        row = self.conn.execute(
+            "SELECT lat, lng, provider, version, resolved_at FROM geocode WHERE addr = ?", (addr,)
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("lat", "lng", "provider", "version", "resolved_at"), row))
+
+    # ── 실패 기록 ──
+    def failed_since(self, addrs: Iterable[str], since: float) -> set[str]:
+        """since(epoch 초) 이후 실패한 주소"""
+        out: set[str] = set()
+        for chunk in _chunks(list(dict.fromkeys(addrs))):
+            q = f"SELECT addr FROM failures WHERE failed_at >= ? AND addr IN ({','.join('?' * len(chunk))})"
+            out.update(r[0] for r in self.conn.execute(q, [since, *chunk]))
+        return out
+
+    def record_failure(self, addr: str, error: str, failed_at: float | None = None) -> None:
+        self.conn.execute(
+            "INSERT INTO failures (addr, failed_at, attempts, error) VALUES (?, ?, 1, ?) "
+            "ON CONFLICT(addr) DO UPDATE SET failed_at=excluded.failed_at, "
+            "attempts=failures.attempts + 1, error=excluded.error",
+            (addr, time.time() if failed_at is None else failed_at, error),
+        )
+
+    def clear_failure(self, addr: str) -> None:
+        self.conn.execute("DELETE FROM failures WHERE addr = ?", (addr,))
+
+    def failure(self, addr: str) -> dict | None:
+        row = self.conn.execute("SELECT failed_at, attempts, error FROM failures WHERE addr = ?", (addr,)).fetchone()
+        return dict(zip(("failed_at", "attempts", "error"), row)) if row else None
+
+    # ── 메타/트랜잭션 ──
+    def meta(self, key: str) -> str | None:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        self.conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+            (key, value),
+        )
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
+
+    def __enter__(self) -> "GeocodeStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ── JSON 가져오기/내보내기 ──
+    def import_json(self, path: Path, overwrite: bool = False) -> int:
+        """address_cache.json({주소: [lat, lng]}) 가져오기. 기본은 이미 있는 주소를 덮어쓰지 않음"""
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        rows = [
+            (str(k), v[0], v[1]) for k, v in data.items()
+            if isinstance(v, (list, tuple)) and len(v) >= 2
+        ]
+        if not overwrite:
+            keep = set(self.missing(r[0] for r in rows))
+            rows = [r for r in rows if r[0] in keep]
+        # 예전 캐시는 언제 받은 좌표인지 모름 → resolved_at 비움
+        self.conn.executemany(_UPSERT, ((a, lat, lng, LEGACY_PROVIDER, None, None) for a, lat, lng in rows))
+        self.commit()
+        return len(rows)
+
+    def import_failures_json(self, path: Path) -> int:
+        """address_failures.json({주소: [시각, 횟수, 오류]}) 가져오기"""
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        rows = [(str(k), float(v[0]), int(v[1]), str(v[2])) for k, v in data.items() if len(v) >= 3]
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO failures (addr, failed_at, attempts, error) VALUES (?, ?, ?, ?)", rows)
+        self.commit()
+        return len(rows)
+
+    def export_json(self, path: Path) -> int:
+        """예전 형식(address_cache.json)으로 내보내기"""
+        data = dict(self.items())
+        Path(path).write_text(json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+        return len(data)
+
+# ==========================
+# CLI
+# ==========================
+def main(argv: list[str]) -> None:
+    usage = ("사용법: python geocode_store.py import <address_cache.json> [저장소.sqlite]\n"
+             "        python geocode_store.py export <저장소.sqlite> <out.json>\n"
+             "        python geocode_store.py stats <저장소.sqlite>")
+    if len(argv) < 2 or argv[0] not in ("import", "export", "stats"):
+        print(usage)
+        return
+    cmd, src = argv[0], Path(argv[1])
+    if cmd == "import":
+        dst = Path(argv[2]) if len(argv) > 2 else src.with_name(DB_NAME)
+        with GeocodeStore(dst) as store:
+            n = store.import_json(src)
+            store.set_meta("legacy_imported", _now_iso())
+            print(f"[✓] {src} → {dst} (가져옴={n}, 전체={len(store)})")
+    elif cmd == "export":
+        if len(argv) < 3:
+            print(usage)
+            return
+        with GeocodeStore(src) as store:
+            print(f"[✓] {src} → {argv[2]} (entries={store.export_json(Path(argv[2]))})")
+    else:
+        with GeocodeStore(src) as store:
+            rows = store.conn.execute(
+                "SELECT COALESCE(provider, '-'), COALESCE(version, '-'), COUNT(*), SUM(lat IS NULL), MAX(resolved_at) "
+                "FROM geocode GROUP BY 1, 2 ORDER BY 1, 2"
+            ).fetchall()
+            n_fail = store.conn.execute("SELECT COUNT(*) FROM failures").fetchone()[0]
+            print(f"[i] {src}: entries={len(store)}, failures={n_fail}")
+            for provider, version, n, n_null, last in rows:
+                print(f"    {provider} {version}: {n}건 (좌표 없음 {n_null}, 최근 {last})")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,169 @@
+# http_session.py
+# land.py / geocode_and_export.py 공용 HTTP 계층
+# - 프로세스 공용 requests.Session 1개: 호스트별 커넥션 풀 + keep-alive (TCP/TLS 핸드셰이크 재사용)
+# - gzip 응답 요청, 타임아웃은 (연결, 읽기)로 분리
+# - 호스트별 초당 요청 제한(토큰 버킷, 스레드 공용)
+# - 요청마다 엔드포인트(경로 마지막 부분)별 건수/상태/지연을 run_report에 기록 (한도 대기 시간은 따로)
+#
+# 사용 예)
+#   import http_session
+#   http_session.configure(pool_size=32, connect_timeout=5, read_timeout=30)
+#   http_session.set_rate_limit("https://apis.data.go.kr", 10)
+#   r = http_session.get(url, params={...})
+
+from __future__ import annotations
+
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import run_report
+
+# ==========================
+# 기본 설정 (configure()로 변경)
+# ==========================
+POOL_SIZE = 32          # 호스트별 유지할 최대 커넥션 수 (동시 스레드 수 이상 권장)
+CONNECT_TIMEOUT = 5.0   # TCP/TLS 연결 타임아웃(초)
+READ_TIMEOUT = 30.0     # 응답 읽기 타임아웃(초)
+
+DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def configure(pool_size: int | None = None,
+              connect_timeout: float | None = None,
+              read_timeout: float | None = None) -> None:
+    """풀 크기/타임아웃 변경. 풀 크기가 바뀌면 다음 요청 때 세션을 새로 만듦"""
+    global POOL_SIZE, CONNECT_TIMEOUT, READ_TIMEOUT, _session
+    with _session_lock:
+        if pool_size is not None and int(pool_size) != POOL_SIZE:
+            POOL_SIZE = max(1, int(pool_size))
+            if _session is not None:
+                _session.close()
+                _session = None
+        if connect_timeout is not None:
+            CONNECT_TIMEOUT = float(connect_timeout)
+        if read_timeout is not None:
+            READ_TIMEOUT = float(read_timeout)
+
+
+def get_session() -> requests.Session:
+    """프로세스 공용 세션(지연 생성)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            s.headers.update(DEFAULT_HEADERS)
+            _session = s
+        return _session
+
+
+def close() -> None:
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+# ==========================
+# 호스트별 요청 제한
+# ==========================
+class RateLimiter:
+    """
+    토큰 버킷 방식의 초당 요청 제한 (스레드 공용).
+    rate <= 0 이면 제한 없음. burst 만큼은 연속 요청 허용.
+    """
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = float(rate)
+        self.capacity = max(1, int(burst))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0  # pause() 기한 (monotonic) — 이 시각 전에는 토큰을 주지 않음
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                else:
+                    self.tokens = min(self.capacity, self.tokens + max(0.0, now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """
+        seconds 동안 토큰 지급 중단 — 429 등 과부하 응답 시 같은 호스트를 쓰는 모든 스레드가 함께 대기.
+        여러 스레드가 동시에 불러도 기한은 가장 늦은 것 하나 (대기 시간이 쌓이지 않음).
+        기한이 지나면 빈 버킷에서 다시 채우기 시작.
+        """
+        if self.rate <= 0 or seconds <= 0:
+            return
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+            self.updated = self.blocked_until
+
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _host(url_or_host: str) -> str:
+    return urlparse(url_or_host).netloc or url_or_host
+
+
+def set_rate_limit(url_or_host: str, rate: float, burst: int = 1) -> None:
+    """호스트 초당 요청 수 설정 (URL 또는 호스트명). rate <= 0 이면 제한 해제"""
+    with _limiters_lock:
+        _limiters[_host(url_or_host)] = RateLimiter(rate, burst)
+
+
+def host_limiter(url: str) -> RateLimiter:
+    """URL 호스트의 RateLimiter (설정이 없으면 제한 없음)"""
+    host = _host(url)
+    with _limiters_lock:
+        lim = _limiters.get(host)
+        if lim is None:
+            lim = _limiters[host] = RateLimiter(0)
+        return lim
+
+# ==========================
+# 요청
+# ==========================
+def get(url: str, *, params: dict | None = None, headers: dict | None = None,
+        read_timeout: float | None = None) -> requests.Response:
+    """호스트 한도 대기 → 공용 세션으로 GET (timeout=(연결, 읽기))"""
+    endpoint = urlparse(url).path.rstrip("/").rsplit("/", 1)[-1] or _host(url)
+    t0 = time.perf_counter()
+    host_limiter(url).acquire()
+    t1 = time.perf_counter()
+    run_report.count("http_rate_limit_wait_seconds", t1 - t0, endpoint=endpoint)
+    timeout = (CONNECT_TIMEOUT, READ_TIMEOUT if read_timeout is None else read_timeout)
+    try:
+        r = get_session().get(url, params=params, headers=headers, timeout=timeout)
+    except requests.RequestException as e:
+        run_report.count("http_requests", endpoint=endpoint, status=type(e).__name__)
+        raise
+    finally:
+        run_report.observe("http_request_seconds", time.perf_counter() - t1, endpoint=endpoint)
+    run_report.count("http_requests", endpoint=endpoint, status=r.status_code)
+    run_report.count("http_response_bytes", len(r.content), endpoint=endpoint)
+    return r
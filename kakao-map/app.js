@@ -45,6 +45,11 @@
     const DEAL_ORDER={ 매매:0, 전세:1, 월세:2, 기타:3 };
 
     let rawFeatures=[]; let currentFiltered=[];
+    let compactByPath=new Map(); // GeoJSON url → manifest compact 항목(url 해석 완료)
+    let manifestUrl=null; // 읽은 manifest.json url (compact.js/tiles.js/search.js/search_index.json 기준)
+    let tilesByPath=new Map();   // GeoJSON url → 타일 index {url, sha256} (map_tiles.py)
+    let tileSource=null; let tileView=null; let tileViewKey=''; let aggOverlays=[];
+    let tileGroups=null; // 받은 타일 안의 미리 계산한 단지 그룹(clusters.json) [{name,lng,lat,k}]
     let markers=[]; let infoWindows=[]; let groupIdToMarker=new Map();
     let metaCache={ yms:[] };
 
@@ -68,6 +73,7 @@
       if(t==='매매') return '매매';
       if(t==='전세') return '전세';
       if(t==='월세' || w>0) return '월세';
+      if(t==='전월세') return '전세'; // 전월세 시트에서 월세 0 = 전세 (map_tiles.py 집계와 같은 기준)
       return '기타';
     };
     const getPriceMan = (p)=> p['거래유형']==='매매' ? Number(p['거래금액']||0) : Number(p['보증금']||0);
@@ -163,7 +169,73 @@
       return list.map(x=>({ path:new URL(x.path, location.href).toString(), label:x.label||labelFromFilename(x.path) }));
     }
 
+    // 컴팩트 포맷 디코더(data/compact.js)/타일 로더(data/tiles.js) — manifest와 같은 폴더에서 필요할 때 1회 로드
+    const scriptReady={};
+    function ensureScript(name, globalName, manifestUrl){
+      if (window[globalName]) return Promise.resolve(true);
+      if (!scriptReady[name]) scriptReady[name] = new Promise(resolve=>{
+        const s=document.createElement('script');
+        s.src=new URL(`./${name}`, manifestUrl).toString();
+        s.onload=()=> resolve(!!window[globalName]);
+        s.onerror=()=> resolve(false);
+        document.head.appendChild(s);
+      });
+      return scriptReady[name];
+    }
+    const ensureCompactDecoder = (manifestUrl)=> ensureScript('compact.js', 'RealEstateCompact', manifestUrl);
+    const ensureTileLoader = (manifestUrl)=> ensureScript('tiles.js', 'RealEstateTiles', manifestUrl);
+
+    // --- 타일(화면 안 타일만 요청) ---
+    function viewBounds(){
+      const b=map.getBounds(); const sw=b.getSouthWest(), ne=b.getNorthEast();
+      return { west:sw.getLng(), south:sw.getLat(), east:ne.getLng(), north:ne.getLat() };
+    }
+    // 화면 타일 목록이 바뀌었을 때만: 리프 타일이면 화면 안 타일만 rawFeatures로(새 타일만 요청, 화면을 떠난 타일은 버림), 넓으면 집계 모드
+    async function loadViewportTiles(rerender){
+      const src=tileSource; if(!src) return;
+      const view=src.view(viewBounds(), map.getLevel());
+      const key=view.mode==='agg' ? `agg@${view.zoom}:${view.items.map(a=>a.key).join(',')}` : view.keys.join(',');
+      if (key===tileViewKey) return;
+      tileViewKey=key;
+      if (view.mode==='tiles'){
+        const features=await src.features(view.keys);
+        const groups=await src.groups(view.keys);
+        if (src!==tileSource) return; // 그 사이 다른 달을 고름
+        src.retain(view.keys);
+        rawFeatures=features;
+        tileGroups=groups;
+      } else {
+        view.items=await src.aggregates(view); // 줌별 미리 계산한 군집
+        if (src!==tileSource) return;
+      }
+      tileView=view;
+      if (rerender) render();
+    }
+    kakao.maps.event.addListener(map, 'idle', ()=>{
+      if (tileSource) loadViewportTiles(true).catch(err=> console.warn('[tiles]', err));
+    });
+
     async function loadGeoJSON(url){
+      const tiles=tilesByPath.get(url);
+      tileSource=null; tileView=null; tileViewKey=''; tileGroups=null;
+      if (tiles && window.RealEstateTiles && window.RealEstateCompact){
+        try{
+          tileSource=await window.RealEstateTiles.open(tiles.url, tiles.sha256);
+          rawFeatures=[];
+          await loadViewportTiles(false);
+          await afterGeojsonLoaded(tileSource.index.ranges);
+          return;
+        }catch(err){ console.warn('[tiles] 로드 실패 → 파일 전체 사용:', err); tileSource=null; tileView=null; }
+      }
+      const compact=compactByPath.get(url);
+      if (compact && window.RealEstateCompact){
+        try{
+          const features=await window.RealEstateCompact.load(compact);
+          rawFeatures=features;
+          await afterGeojsonLoaded();
+          return;
+        }catch(err){ console.warn('[compact] 로드 실패 → GeoJSON 사용:', err); }
+      }
       const res=await fetch(url); if(!res.ok) throw new Error('GeoJSON 로드 실패: '+url);
       const gj=await res.json();
       if(!gj || !Array.isArray(gj.features)) throw new Error('GeoJSON 형식 오류');
@@ -174,6 +246,7 @@
     async function populateFromManifest(){
       // 이제 index.html과 manifest.json이 같은 폴더에 있으므로 단순히 ./manifest.json
       const url = new URL('./manifest.json', location.href).toString();
+      manifestUrl = url;
 
       try {
         const res = await fetch(url);
@@ -181,17 +254,39 @@
         const list = await res.json();
         if (!Array.isArray(list) || !list.length) throw new Error('manifest invalid');
 
+        // 내용 해시(sha256)를 쿼리로 붙여 같은 이름으로 다시 만든 파일도 캐시에서 옛 내용을 쓰지 않게
+        const withHash = (u, hash) => hash ? `${u}?v=${hash.slice(0,12)}` : u;
+
         // GeoJSON 목록 채우기
         const rows = list.map(x => ({
-          path: new URL(x.path, url).toString(),
+          path: withHash(new URL(x.path, url).toString(), x.sha256),
           label: x.label || (String(x.path).match(/(\d{6})/) ?
             `${RegExp.$1.slice(0,4)}.${RegExp.$1.slice(4,6)}` : String(x.path))
         }));
 
+        // 컴팩트 포맷(.rtc) 경로도 manifest 기준으로 해석해 둠
+        compactByPath = new Map();
+        list.forEach((x, i) => {
+          if (!x.compact) return;
+          const c = { ...x.compact };
+          ['path','gz','br'].forEach(k => { if (c[k]) c[k] = withHash(new URL(c[k], url).toString(), c.sha256); });
+          compactByPath.set(rows[i].path, c);
+        });
+        if (compactByPath.size) await ensureCompactDecoder(url);
+
+        // 타일 피라미드(있으면 파일 전체 대신 화면 안 타일만)
+        tilesByPath = new Map();
+        list.forEach((x, i) => {
+          if (x.tiles) tilesByPath.set(rows[i].path, { url:new URL(x.tiles.path, url).toString(), sha256:x.tiles.sha256 });
+        });
+        if (tilesByPath.size) await Promise.all([ensureCompactDecoder(url), ensureTileLoader(url)]);
+
         gjSelect.innerHTML = rows.map(r =>
           `<option value="${r.path}">${r.label}</option>`
         ).join('');
 
+        openSearcher(); // 검색 색인 미리 받기
+
         // ✅ 최신(마지막) 항목 기본 선택 후 GeoJSON 로드
         gjSelect.value = rows[rows.length - 1].path;
         await loadGeoJSON(gjSelect.value);
@@ -207,18 +302,24 @@
     });
 
     // --- After GeoJSON ---
-    async function afterGeojsonLoaded(){
-      const mans=[],pys=[],yms=[];
-      rawFeatures.forEach(f=>{
-        const p=f.properties||{};
-        const m=getPriceMan(p); if(Number.isFinite(m)) mans.push(m);
-        const a=getAreaPy(p); if(Number.isFinite(a)) pys.push(a);
-        const y=getYyyymm(p); if(Number.isFinite(y)) yms.push(y);
-      });
-      const mm=a=>a.length?[Math.min(...a),Math.max(...a)]:[0,0];
-      const [manMin,manMax]=mm(mans),[pyMin,pyMax]=mm(pys),ymSet=[...new Set(yms)].sort((a,b)=>a-b);
+    // ranges: 타일 index.json의 전체 범위({man, py, yms}) — 없으면 rawFeatures에서 계산
+    async function afterGeojsonLoaded(ranges){
+      let manMin,manMax,pyMin,pyMax,ymSet;
+      if (ranges){
+        [manMin,manMax]=ranges.man; [pyMin,pyMax]=ranges.py; ymSet=ranges.yms.slice();
+      } else {
+        const mans=[],pys=[],yms=[];
+        rawFeatures.forEach(f=>{
+          const p=f.properties||{};
+          const m=getPriceMan(p); if(Number.isFinite(m)) mans.push(m);
+          const a=getAreaPy(p); if(Number.isFinite(a)) pys.push(a);
+          const y=getYyyymm(p); if(Number.isFinite(y)) yms.push(y);
+        });
+        const mm=a=>a.length?[Math.min(...a),Math.max(...a)]:[0,0];
+        [manMin,manMax]=mm(mans); [pyMin,pyMax]=mm(pys); ymSet=[...new Set(yms)].sort((a,b)=>a-b);
+      }
       const eokMin=Math.floor(manMin/10000), eokMax=Math.ceil(manMax/10000)||Math.floor(manMin/10000)+1;
-      metaCache={ yms:ymSet };
+      metaCache={ yms:ymSet, full:{ pMin:eokMin*10000, pMax:eokMax*10000, aMin:Math.floor(pyMin), aMax:Math.ceil(pyMax)||Math.floor(pyMin)+1 } };
 
       const priceCtrl=createDualRange(priceDual,{ min:eokMin, max:eokMax, step:1, initMin:eokMin, initMax:eokMax,
         onInput:(a,b)=>{ priceLbl.textContent=`${a}억 ~ ${b}억`; render(); }});
@@ -244,7 +345,38 @@
       updateRegionList();
     }
 
-    function clearMap(){ clusterer.clear(); markers.forEach(m=>m.setMap(null)); markers=[]; infoWindows.forEach(i=>i.close()); infoWindows=[]; groupIdToMarker.clear(); }
+    function clearMap(){ clusterer.clear(); markers.forEach(m=>m.setMap(null)); markers=[]; aggOverlays.forEach(o=>o.setMap(null)); aggOverlays=[]; infoWindows.forEach(i=>i.close()); infoWindows=[]; groupIdToMarker.clear(); }
+
+    // 미리 계산한 집계(k: {"주택유형|거래구분": [건수, 최고가]})에 주택유형/거래유형 필터 적용
+    const kindFilter = (allowed, dealPick)=> (ht, deal)=>{
+      if(ht.includes('연립')) ht='연립다세대'; if(ht.includes('단독')) ht='단독다가구';
+      return allowed.has(ht) && (!dealPick || deal===dealPick);
+    };
+
+    // 가격/면적/기간 슬라이더가 처음(전체) 범위이고 지역 선택이 없으면 true → 미리 계산한 그룹을 그대로 쓸 수 있음
+    function fullRange(pMin,pMax,aMin,aMax){
+      const f=metaCache.full; if(!f) return false;
+      return pMin<=f.pMin && pMax>=f.pMax && aMin<=f.aMin && aMax>=f.aMax
+        && Number(dateDual.getRange.getMin())===0 && Number(dateDual.getRange.getMax())===Math.max(0, metaCache.yms.length-1)
+        && !selSido.value && !selGusi.value && !selDong.value;
+    }
+
+    // 축소 화면(군집): 주택유형/거래유형 필터만 적용 — 가격/면적/기간/지역은 확대 후 적용(건수 표시에 미적용 명시)
+    function renderAggregates(items, allowed, dealPick){
+      let total=0; const accept=kindFilter(allowed, dealPick);
+      items.forEach(a=>{
+        const {n, max}=window.RealEstateTiles.sumKinds(a.k, accept);
+        if(!n) return;
+        total+=n;
+        const price = a.py!=null && (!dealPick || dealPick==='매매') ? `<div style="font-size:11px">평당 ${Math.round(a.py).toLocaleString()}만</div>`
+          : max ? `<div style="font-size:11px">최고 ${(max/10000).toFixed(1).replace(/\.0$/,'')}억</div>` : '';
+        aggOverlays.push(new kakao.maps.CustomOverlay({
+          map, position:new kakao.maps.LatLng(a.c[1], a.c[0]), yAnchor:0.5,
+          content:`<div style="padding:4px 8px; border-radius:14px; background:rgba(30,136,229,.85); color:#fff; font-size:12px; text-align:center; box-shadow:0 1px 4px rgba(0,0,0,.3)">${n.toLocaleString()}건${price}</div>`
+        }));
+      });
+      return total;
+    }
 
     // --- Render (filters → map + list) ---
     function render(){
@@ -257,6 +389,14 @@
       const aMin=Number(areaDual.getRange.getMin()), aMax=Number(areaDual.getRange.getMax());
       const dMin=metaCache.yms[Number(dateDual.getRange.getMin())], dMax=metaCache.yms[Number(dateDual.getRange.getMax())];
 
+      if (tileView && tileView.mode==='agg'){
+        const n=renderAggregates(tileView.items, allowed, dealPick);
+        currentFiltered=[];
+        const note=fullRange(pMin,pMax,aMin,aMax) ? '' : ' (가격/면적/기간/지역 필터 미적용 — 유형 필터만)';
+        selectedList.innerHTML=`<div class="card card-etc">화면 안 ${n.toLocaleString()}건${note} — 지도를 확대하면 필터를 적용한 거래 목록을 볼 수 있습니다.</div>`;
+        return;
+      }
+
       const filtered=rawFeatures.filter(ft=>{
         const p=ft.properties||{};
         let ht=p['주택유형']||''; if(ht.includes('연립')) ht='연립다세대'; if(ht.includes('단독')) ht='단독다가구';
@@ -270,16 +410,27 @@
       });
       currentFiltered = filtered;
 
-      // 그룹(단지/건물)
-      const groups=new Map();
-      filtered.forEach(ft=>{
-        const [lng,lat]=ft.geometry.coordinates; const p=ft.properties||{};
-        const name=p['단지명/건물명']||p['건물명']||p['단지명']||p['주소']||'미상';
-        const key=name.trim(); const man=getPriceMan(p)||0, deal=getDealLabel(p);
-        if(!groups.has(key)) groups.set(key,{name:key,lat,lng,count:0,maxMan:man,deals:new Set([deal])});
-        const g=groups.get(key); g.count+=1; g.maxMan=Math.max(g.maxMan,man); g.deals.add(deal);
-      });
-      const arr=[...groups.values()].sort((a,b)=> b.count-a.count || b.maxMan-a.maxMan || a.name.localeCompare(b.name));
+      // 그룹(단지/건물): 가격/면적/기간/지역 필터가 전체 범위면 미리 계산한 그룹(clusters.json) 사용
+      let groupList;
+      if (tileGroups && fullRange(pMin,pMax,aMin,aMax)){
+        const accept=kindFilter(allowed, dealPick);
+        groupList=tileGroups.map(g=>{
+          const {n,max,deals}=window.RealEstateTiles.sumKinds(g.k, accept);
+          return {name:g.name,lat:g.lat,lng:g.lng,count:n,maxMan:max||0,deals:new Set(deals)};
+        }).filter(g=>g.count);
+      } else {
+        const groups=new Map();
+        filtered.forEach(ft=>{
+          const [lng,lat]=ft.geometry.coordinates; const p=ft.properties||{};
+          const name=p['단지명/건물명']||p['건물명']||p['단지명']||p['주소']||'미상';
+          const key=name.trim(); const man=getPriceMan(p)||0, deal=getDealLabel(p);
+          if(!groups.has(key)) groups.set(key,{name:key,lat:0,lng:0,count:0,maxMan:man,deals:new Set([deal])});
+          const g=groups.get(key); g.count+=1; g.lat+=lat; g.lng+=lng; g.maxMan=Math.max(g.maxMan,man); g.deals.add(deal);
+        });
+        // 좌표 = 그룹 거래 평균 위치 (미리 계산한 그룹과 같은 기준)
+        groupList=[...groups.values()].map(g=>({...g, lat:g.lat/g.count, lng:g.lng/g.count}));
+      }
+      const arr=groupList.sort((a,b)=> b.count-a.count || b.maxMan-a.maxMan || a.name.localeCompare(b.name));
 
       // 마커
       const bounds=new kakao.maps.LatLngBounds(); const ms=[];
@@ -346,7 +497,7 @@
           <div>가격: ${priceLine}</div>
           <div>면적: <span class="area-strong">${areaPy}</span></div>
           <div>동/층: ${(p['동']||'-')} / ${(p['층']||'-')}</div>
-          <div>주소: ${addr}</div>
+          <div>주소: ${addr}${p['좌표기준']==='법정동'?' <span style="color:#888">(위치: 법정동 대표 좌표)</span>':''}</div>
           <div>계약: ${yyyymm}</div>
         </div>`;
       }).join('');
@@ -412,8 +563,25 @@
     }
 
     // --- “건물명” 찾기(부분 일치로 지도/리스트 이동) ---
-    function searchByBuildingName(q){
+    // 검색 색인(search_index.json, search.js)이 있으면 모든 달의 단지에서 찾음(초성 가능) → 없으면 지도 위 마커에서
+    let searcher=null; // Promise<검색기 | null>
+    function openSearcher(){
+      if (!searcher) searcher = manifestUrl
+        ? ensureScript('search.js', 'RealEstateSearch', manifestUrl)
+            .then(ok=> ok ? window.RealEstateSearch.open(new URL('./search_index.json', manifestUrl).toString()) : null)
+            .catch(err=>{ console.warn('[search] 색인 없음 → 지도 위 마커에서 찾기', err); return null; })
+        : Promise.resolve(null);
+      return searcher;
+    }
+    async function searchByBuildingName(q){
       q=(q||'').trim(); if(!q) return;
+      const s=await openSearcher();
+      const hit=s && s.query(q, 1)[0];
+      if (hit){
+        switchTab('data'); map.setLevel(4); map.panTo(new kakao.maps.LatLng(hit.lat, hit.lng));
+        const m=groupIdToMarker.get(hit.name); if (m) m.setZIndex(999);
+        return;
+      }
       for (const [name, m] of groupIdToMarker.entries()) {
         if (name.includes(q)) { switchTab('data'); map.setLevel(4); map.panTo(m.getPosition()); m.setZIndex(999); return; }
       }
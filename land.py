@@ -6,11 +6,34 @@
 # 이전달만(과거 호환): python land.py --prev → 이전달 1개월
 # 6개월 전부터 3개월치(예: 오늘이 10월이면 4·5·6월): python land.py -n 6 3
 # 특정 한 달만: python land.py -m 202504
+# 동시 수집 조절: python land.py -n 6 3 -w 8 --rps 10 → 작업 스레드 8개, apis.data.go.kr 초당 10건 이하
+#   (-w 1 이면 예전처럼 순차 수집)
+# 응답 캐시: 받은 페이지는 data/_cache/rtms/ 에 저장되어 재실행 시 재사용 (지난 달은 만료 없음, 최근 달은 짧은 TTL)
+#   python land.py -n 6 3 --no-cache   → 캐시 무시하고 모두 새로 요청
+#   python land.py -m 202504 --from-cache → API 호출 없이 캐시만으로 엑셀 재생성(FIELD_SPECS 매핑 수정 후 재빌드용)
+#     (캐시에 없는 페이지가 있는 달은 저장하지 않고 건너뜀 — 기존 결과 유지)
+# 증분 갱신: python land.py -n 2 2 --refresh
+#   → (월, 지역, 엔드포인트)별 마지막 totalCount/내용 해시와 1페이지를 비교해 바뀐 조합만 다시 받고,
+#     해당 월의 최신 결과(Parquet 데이터셋, 없으면 최신 엑셀)에서 그 부분만 교체하여 새 버전으로 저장
+#   → 1페이지 비교로는 2페이지 이후만 바뀐 경우(정정/해제 신고 등)를 놓치므로, 마지막 전체 수집 후
+#     FULL_RECHECK_HOURS(기본 24시간)가 지난 조합은 전체를 다시 받아 전체 해시로 비교
+#   python land.py -n 2 2 --refresh --full-recheck 6 → 6시간마다 전체 비교 (0이면 매번 전체)
+# 저장 형식: data/dataset/trades/year=YYYY/month=MM/sheet=<시트명>/part-vYYMMDDHHMM.parquet (dataset.py 참고)
+#   python land.py -m 202504 --xlsx        → Parquet 저장 후 같은 내용을 엑셀로도 내보냄
+#   python land.py -m 202504 --export-xlsx → 수집 없이 데이터셋의 해당 월을 엑셀로만 내보냄
+#   (pyarrow가 없으면 예전처럼 엑셀로 저장)
+# 가격 집계 큐브: 저장한 달은 data/cube/ 의 (지역, 단지, 유형, 계약년월)별 통계도 함께 갱신 (price_cube.py 참고)
+# 실행 보고서: 끝나면(실패해도) data/_cache/reports/land_<시각>.json 에 단계별 시간/행수, 엔드포인트별 요청 수/지연,
+#   재시도/실패, 응답 캐시 적중률, 쓴 바이트, 최대 메모리 기록 (run_report.py 참고)
+#   python land.py -m 202504 --report out/land.json --prometheus /var/lib/node_exporter/land.prom
 
 # land.py
-# 필요: pip install requests xmltodict pandas openpyxl keyring tenacity
+# 필요: pip install requests pandas pyarrow openpyxl xlsxwriter keyring tenacity
 
-import sys, time
+import sys, time, os, io, gzip, tempfile, json, hashlib, zlib
+import xml.etree.ElementTree as ET
+from typing import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from urllib.parse import quote
 import numpy as np
@@ -18,10 +41,14 @@ from datetime import datetime, timedelta
 
 import keyring
 import requests
-import xmltodict
 import pandas as pd
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+import dataset
+import http_session
+import price_cube
+import run_report
+
 # ==========================
 # 설정
 # ==========================
@@ -42,6 +69,15 @@ FALLBACK_REGIONS = {
 # 페이지 크기
 NUM_ROWS = 1000
 
+# 동시 수집 설정 (명령행 -w / --rps 로 덮어쓰기 가능)
+MAX_WORKERS = 8           # (지역, 엔드포인트, 월) 작업 스레드 수
+RATE_LIMIT_PER_SEC = 10.0 # 호스트별 초당 최대 요청 수 (data.go.kr 트래픽 한도 아래로 유지, 0 이하면 제한 없음)
+PAGE_WORKERS = 4          # 한 (지역, 엔드포인트) 안에서 2페이지 이후를 동시에 받을 스레드 수
+
+# HTTP 세션(커넥션 풀/keep-alive) 설정 — http_session.py 참고
+HTTP_CONNECT_TIMEOUT = 5.0
+HTTP_READ_TIMEOUT = 30.0
+
 # 고정 컬럼(모든 시트 동일 순서) — 건물면적/대지지분 제거
 FINAL_COLS = [
     "유형","시/도","구/시","법정동","계약년월","계약일","단지명/건물명","동","층",
@@ -61,18 +97,39 @@ SHEET_NAMES = {
 # 필요시 원하는 경로로 변경 (예: Path("output") , Path(__file__).parent)
 BASE_OUTDIR = Path("data") 
 
+# RTMS 원본 응답 캐시 (엔드포인트/LAWD_CD/DEAL_YMD/페이지 단위, gzip XML)
+RTMS_CACHE_DIR = BASE_OUTDIR / "_cache" / "rtms"
+CACHE_TTL_CURRENT = 60 * 60        # 이번 달: 1시간
+CACHE_TTL_RECENT = 24 * 60 * 60    # 최근 CACHE_RECENT_MONTHS개월: 신고기한(30일) 동안 정정이 잦아 하루
+CACHE_RECENT_MONTHS = 2            # 그 이전 달은 확정된 것으로 보고 만료 없음
+USE_CACHE = True                   # --no-cache 로 끔
+FROM_CACHE = False                 # --from-cache: API 호출 없이 캐시만 사용
+
+# 월별 Parquet 데이터셋 루트 (dataset.py)
+DATASET_ROOT = BASE_OUTDIR / "dataset"
+
+# 가격 집계 큐브 (price_cube.py) — 달을 저장할 때마다 그 달 행만 갱신
+CUBE_DIR = BASE_OUTDIR / "cube"
+
+# 증분 갱신 상태 (월별 JSON: 엔드포인트|LAWD_CD → totalCount, 1페이지/전체 내용 해시, 마지막 전체 수집 시각)
+STATE_DIR = BASE_OUTDIR / "_cache" / "state"
+FULL_RECHECK_HOURS = 24            # --full-recheck: 1페이지가 같아도 이 시간이 지나면 전체 페이지를 다시 비교
+
 # ==========================
 # 출력 파일명
 # ==========================
-def make_output_path(yyyymm: str) -> Path:
+def make_version() -> str:
+    """출력 버전 문자열 vYYMMDDHHMM (엑셀 파일명/데이터셋 part 공용)"""
+    return datetime.now().strftime("v%y%m%d%H%M")
+
+def make_output_path(yyyymm: str, version: str | None = None) -> Path:
     """
     ./YYYY/실거래_yyyymm_vyymmddhhmm.xlsx 경로 반환 + 폴더 없으면 생성
     """
     year = (yyyymm or "")[:4]
     out_dir = (BASE_OUTDIR / year).resolve()
     out_dir.mkdir(parents=True, exist_ok=True)  # ★ 폴더 생성
-    version = datetime.now().strftime("v%y%m%d%H%M")
-    return out_dir / f"실거래_{yyyymm}_{version}.xlsx"
+    return out_dir / f"실거래_{yyyymm}_{version or make_version()}.xlsx"
 
 
 def get_target_months_from_args(default_months: list[str]) -> list[str]:
@@ -138,6 +195,94 @@ def get_target_months_from_args(default_months: list[str]) -> list[str]:
     return default_months
 
 
+def get_fetch_options_from_args() -> tuple[int, float]:
+    """
+    동시 수집 옵션 파싱.
+    - -w N / --workers N : 작업 스레드 수 (기본 MAX_WORKERS, 1이면 순차)
+    - --rps X            : 호스트별 초당 최대 요청 수 (기본 RATE_LIMIT_PER_SEC)
+    """
+    args = sys.argv[1:]
+    workers, rps = MAX_WORKERS, RATE_LIMIT_PER_SEC
+
+    for flag in ("-w", "--workers"):
+        if flag in args:
+            idx = args.index(flag)
+            try:
+                workers = max(1, int(args[idx + 1]))
+            except (IndexError, ValueError):
+                print(f"[!] {flag} 인자 뒤에 정수를 지정하세요. 예) {flag} 8")
+
+    if "--rps" in args:
+        idx = args.index("--rps")
+        try:
+            rps = float(args[idx + 1])
+        except (IndexError, ValueError):
+            print("[!] --rps 인자 뒤에 숫자를 지정하세요. 예) --rps 10")
+
+    return workers, rps
+
+
+def get_cache_options_from_args() -> tuple[bool, bool]:
+    """
+    응답 캐시 옵션 파싱 → (use_cache, from_cache)
+    - --no-cache   : 캐시 읽기/쓰기 모두 끔
+    - --from-cache : API 호출 없이 캐시만 사용(만료 무시)
+    """
+    args = sys.argv[1:]
+    from_cache = "--from-cache" in args
+    use_cache = from_cache or "--no-cache" not in args
+    return use_cache, from_cache
+
+
+def get_refresh_option_from_args() -> bool:
+    """--refresh : 바뀐 (지역, 엔드포인트)만 다시 받아 최신 월 파일을 패치"""
+    return "--refresh" in sys.argv[1:]
+
+
+def get_full_recheck_option_from_args(default: float) -> float:
+    """--full-recheck HOURS : 증분 갱신에서 전체 페이지를 다시 비교하는 주기(시간, 0이면 매번)"""
+    args = sys.argv[1:]
+    if "--full-recheck" not in args:
+        return default
+    idx = args.index("--full-recheck")
+    try:
+        return max(0.0, float(args[idx + 1]))
+    except (IndexError, ValueError):
+        print(f"[!] --full-recheck 인자 뒤에 시간을 지정하세요. 예) --full-recheck 6 (기본 {default:g})")
+        return default
+
+
+def get_report_options_from_args() -> tuple[Path | None, Path | None]:
+    """
+    실행 보고서 옵션 파싱 → (report_path, prometheus_path)
+    - --report PATH     : JSON 보고서 경로 (기본 data/_cache/reports/land_<시각>.json)
+    - --prometheus PATH : Prometheus 텍스트 형식도 저장
+    """
+    args = sys.argv[1:]
+    paths = []
+    for flag in ("--report", "--prometheus"):
+        path = None
+        if flag in args:
+            idx = args.index(flag)
+            if idx + 1 < len(args) and not args[idx + 1].startswith("-"):
+                path = Path(args[idx + 1])
+            else:
+                print(f"[!] {flag} 인자 뒤에 파일 경로를 지정하세요. 예) {flag} out/land.json")
+        paths.append(path)
+    return paths[0], paths[1]
+
+
+def get_xlsx_options_from_args() -> tuple[bool, bool]:
+    """
+    엑셀 내보내기 옵션 파싱 → (write_xlsx, export_only)
+    - --xlsx        : Parquet 저장 후 엑셀도 생성
+    - --export-xlsx : 수집 없이 데이터셋의 해당 월을 엑셀로만 생성
+    """
+    args = sys.argv[1:]
+    export_only = "--export-xlsx" in args
+    return export_only or "--xlsx" in args, export_only
+
+
 def _ym_shift(year: int, month: int, delta: int) -> tuple[int, int]:
     """(year, month)에서 delta개월 이동한 (year, month) 반환"""
     total = year * 12 + (month - 1) + delta
@@ -171,7 +316,14 @@ def load_service_key() -> str:
         sys.exit(1)
     return quote(raw.strip(), safe="")
 
-SERVICE_KEY_ENC = load_service_key()
+# 실제 요청 시점에 한 번만 로드 (--from-cache 는 키 없이 동작)
+SERVICE_KEY_ENC: str | None = None
+
+def service_key() -> str:
+    global SERVICE_KEY_ENC
+    if SERVICE_KEY_ENC is None:
+        SERVICE_KEY_ENC = load_service_key()
+    return SERVICE_KEY_ENC
 
 # ==========================
 # 엔드포인트
@@ -188,83 +340,256 @@ BASE_SH_RENT   = "https://apis.data.go.kr/1613000/RTMSDataSvcSHRent/getRTMSDataS
 # ==========================
 OK_CODES = {"00", "000", "0000"}
 class APICallError(Exception): pass
+class CacheMissError(Exception): pass  # --from-cache 인데 캐시에 없는 페이지
+
+# ==========================
+# 응답 캐시
+# ==========================
+def _cache_path(url: str, lawd_cd: str, yyyymm: str, page: int, rows: int) -> Path:
+    endpoint = url.rstrip("/").rsplit("/", 1)[-1]
+    return RTMS_CACHE_DIR / yyyymm / f"{endpoint}_{lawd_cd}_p{page}_r{rows}.xml.gz"
+
+def cache_ttl(yyyymm: str, today: datetime | None = None) -> float | None:
+    """월별 캐시 유효시간(초). None = 만료 없음"""
+    today = today or datetime.today()
+    try:
+        y, m = int(yyyymm[:4]), int(yyyymm[4:6])
+    except ValueError:
+        return CACHE_TTL_CURRENT
+    age = (today.year * 12 + today.month) - (y * 12 + m)
+    if age <= 0:
+        return CACHE_TTL_CURRENT
+    if age <= CACHE_RECENT_MONTHS:
+        return CACHE_TTL_RECENT
+    return None
+
+def rtms_cache_get(url: str, lawd_cd: str, yyyymm: str, page: int, rows: int, ignore_ttl: bool = False) -> bytes | None:
+    path = _cache_path(url, lawd_cd, yyyymm, page, rows)
+    try:
+        if not ignore_ttl:
+            ttl = cache_ttl(yyyymm)
+            if ttl is not None and time.time() - path.stat().st_mtime > ttl:
+                return None
+        return gzip.decompress(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, zlib.error) as e:  # 잘린 파일(EOFError) / 깨진 deflate 스트림(zlib.error)
+        print(f"[!] 캐시 손상 → 무시: {path.name} | {e}")
+        return None
+
+def rtms_cache_put(url: str, lawd_cd: str, yyyymm: str, page: int, rows: int, raw: bytes) -> None:
+    """임시파일에 쓰고 rename (중단돼도 깨진 캐시가 남지 않게)"""
+    path = _cache_path(url, lawd_cd, yyyymm, page, rows)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        data = gzip.compress(raw)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        run_report.add_bytes(path, len(data))
+    except Exception:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+# ==========================
+# 요청/파싱
+# ==========================
+def iter_rtms(source) -> Iterator[tuple[str, object]]:
+    """
+    RTMS 응답 XML을 iterparse로 한 번 훑으며 이벤트를 순서대로 yield (트리 전체를 만들지 않음).
+      ("header", (resultCode, resultMsg)) / ("item", {태그: 값}) / ("total", totalCount)
+    item 값은 공백 제거 문자열, 빈 값은 None (xmltodict 결과와 동일).
+    source: 파일 객체 또는 경로
+    """
+    code, msg = "", ""
+    items_parent = None
+    item: dict | None = None
+    depth_in_item = 0
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if item is not None:
+                depth_in_item += 1
+            elif tag == "item":
+                item, depth_in_item = {}, 0
+            elif tag == "items":
+                items_parent = elem
+            continue
+
+        # event == "end"
+        if item is not None:
+            if tag == "item" and depth_in_item == 0:
+                yield "item", item
+                item = None
+                if items_parent is not None:
+                    items_parent.remove(elem)  # 처리한 item은 즉시 해제
+            else:
+                if depth_in_item == 1:
+                    text = elem.text
+                    item[tag] = (text.strip() or None) if text else None
+                depth_in_item -= 1
+        elif tag == "resultCode":
+            code = (elem.text or "").strip()
+        elif tag == "resultMsg":
+            msg = (elem.text or "").strip()
+        elif tag == "header":
+            yield "header", (code, msg)
+        elif tag == "totalCount":
+            try:
+                yield "total", int((elem.text or "").strip() or 0)
+            except ValueError:
+                yield "total", 0
+
+def parse_rtms(raw: bytes) -> tuple[list[dict], int]:
+    """
+    응답 바이트 → (item 목록, totalCount). 헤더 코드가 오류면 item을 읽기 전에 APICallError.
+    resultCode가 든 header가 없는 응답(OpenAPI_ServiceResponse/cmmMsgHeader 같은 게이트웨이 오류 본문)도
+    APICallError → 재시도 대상이고 캐시에 저장되지 않음.
+    """
+    items, total, seen = [], 0, False
+    for kind, val in iter_rtms(io.BytesIO(raw)):
+        if kind == "item":
+            items.append(val)
+        elif kind == "total":
+            total = val
+        elif kind == "header":
+            code, msg = val
+            if code and code not in OK_CODES:
+                run_report.count("rtms_api_errors", code=code)
+                raise APICallError(msg or "API Error")
+            seen = seen or bool(code)
+    if not seen:
+        run_report.count("rtms_api_errors", code="no_header")
+        snippet = raw[:200].decode("utf-8", errors="replace").replace("\n", " ")
+        raise APICallError(f"resultCode 없는 응답: {snippet}")
+    return items, total
+
+def _count_retry(retry_state) -> None:
+    """tenacity before_sleep: 재시도 1회 기록 (엔드포인트, 원인 예외)"""
+    url = retry_state.args[0] if retry_state.args else ""
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    run_report.count("rtms_retries", endpoint=url.rstrip("/").rsplit("/", 1)[-1], reason=type(exc).__name__)
 
 @retry(
     reraise=True,
     retry=retry_if_exception_type((requests.RequestException, APICallError)),
     wait=wait_exponential(multiplier=1, min=1, max=8),
     stop=stop_after_attempt(3),
+    before_sleep=_count_retry,
 )
-def call_rtms(url: str, lawd_cd: str, yyyymm: str, page: int, rows: int = NUM_ROWS) -> dict:
+def request_rtms(url: str, lawd_cd: str, yyyymm: str, page: int, rows: int = NUM_ROWS) -> tuple[bytes, tuple[list[dict], int]]:
     params = {
-        "serviceKey": SERVICE_KEY_ENC,
+        "serviceKey": service_key(),
         "LAWD_CD": lawd_cd,
         "DEAL_YMD": yyyymm,
         "pageNo": page,
         "numOfRows": rows,
     }
-    r = requests.get(url, params=params, timeout=30)
+    r = http_session.get(url, params=params, read_timeout=HTTP_READ_TIMEOUT)  # 재시도 요청도 호스트 한도에 포함
     r.raise_for_status()
-    data = xmltodict.parse(r.text)
-    header = (data.get("response") or {}).get("header") or {}
-    code = str(header.get("resultCode", "")).strip()
-    if code and code not in OK_CODES:
-        raise APICallError(str(header.get("resultMsg", "API Error")))
-    return data
-
-def extract_items(data: dict) -> tuple[list, int]:
-    body = (data.get("response") or {}).get("body") or {}
-    try:
-        total = int(str(body.get("totalCount", 0)).strip() or 0)
-    except ValueError:
-        total = 0
-    items = ((body.get("items") or {}).get("item")) or []
-    if isinstance(items, dict):
-        items = [items]
-    return items, total
+    return r.content, parse_rtms(r.content)
 
-def fetch_all(url: str, lawd_cd: str, yyyymm: str) -> list[dict]:
-    results, page = [], 1
-    while True:
-        data = call_rtms(url, lawd_cd, yyyymm, page)
-        items, total = extract_items(data)
-        if items:
-            results.extend(items)
-        if len(results) >= total or len(items) == 0:
-            break
+def call_rtms(url: str, lawd_cd: str, yyyymm: str, page: int, rows: int = NUM_ROWS,
+              refresh: bool = False) -> tuple[list[dict], int]:
+    """
+    (item 목록, totalCount) 반환.
+    캐시 우선 조회 → 없거나 만료면 API 요청 후 캐시에 저장.
+    refresh=True 이면 캐시를 읽지 않고 새로 받음(결과는 캐시에 갱신).
+    --from-cache 에서 캐시가 없으면 CacheMissError.
+    """
+    endpoint = url.rstrip("/").rsplit("/", 1)[-1]
+    if (USE_CACHE or FROM_CACHE) and not (refresh and not FROM_CACHE):
+        raw = rtms_cache_get(url, lawd_cd, yyyymm, page, rows, ignore_ttl=FROM_CACHE)
+        if raw is not None:
+            try:
+                page_data = parse_rtms(raw)
+            except (ET.ParseError, APICallError) as e:  # XML이 깨졌거나 오류 응답이 든 캐시 → 없는 것으로 보고 다시 요청
+                print(f"[!] 캐시 손상 → 무시: {_cache_path(url, lawd_cd, yyyymm, page, rows).name} | {e}")
+                raw = None
+        run_report.count("rtms_cache", endpoint=endpoint, result="miss" if raw is None else "hit")
+        if raw is not None:
+            return page_data
+    if FROM_CACHE:  # 빈 결과로 두면 그 지역이 빠진 달이 저장됨 → 호출 측(main)에서 그 달을 건너뜀
+        raise CacheMissError(f"{endpoint} {lawd_cd} {yyyymm} p{page}")
+    try:
+        raw, page_data = request_rtms(url, lawd_cd, yyyymm, page, rows)
+    except Exception as e:  # 재시도까지 모두 실패
+        run_report.count("rtms_failures", endpoint=endpoint, reason=type(e).__name__)
+        raise
+    if USE_CACHE:
+        rtms_cache_put(url, lawd_cd, yyyymm, page, rows, raw)
+    return page_data
+
+def fetch_all(url: str, lawd_cd: str, yyyymm: str, refresh: bool = False,
+              first: tuple[list[dict], int] | None = None) -> list[dict]:
+    """
+    1페이지의 totalCount로 남은 페이지 번호를 확정한 뒤 2..N 페이지를 병렬 요청,
+    페이지 순서대로 합침. (페이지별 재시도는 call_rtms의 tenacity가 담당)
+    first: 이미 받아 둔 1페이지 응답(증분 갱신 확인용)이 있으면 재요청하지 않음
+    """
+    results, total = first if first is not None else call_rtms(url, lawd_cd, yyyymm, 1, refresh=refresh)
+    results = list(results)
+    if not results or len(results) >= total:
+        return results
+
+    last_page = -(-total // NUM_ROWS)  # ceil
+    pages = list(range(2, last_page + 1))
+    if pages:
+        with ThreadPoolExecutor(max_workers=min(PAGE_WORKERS, len(pages))) as ex:
+            for items, _ in ex.map(lambda pg: call_rtms(url, lawd_cd, yyyymm, pg, refresh=refresh), pages):
+                results.extend(items)
+
+    # totalCount보다 덜 받은 경우(응답 중 건수 변경 등) 기존 방식대로 이어서 순차 요청
+    page = last_page
+    while len(results) < total:
         page += 1
+        items, _ = call_rtms(url, lawd_cd, yyyymm, page, refresh=refresh)
+        if not items:
+            break
+        results.extend(items)
     return results
 
 # ==========================
 # 유틸(정규화/형변환/주소/표기)
 # ==========================
-def gv(d: dict, *keys, default=None):
-    for k in keys:
-        v = d.get(k)
-        if v is not None:
-            return v.strip() if isinstance(v, str) else v
-    return default
+# 숫자 컬럼 (금액/층은 정수, 면적은 실수)
+INT_COLS = ["거래금액","보증금","월세","기존 보증금","기존 월세","층"]
+FLOAT_COLS = ["전용면적","대지면적"]
 
-def to_int_series(s: pd.Series) -> pd.Series:
-    return (
-        pd.to_numeric(
-            s.astype(str)
-             .str.replace(",", "", regex=False)
-             .str.replace(r"\s+", "", regex=True)
-             .replace({"": None, "None": None, "none": None, "NULL": None, "null": None, "NaN": None, "nan": None, "-": None}),
-            errors="coerce"
-        ).astype("Int64")
-    )
-
-def to_float_series(s: pd.Series) -> pd.Series:
+def parse_numbers(s: pd.Series) -> pd.Series:
+    """
+    "12,345" / " 84.97 " → 숫자. 콤마·공백 제거 후 변환, 숫자가 아니면 NaN
+    ("", None, "NULL", "-" 등 포함)
+    """
     return pd.to_numeric(
-        s.astype(str)
-         .str.replace(",", "", regex=False)
-         .str.replace(r"\s+", "", regex=True)
-         .replace({"": None, "None": None, "none": None, "NULL": None, "null": None, "NaN": None, "nan": None, "-": None}),
+        s.astype(object).where(s.notna(), "").astype(str).str.replace(r"[,\s]+", "", regex=True),
         errors="coerce"
     )
 
+def to_int_series(s: pd.Series) -> pd.Series:
+    return parse_numbers(s).astype("Int64")
+
+def to_float_series(s: pd.Series) -> pd.Series:
+    return parse_numbers(s)
+
+def coerce_numeric_columns(df: pd.DataFrame) -> None:
+    """
+    INT_COLS/FLOAT_COLS 일괄 변환 (제자리).
+    컬럼마다 문자열 정리/변환을 반복하지 않고, 전부 이어 붙여 한 번에 파싱한 뒤 다시 나눔.
+    """
+    cols = [c for c in INT_COLS + FLOAT_COLS if c in df.columns]
+    if not cols or df.empty:
+        for c in cols:
+            df[c] = to_int_series(df[c]) if c in INT_COLS else to_float_series(df[c])
+        return
+    n = len(df)
+    values = parse_numbers(pd.Series(np.concatenate([df[c].to_numpy(dtype=object) for c in cols]), dtype=object))
+    values = values.to_numpy(dtype=float)
+    for i, c in enumerate(cols):
+        part = pd.Series(values[i * n:(i + 1) * n], index=df.index)
+        df[c] = part.astype("Int64") if c in INT_COLS else part
+
 def make_contract_cols(df: pd.DataFrame) -> None:
     y = df["년"].fillna("").astype(str).str.replace(r"\D", "", regex=True).str.zfill(4)
     m = df["월"].fillna("").astype(str).str.replace(r"\D", "", regex=True).str.zfill(2)
@@ -282,44 +607,66 @@ def region_parts(region_name: str) -> tuple[str,str]:
     gu_si = " ".join(parts[1:]) if len(parts) > 1 else ""
     return si_do, gu_si
 
-def get_dong_name(it: dict) -> str:
-    return str(gv(it, "umdNm", "법정동", "dong") or "").strip()
+def item_columns(items: list[dict], keys) -> dict[str, pd.Series]:
+    """
+    item 목록 → {키: object Series}. keys에 있는 키만, 한 번도 안 나온 키는 제외.
+    (DataFrame.from_records는 모든 키를 문자열 dtype으로 변환하느라 느림 → item 한 번 순회로 대체)
+    """
+    n, wanted = len(items), frozenset(keys)
+    cols: dict[str, list] = {}
+    for i, it in enumerate(items):
+        for k, v in it.items():
+            if k in wanted:
+                col = cols.get(k)
+                if col is None:
+                    col = cols[k] = [None] * n
+                col[i] = v
+    return {k: pd.Series(v, dtype=object) for k, v in cols.items()}
+
+def coalesce(raw: dict[str, pd.Series], keys) -> pd.Series:
+    """
+    후보 키(컬럼) 중 앞에서부터 처음 나오는 값, 없으면 None.
+    item 값은 iter_rtms에서 이미 공백 제거/빈 값 None 처리되어 있음.
+    """
+    cols = [k for k in keys if k in raw]
+    if not cols:
+        n = len(next(iter(raw.values()))) if raw else 0
+        return pd.Series([None] * n, dtype=object)
+    out = raw[cols[0]]
+    for c in cols[1:]:
+        out = out.where(out.notna(), raw[c])
+    return out
 
-def strip_leading_zeros_num(s: str) -> str:
-    s = str(s or "").strip()
-    if not s:
-        return ""
-    try:
-        return str(int(s))
-    except Exception:
-        # 혹시 숫자가 아니면 그대로
-        return s.lstrip("0") or "0"
+def _text(s: pd.Series) -> pd.Series:
+    """None → "" 문자열 컬럼"""
+    return s.fillna("").astype(str)
+
+def strip_leading_zeros_num(s: pd.Series) -> pd.Series:
+    """앞 0 제거 ("00113" → "113", "00000" → "0", "" → "")"""
+    s = _text(s).str.strip()
+    out = s.str.lstrip("0")
+    return out.mask(out.eq("") & s.ne(""), "0")
 
-def build_road_name(it: dict) -> str:
+def build_road_name(raw: dict[str, pd.Series]) -> pd.Series:
     """
     도로명: loadNm + roadNmBonbun (+ roadBubun!=00000 이면 bonbun-bubun)
     bonbun/bubun은 앞 0 제거하여 표기.
     예: 압구정로 00113 → 압구정로 113
         봉은사로105길 00012 00007 → 봉은사로105길 12-7
     """
-    loadNm = (gv(it, "loadNm", "roadNm", "roadName") or "").strip()
-    bonbun = strip_leading_zeros_num(gv(it, "roadNmBonbun", "roadBonbun", "bonbun") or "")
-    bubun_raw = gv(it, "roadBubun", "roadNmBubun", "bubun")
-    bubun = strip_leading_zeros_num(bubun_raw) if bubun_raw is not None else ""
+    loadNm = _text(coalesce(raw, ROAD_NAME_KEYS))
+    bonbun = strip_leading_zeros_num(coalesce(raw, ROAD_BONBUN_KEYS))
+    bubun_raw = _text(coalesce(raw, ROAD_BUBUN_KEYS))
+    bubun = strip_leading_zeros_num(bubun_raw)
 
-    if not loadNm:
-        return ""
-
-    if bonbun:
-        if bubun_raw and str(bubun_raw).strip() != "00000" and bubun:
-            return f"{loadNm} {bonbun}-{bubun}"
-        else:
-            return f"{loadNm} {bonbun}"
-    return loadNm
+    with_bubun = bubun_raw.ne("") & bubun_raw.ne("00000") & bubun.ne("")
+    out = loadNm.where(bonbun.eq(""), loadNm + " " + bonbun)
+    out = out.mask(bonbun.ne("") & with_bubun, loadNm + " " + bonbun + "-" + bubun)
+    return out.where(loadNm.ne(""), "")
 
-def build_jibun(it: dict, dong: str) -> str:
-    base = str(gv(it, "jibun", "lnbr", "지번") or "").strip()
-    return f"{dong} {base}".strip() if base else ""
+def build_jibun(raw: dict[str, pd.Series], dong: pd.Series) -> pd.Series:
+    base = _text(coalesce(raw, JIBUN_KEYS))
+    return (dong + " " + base).str.strip().where(base.ne(""), "")
 
 def compose_address(gu_si: str, jibun: str, road: str) -> str:
     """
@@ -334,6 +681,15 @@ def compose_address(gu_si: str, jibun: str, road: str) -> str:
         return f"{gu_si} {road}".strip()
     return gu_si
 
+def compose_address_series(gu_si: pd.Series, jibun: pd.Series | None, road: pd.Series | None) -> pd.Series:
+    """compose_address의 컬럼 버전 (행 반복 없이 한 번에)"""
+    gu = _text(pd.Series(gu_si)).str.strip()
+    jb = _text(jibun) if jibun is not None else pd.Series("", index=gu.index)
+    rd = _text(road) if road is not None else pd.Series("", index=gu.index)
+    out = gu.where(rd.str.strip().eq(""), (gu + " " + rd).str.strip())
+    out = out.mask(jb.str.strip().ne(""), (gu + " " + jb).str.strip())
+    return out.where(gu.ne(""), "")
+
 def fmt_money(val) -> str:
     if pd.isna(val):
         return ""
@@ -394,191 +750,103 @@ LAND_AREA_KEYS = ("대지면적","landArea","lndpclAr","siteArea")
 LAND_SHARE_KEYS = ("대지지분","대지권면적","landShareArea","landRightArea","landOwnArea","spcLandArea","lndshrAr","landRatioArea")
 BLDG_AREA_KEYS = ("건물면적","연면적","bldgArea","buildingArea","gnrlArea","grossArea")
 
+DONG_KEYS = ("umdNm","법정동","dong")
+JIBUN_KEYS = ("jibun","lnbr","지번")
+ROAD_NAME_KEYS = ("loadNm","roadNm","roadName")
+ROAD_BONBUN_KEYS = ("roadNmBonbun","roadBonbun","bonbun")
+ROAD_BUBUN_KEYS = ("roadBubun","roadNmBubun","bubun")
+
 # ==========================
-# 정규화 함수(요청 매핑 반영)
-# ==========================
-def to_df_apt_trade(items: list[dict]) -> pd.DataFrame:
-    rows=[]
-    for it in items:
-        dong = get_dong_name(it)
-        rows.append({
-            "법정동": dong,
-            "단지명/건물명": gv(it,"아파트","aptNm","aptName"),
-            "동": gv(it, "aptDong"),
-            "전용면적": gv(it,"전용면적","excluUseAr","exclusiveArea"),
-            # 삭제 예정: 건물면적/대지지분은 수집만 했던 과거버전 → 이번엔 표준컬럼에 포함 안함
-            "대지면적": gv(it,*LAND_AREA_KEYS),
-            "층": gv(it,"층","flr","floor"),
-            "거래금액": gv(it,"거래금액","dealAmount"),
-            "보증금": pd.NA,
-            "월세": pd.NA,
-            "건축년도": gv(it,"건축년도","buildYear"),
-            "임차기간": gv(it,"contractTerm"),
-            "갱신여부": gv(it,"contractType"),
-            "기존 보증금": gv(it,"preDeposit"),
-            "기존 월세": gv(it,"preMonthlyRent"),
-            "년": gv(it,"년","dealYear"),
-            "월": gv(it,"월","dealMonth"),
-            "일": gv(it,"일","dealDay"),
-            "도로명": build_road_name(it),
-            "지번": build_jibun(it, dong),
-        })
-    df=pd.DataFrame(rows)
-    if not df.empty: make_contract_cols(df)
-    return df
+# 정규화 매핑(엔드포인트별 선언)
+# ==========================
+# 컬럼 → 후보 키 튜플(앞에서부터 첫 값) / None(해당 엔드포인트엔 없는 값 → pd.NA)
+# 법정동/도로명/지번은 normalize_items에서 별도 조립, 계약년월/계약일은 make_contract_cols
+COMMON_FIELDS = {
+    "단지명/건물명": ("아파트","aptNm","aptName"),
+    "동": ("aptDong",),
+    "전용면적": ("전용면적","excluUseAr","exclusiveArea"),
+    # 삭제 예정: 건물면적/대지지분은 수집만 했던 과거버전 → 이번엔 표준컬럼에 포함 안함
+    "대지면적": LAND_AREA_KEYS,
+    "층": ("층","flr","floor"),
+    "거래금액": ("거래금액","dealAmount"),
+    "보증금": ("보증금","deposit"),
+    "월세": ("월세","rent","monthlyRent"),
+    "건축년도": ("건축년도","buildYear"),
+    "임차기간": ("contractTerm",),
+    "갱신여부": ("contractType",),
+    "기존 보증금": ("preDeposit",),
+    "기존 월세": ("preMonthlyRent",),
+    "년": ("년","dealYear"),
+    "월": ("월","dealMonth"),
+    "일": ("일","dealDay"),
+}
+TRADE_ONLY = {"보증금": None, "월세": None}
+RENT_ONLY = {"거래금액": None}
+RH_FIELDS = {"단지명/건물명": ("mhouseNm","houseNm","bldgNm","buildingName")}
+SH_FIELDS = {
+    "단지명/건물명": ("bldgNm","buildingName"),
+    "전용면적": ("totalFloorAr","전용면적","excluUseAr","exclusiveArea"),
+    "대지면적": ("plottageAr",*LAND_AREA_KEYS),
+}
 
-def to_df_apt_rent(items: list[dict]) -> pd.DataFrame:
-    rows=[]
-    for it in items:
-        dong = get_dong_name(it)
-        rows.append({
-            "법정동": dong,
-            "단지명/건물명": gv(it,"아파트","aptNm","aptName"),
-            "동": gv(it, "aptDong"),
-            "전용면적": gv(it,"전용면적","excluUseAr","exclusiveArea"),
-            "대지면적": gv(it,*LAND_AREA_KEYS),
-            "층": gv(it,"층","flr","floor"),
-            "거래금액": pd.NA,
-            "보증금": gv(it,"보증금","deposit"),
-            "월세": gv(it,"월세","rent","monthlyRent"),
-            "건축년도": gv(it,"건축년도","buildYear"),
-            "임차기간": gv(it,"contractTerm"),
-            "갱신여부": gv(it,"contractType"),
-            "기존 보증금": gv(it,"preDeposit"),
-            "기존 월세": gv(it,"preMonthlyRent"),
-            "년": gv(it,"년","dealYear"),
-            "월": gv(it,"월","dealMonth"),
-            "일": gv(it,"일","dealDay"),
-            "도로명": build_road_name(it),
-            "지번": build_jibun(it, dong),
-        })
-    df=pd.DataFrame(rows)
-    if not df.empty: make_contract_cols(df)
-    return df
+FIELD_SPECS = {
+    "apt_tr": {**COMMON_FIELDS, **TRADE_ONLY},
+    "apt_rt": {**COMMON_FIELDS, **RENT_ONLY},
+    "rh_tr":  {**COMMON_FIELDS, **RH_FIELDS, **TRADE_ONLY},
+    "rh_rt":  {**COMMON_FIELDS, **RH_FIELDS, **RENT_ONLY},
+    "sh_tr":  {**COMMON_FIELDS, **SH_FIELDS, **TRADE_ONLY},
+    "sh_rt":  {**COMMON_FIELDS, **SH_FIELDS, **RENT_ONLY},
+}
 
-def to_df_rh_trade(items:list[dict])->pd.DataFrame:
-    rows=[]
-    for it in items:
-        dong = get_dong_name(it)
-        name = gv(it,"mhouseNm","houseNm","bldgNm","buildingName")
-        htype = gv(it,"houseType")
-        if name and htype:
-            name = f"{name} ({htype})"
-        rows.append({
-            "법정동": dong,
-            "단지명/건물명": name,
-            "동": gv(it, "aptDong"),
-            "전용면적": gv(it,"전용면적","excluUseAr","exclusiveArea"),
-            "대지면적": gv(it,*LAND_AREA_KEYS),
-            "층": gv(it,"층","flr","floor"),
-            "거래금액": gv(it,"거래금액","dealAmount"),
-            "보증금": pd.NA,
-            "월세": pd.NA,
-            "건축년도": gv(it,"건축년도","buildYear"),
-            "임차기간": gv(it,"contractTerm"),
-            "갱신여부": gv(it,"contractType"),
-            "기존 보증금": gv(it,"preDeposit"),
-            "기존 월세": gv(it,"preMonthlyRent"),
-            "년": gv(it,"년","dealYear"),
-            "월": gv(it,"월","dealMonth"),
-            "일": gv(it,"일","dealDay"),
-            "도로명": build_road_name(it),
-            "지번": build_jibun(it, dong),
-        })
-    df=pd.DataFrame(rows)
-    if not df.empty: make_contract_cols(df)
-    return df
+# 단지명 뒤에 "(유형)"을 붙이는 엔드포인트 (연립/다세대: houseType)
+NAME_SUFFIX_KEYS = {"rh_tr": "houseType", "rh_rt": "houseType"}
 
-def to_df_rh_rent(items:list[dict])->pd.DataFrame:
-    rows=[]
-    for it in items:
-        dong = get_dong_name(it)
-        name = gv(it,"mhouseNm","houseNm","bldgNm","buildingName")
-        htype = gv(it,"houseType")
-        if name and htype:
-            name = f"{name} ({htype})"
-        rows.append({
-            "법정동": dong,
-            "단지명/건물명": name,
-            "동": gv(it, "aptDong"),
-            "전용면적": gv(it,"전용면적","excluUseAr","exclusiveArea"),
-            "대지면적": gv(it,*LAND_AREA_KEYS),
-            "층": gv(it,"층","flr","floor"),
-            "거래금액": pd.NA,
-            "보증금": gv(it,"보증금","deposit"),
-            "월세": gv(it,"월세","rent","monthlyRent"),
-            "건축년도": gv(it,"건축년도","buildYear"),
-            "임차기간": gv(it,"contractTerm"),
-            "갱신여부": gv(it,"contractType"),
-            "기존 보증금": gv(it,"preDeposit"),
-            "기존 월세": gv(it,"preMonthlyRent"),
-            "년": gv(it,"년","dealYear"),
-            "월": gv(it,"월","dealMonth"),
-            "일": gv(it,"일","dealDay"),
-            "도로명": build_road_name(it),
-            "지번": build_jibun(it, dong),
-        })
-    df=pd.DataFrame(rows)
-    if not df.empty: make_contract_cols(df)
-    return df
+# normalize_items에서 읽는 item 키 전체
+ITEM_KEYS = (
+    DONG_KEYS + JIBUN_KEYS + ROAD_NAME_KEYS + ROAD_BONBUN_KEYS + ROAD_BUBUN_KEYS
+    + tuple(k for spec in FIELD_SPECS.values() for keys in spec.values() if keys for k in keys)
+    + tuple(NAME_SUFFIX_KEYS.values())
+)
 
-def to_df_sh_trade(items:list[dict])->pd.DataFrame:
-    rows=[]
-    for it in items:
-        dong = get_dong_name(it)
-        rows.append({
-            "법정동": dong,
-            "단지명/건물명": gv(it,"bldgNm","buildingName"),
-            "동": gv(it, "aptDong"),
-            "전용면적": gv(it,"totalFloorAr","전용면적","excluUseAr","exclusiveArea"),
-            "대지면적": gv(it,"plottageAr",*LAND_AREA_KEYS),
-            "층": gv(it,"층","flr","floor"),
-            "거래금액": gv(it,"거래금액","dealAmount"),
-            "보증금": pd.NA,
-            "월세": pd.NA,
-            "건축년도": gv(it,"건축년도","buildYear"),
-            "임차기간": gv(it,"contractTerm"),
-            "갱신여부": gv(it,"contractType"),
-            "기존 보증금": gv(it,"preDeposit"),
-            "기존 월세": gv(it,"preMonthlyRent"),
-            "년": gv(it,"년","dealYear"),
-            "월": gv(it,"월","dealMonth"),
-            "일": gv(it,"일","dealDay"),
-            "도로명": build_road_name(it),
-            "지번": build_jibun(it, dong),
-        })
-    df=pd.DataFrame(rows)
-    if not df.empty: make_contract_cols(df)
+def normalize_items(key: str, items: list[dict]) -> pd.DataFrame:
+    """
+    item 목록(한 페이지 이상) → 표준 DataFrame (FIELD_SPECS[key] 매핑, 컬럼 단위 일괄 처리)
+    컬럼: 계약년월, 계약일, 법정동, (FIELD_SPECS 순서), 도로명, 지번
+    """
+    if not items:
+        return pd.DataFrame()
+    raw = item_columns(items, ITEM_KEYS)
+
+    dong = _text(coalesce(raw, DONG_KEYS))
+    cols: dict[str, pd.Series] = {"법정동": dong}
+    for col, keys in FIELD_SPECS[key].items():
+        cols[col] = pd.Series(pd.NA, index=dong.index, dtype=object) if keys is None else coalesce(raw, keys)
+
+    suffix_key = NAME_SUFFIX_KEYS.get(key)
+    if suffix_key:
+        name = cols["단지명/건물명"]
+        htype = coalesce(raw, (suffix_key,))
+        both = _text(name).ne("") & _text(htype).ne("")
+        cols["단지명/건물명"] = name.mask(both, name.astype(str) + " (" + htype.astype(str) + ")")
+
+    cols["도로명"] = build_road_name(raw)
+    cols["지번"] = build_jibun(raw, dong)
+
+    df = pd.DataFrame(cols)
+    make_contract_cols(df)
     return df
 
-def to_df_sh_rent(items:list[dict])->pd.DataFrame:
-    rows=[]
-    for it in items:
-        dong = get_dong_name(it)
-        rows.append({
-            "법정동": dong,
-            "단지명/건물명": gv(it,"bldgNm","buildingName"),
-            "동": gv(it, "aptDong"),
-            "전용면적": gv(it,"totalFloorAr","전용면적","excluUseAr","exclusiveArea"),
-            "대지면적": gv(it,"plottageAr",*LAND_AREA_KEYS),
-            "층": gv(it,"층","flr","floor"),
-            "거래금액": pd.NA,
-            "보증금": gv(it,"보증금","deposit"),
-            "월세": gv(it,"월세","rent","monthlyRent"),
-            "건축년도": gv(it,"건축년도","buildYear"),
-            "임차기간": gv(it,"contractTerm"),
-            "갱신여부": gv(it,"contractType"),
-            "기존 보증금": gv(it,"preDeposit"),
-            "기존 월세": gv(it,"preMonthlyRent"),
-            "년": gv(it,"년","dealYear"),
-            "월": gv(it,"월","dealMonth"),
-            "일": gv(it,"일","dealDay"),
-            "도로명": build_road_name(it),
-            "지번": build_jibun(it, dong),
-        })
-    df=pd.DataFrame(rows)
-    if not df.empty: make_contract_cols(df)
-    return df
+# ==========================
+# 엔드포인트 (SHEET_NAMES 순서 = 시트 순서)
+# ==========================
+ENDPOINTS = {
+    "apt_tr": BASE_APT_TRADE,
+    "apt_rt": BASE_APT_RENT,
+    "rh_tr":  BASE_RH_TRADE,
+    "rh_rt":  BASE_RH_RENT,
+    "sh_tr":  BASE_SH_TRADE,
+    "sh_rt":  BASE_SH_RENT,
+}
 
 # ==========================
 # 지역 로딩
@@ -628,10 +896,20 @@ def set_sheet_formats(writer, sheet_name: str, df: pd.DataFrame):
 # ==========================
 # 공통 finalize
 # ==========================
-def finalize_columns(df: pd.DataFrame, region_name: str, type_label: str) -> pd.DataFrame:
+def finalize_columns(df: pd.DataFrame, region_name: str | pd.Series, type_label: str) -> pd.DataFrame:
+    """
+    region_name: 지역명 하나 또는 행별 지역명 Series(시트 단위로 여러 지역을 한 번에 처리할 때)
+    """
     if df.empty:
         return df
-    si_do, gu_si = region_parts(region_name)
+    if isinstance(region_name, pd.Series):
+        # 지역명 종류는 몇 개뿐 → 고유값만 분리해서 펼침
+        codes, uniques = pd.factorize(region_name)
+        parts = [region_parts(u) for u in uniques]
+        si_do = np.array([p[0] for p in parts], dtype=object)[codes]
+        gu_si = np.array([p[1] for p in parts], dtype=object)[codes]
+    else:
+        si_do, gu_si = region_parts(region_name)
 
     # 기본 세팅
     df["유형"] = type_label
@@ -639,22 +917,14 @@ def finalize_columns(df: pd.DataFrame, region_name: str, type_label: str) -> pd.
     df["구/시"] = gu_si
 
     # 숫자형 변환 (표준화 단계)
-    for c in ["거래금액","보증금","월세","기존 보증금","기존 월세","층"]:
-        if c in df.columns:
-            df[c] = to_int_series(df[c])
-    for c in ["전용면적","대지면적"]:
-        if c in df.columns:
-            df[c] = to_float_series(df[c])
+    coerce_numeric_columns(df)
 
     # 계약년월/계약일 확보
     if "계약년월" not in df.columns or "계약일" not in df.columns:
         make_contract_cols(df)
 
     # 주소 생성 (지번 우선 → 없으면 도로명)
-    df["주소"] = [
-        compose_address(gu_si=gu_si, jibun=row.get("지번",""), road=row.get("도로명",""))
-        for _, row in df.iterrows()
-    ]
+    df["주소"] = compose_address_series(df["구/시"], df.get("지번"), df.get("도로명"))
 
     # 누락 채우고 순서 고정
     for c in FINAL_COLS:
@@ -667,77 +937,328 @@ def finalize_columns(df: pd.DataFrame, region_name: str, type_label: str) -> pd.
 
     return df
 
+# ==========================
+# 증분 갱신 상태/패치
+# ==========================
+def items_hash(items: list[dict]) -> str:
+    return hashlib.sha1(json.dumps(items, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def state_key(key: str, lawd_cd: str) -> str:
+    return f"{key}|{lawd_cd}"
+
+def load_state(ym: str) -> dict[str, dict]:
+    path = STATE_DIR / f"{ym}.json"
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception as e:
+        print(f"[!] 상태 파일 로드 실패 → 전체 수집: {path.name} | {e}")
+        return {}
+
+def save_state(ym: str, state: dict[str, dict]) -> None:
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    path = STATE_DIR / f"{ym}.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+def latest_output_path(ym: str) -> Path | None:
+    """data/YYYY/실거래_yyyymm_v*.xlsx 중 최신 버전 (버전 문자열이 시간순 정렬됨)"""
+    out_dir = (BASE_OUTDIR / ym[:4]).resolve()
+    files = sorted(out_dir.glob(f"실거래_{ym}_v*.xlsx"))
+    return files[-1] if files else None
+
+# 엑셀 재로딩 시 문자열로 유지할 컬럼(계약년월/년/월 등이 숫자로 바뀌지 않게)
+STR_COLS = [
+    "유형","시/도","구/시","법정동","계약년월","단지명/건물명","동","도로명","지번",
+    "건축년도","임차기간","갱신여부","년","월","일","주소",
+]
+
+def latest_month_source(ym: str) -> Path | None:
+    """증분 갱신 기준: 데이터셋의 해당 월 디렉터리(있으면), 없으면 최신 엑셀"""
+    if dataset.available() and dataset.month_version(DATASET_ROOT, dataset.TRADES, ym):
+        return dataset.month_dir(DATASET_ROOT, dataset.TRADES, ym)
+    return latest_output_path(ym)
+
+def read_month_source(ym: str, path: Path) -> dict[str, pd.DataFrame]:
+    return read_month_output(path) if path.suffix == ".xlsx" else read_month_dataset(ym)
+
+def read_month_output(path: Path) -> dict[str, pd.DataFrame]:
+    """기존 월 파일 → {시트키: DataFrame} (dtype은 finalize_columns 결과와 동일하게 복원)"""
+    xls = pd.read_excel(path, sheet_name=None, dtype={c: str for c in STR_COLS})
+    out = {}
+    for key, sheet in SHEET_NAMES.items():
+        df = xls.get(sheet)
+        if df is None or df.empty:
+            out[key] = pd.DataFrame(columns=FINAL_COLS)
+            continue
+        coerce_numeric_columns(df)
+        df["계약일"] = pd.to_datetime(df["계약일"], errors="coerce")
+        out[key] = df[FINAL_COLS]
+    return out
+
+def patch_sheet(old: pd.DataFrame, key: str, regions: dict[str, str],
+                results: dict[tuple[str, str], tuple]) -> pd.DataFrame:
+    """
+    지역 순서대로: 바뀐 지역은 새로 받은 행, 나머지는 기존 행 그대로.
+    (REGIONS에 없는 기존 지역 행은 뒤에 유지)
+    """
+    changed = [r for r in regions.keys() if results.get((key, r), (None, None, False))[2]]
+    new = normalize_sheet(key, [(r, results[(key, r)][0]) for r in changed])
+
+    parts, used = [], pd.Series(False, index=old.index)
+    for region_name in regions.keys():
+        si_do, gu_si = region_parts(region_name)
+        mask = (old["시/도"] == si_do) & (old["구/시"] == gu_si)
+        used |= mask
+        if region_name in changed:
+            if not new.empty:
+                new_mask = (new["시/도"] == si_do) & (new["구/시"] == gu_si)
+                if new_mask.any():
+                    parts.append(new[new_mask])
+        elif mask.any():
+            parts.append(old[mask])
+    if (~used).any():
+        parts.append(old[~used])
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=FINAL_COLS)
+
+# ==========================
+# 월 단위 수집
+# ==========================
+def fetch_region(key: str, region_name: str, lawd_cd: str, ym: str,
+                 prev: dict | None = None) -> tuple[list[dict], dict, bool]:
+    """
+    (지역, 엔드포인트, 월) 작업 1건: 전체 페이지 수집 (정규화는 시트 단위로 normalize_sheet에서 한 번에).
+    반환: (item 목록, 상태 {total, page1, hash, full_at}, 변경 여부)
+    prev(직전 상태)가 있으면 1페이지만 새로 받아 totalCount/해시가 같으면 나머지는 생략.
+    한계: 1페이지 비교는 건수는 같고 2페이지 이후만 바뀐 경우(기존 거래의 정정/해제 등)를 알 수 없음
+      → 마지막 전체 수집(full_at)에서 FULL_RECHECK_HOURS가 지났으면 1페이지가 같아도 전체를 받아
+        전체 해시(hash)로 비교. 그 사이의 뒷페이지 변경은 다음 전체 비교 때 반영됨.
+    """
+    url = ENDPOINTS[key]
+    now = time.time()
+    if prev is not None:
+        first = call_rtms(url, lawd_cd, ym, 1, refresh=True)
+        items1, total = first
+        fresh = now - prev.get("full_at", 0) < FULL_RECHECK_HOURS * 3600
+        if fresh and total == prev.get("total") and items_hash(items1) == prev.get("page1"):
+            return [], prev, False
+        items = fetch_all(url, lawd_cd, ym, refresh=True, first=first)
+    else:
+        first = call_rtms(url, lawd_cd, ym, 1)
+        items = fetch_all(url, lawd_cd, ym, first=first)
+
+    # total은 다음 비교 대상인 API totalCount 그대로 (받은 건수로 두면 덜 받은 조합은 매번 전체 재수집)
+    meta = {"total": first[1], "page1": items_hash(first[0]), "hash": items_hash(items), "full_at": int(now)}
+    changed = prev is None or meta["hash"] != prev.get("hash")
+    return items, meta, changed
+
+def collect_month(ym: str, regions: dict[str, str], workers: int,
+                  prev_state: dict[str, dict] | None = None) -> tuple[dict, dict[str, dict]]:
+    """
+    한 달치 (지역 × 엔드포인트) 작업을 스레드 풀로 병렬 수집.
+    반환: ({(시트키, 지역명): (item 목록, 상태, 변경여부)}, 새 상태)
+    prev_state가 주어지면 증분 모드(상태가 있는 조합만 1페이지 비교, 전체 비교 주기가 지난 조합은 전체 비교).
+    """
+    jobs = [(key, region_name, lawd_cd)
+            for region_name, lawd_cd in regions.items()
+            for key in SHEET_NAMES.keys()]
+    results: dict[tuple[str, str], tuple] = {}
+    state: dict[str, dict] = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futs = {}
+        for key, region_name, lawd_cd in jobs:
+            prev = prev_state.get(state_key(key, lawd_cd)) if prev_state is not None else None
+            futs[ex.submit(fetch_region, key, region_name, lawd_cd, ym, prev)] = (key, region_name, lawd_cd)
+        for done, fut in enumerate(as_completed(futs), 1):
+            key, region_name, lawd_cd = futs[fut]
+            results[(key, region_name)] = fut.result()  # 재시도 후에도 실패하면 예외 전파(기존과 동일)
+            state[state_key(key, lawd_cd)] = results[(key, region_name)][1]
+            if done % 50 == 0 or done == len(jobs):
+                print(f"[i] {ym} 수집 진행: {done}/{len(jobs)}")
+
+    return results, state
+
+def normalize_sheet(key: str, parts: list[tuple[str, list[dict]]]) -> pd.DataFrame:
+    """
+    [(지역명, item 목록), ...] → 한 시트 DataFrame.
+    지역별로 나누지 않고 시트 전체를 한 번에 정규화(컬럼 연산 고정비용을 시트당 1회로).
+    """
+    parts = [(r, its) for r, its in parts if its]
+    if not parts:
+        return pd.DataFrame(columns=FINAL_COLS)
+    items = [it for _, its in parts for it in its]
+    regions = pd.Series(np.repeat([r for r, _ in parts], [len(its) for _, its in parts]), dtype=object)
+    return finalize_columns(normalize_items(key, items), regions, SHEET_NAMES[key])
+
+def build_month_frames(regions: dict[str, str], results: dict[tuple[str, str], tuple]) -> dict[str, pd.DataFrame]:
+    """완료 순서와 무관하게 지역 순서(regions) 그대로 시트별 DataFrame 구성"""
+    return {
+        key: normalize_sheet(key, [(r, results[(key, r)][0]) for r in regions.keys() if (key, r) in results])
+        for key in SHEET_NAMES.keys()
+    }
+
+def write_month_xlsx(out_path: Path, frames: dict[str, pd.DataFrame]) -> None:
+    with pd.ExcelWriter(out_path, engine="xlsxwriter", datetime_format="yy-mm-dd") as writer:
+        for key, sheet in SHEET_NAMES.items():
+            df_all = frames[key]
+
+            # 숫자/날짜 dtype 유지된 상태로 쓰기
+            df_all.to_excel(writer, sheet_name=sheet, index=False)
+
+            # 시트별 표시 서식 적용
+            set_sheet_formats(writer, sheet, df_all)
+    run_report.add_bytes(out_path, out_path.stat().st_size)
+
+# ==========================
+# Parquet 데이터셋 저장/읽기, 엑셀 내보내기
+# ==========================
+def write_month_dataset(ym: str, frames: dict[str, pd.DataFrame], version: str) -> list[Path]:
+    """{시트키: DataFrame} → data/dataset/trades/year=/month=/sheet=<시트명>/part-<version>.parquet"""
+    return dataset.write_month(DATASET_ROOT, dataset.TRADES, ym,
+                               {SHEET_NAMES[k]: frames[k] for k in SHEET_NAMES.keys()}, version)
+
+def read_month_dataset(ym: str) -> dict[str, pd.DataFrame]:
+    """데이터셋의 해당 월 → {시트키: DataFrame} (없는 시트는 빈 DataFrame)"""
+    sheets = dataset.read_month(DATASET_ROOT, dataset.TRADES, ym)
+    out = {}
+    for key, sheet in SHEET_NAMES.items():
+        df = sheets.get(sheet)
+        out[key] = df[FINAL_COLS] if df is not None and not df.empty else pd.DataFrame(columns=FINAL_COLS)
+    return out
+
+def export_month_xlsx(ym: str) -> Path | None:
+    """데이터셋의 해당 월 → data/YYYY/실거래_yyyymm_<같은 버전>.xlsx (없으면 None)"""
+    version = dataset.month_version(DATASET_ROOT, dataset.TRADES, ym)
+    if version is None:
+        return None
+    out_path = make_output_path(ym, version)
+    write_month_xlsx(out_path, read_month_dataset(ym))
+    return out_path
+
 # ==========================
 # 메인
 # ==========================
 def main():
+    global RATE_LIMIT_PER_SEC, USE_CACHE, FROM_CACHE, FULL_RECHECK_HOURS
 
     # 수집 연월(YYYYMM) — 각 연월마다 파일 1개 생성
     MONTHS = ["202509"]
 
     # 인자 처리
     MONTHS = get_target_months_from_args(MONTHS)
+    workers, RATE_LIMIT_PER_SEC = get_fetch_options_from_args()
+    USE_CACHE, FROM_CACHE = get_cache_options_from_args()
+    print(f"[i] 동시 수집: workers={workers}, rps={RATE_LIMIT_PER_SEC:g}")
+    if FROM_CACHE:
+        print(f"[i] 오프라인 모드(--from-cache): {RTMS_CACHE_DIR} 만 사용")
+    elif not USE_CACHE:
+        print("[i] 응답 캐시 사용 안 함(--no-cache)")
+
+    # 공용 세션: 동시 요청 수만큼 커넥션 유지 + 호스트 한도
+    http_session.configure(pool_size=workers * PAGE_WORKERS,
+                           connect_timeout=HTTP_CONNECT_TIMEOUT, read_timeout=HTTP_READ_TIMEOUT)
+    http_session.set_rate_limit(BASE_APT_TRADE, RATE_LIMIT_PER_SEC)
+
+    refresh = get_refresh_option_from_args()
+    if refresh and FROM_CACHE:
+        print("[!] --refresh 는 --from-cache 와 함께 쓸 수 없어 무시합니다.")
+        refresh = False
+    FULL_RECHECK_HOURS = get_full_recheck_option_from_args(FULL_RECHECK_HOURS)
+
+    write_xlsx, export_only = get_xlsx_options_from_args()
+    use_dataset = dataset.available()
+    if not use_dataset:
+        print("[!] pyarrow가 없어 Parquet 대신 엑셀로 저장합니다. (pip install pyarrow 권장)")
+        if export_only:
+            return
+
+    if export_only:
+        for ym in MONTHS:
+            with run_report.stage("export_xlsx", ym=ym):
+                out_path = export_month_xlsx(ym)
+            if out_path is None:
+                print(f"[!] {ym}: 데이터셋에 없음 → 건너뜀")
+            else:
+                print(f"[✓] Exported: {out_path}")
+        return
 
     REGIONS = load_regions()
 
     for ym in MONTHS:
-        # 6개 시트용 누적 컨테이너
-        bag = {k: [] for k in SHEET_NAMES.keys()}
-
-        for region_name, lawd_cd in REGIONS.items():
-            # 아파트
-            apt_tr = fetch_all(BASE_APT_TRADE, lawd_cd, ym)
-            apt_rt = fetch_all(BASE_APT_RENT,  lawd_cd, ym)
-            if apt_tr:
-                df = finalize_columns(to_df_apt_trade(apt_tr), region_name, "아파트_매매")
-                bag["apt_tr"].append(df)
-            if apt_rt:
-                df = finalize_columns(to_df_apt_rent(apt_rt), region_name, "아파트_전월세")
-                bag["apt_rt"].append(df)
-
-            # 연립/다세대
-            rh_tr = fetch_all(BASE_RH_TRADE, lawd_cd, ym)
-            rh_rt = fetch_all(BASE_RH_RENT,  lawd_cd, ym)
-            if rh_tr:
-                df = finalize_columns(to_df_rh_trade(rh_tr), region_name, "연립다세대_매매")
-                bag["rh_tr"].append(df)
-            if rh_rt:
-                df = finalize_columns(to_df_rh_rent(rh_rt), region_name, "연립다세대_전월세")
-                bag["rh_rt"].append(df)
-
-            # 단독/다가구
-            sh_tr = fetch_all(BASE_SH_TRADE, lawd_cd, ym)
-            sh_rt = fetch_all(BASE_SH_RENT,  lawd_cd, ym)
-            if sh_tr:
-                df = finalize_columns(to_df_sh_trade(sh_tr), region_name, "단독다가구_매매")
-                bag["sh_tr"].append(df)
-            if sh_rt:
-                df = finalize_columns(to_df_sh_rent(sh_rt), region_name, "단독다가구_전월세")
-                bag["sh_rt"].append(df)
-
-        # 파일 저장(해당 yyyymm 한 개 파일)
-        out_path = make_output_path(ym)
-
-
         print(f"[i] 처리 중: {ym}")
-        out_path = make_output_path(ym)
-        print(f"[i] 저장 경로: {out_path}")
-
-        # 👉 기존 로직 (데이터 처리 & 시트 저장)
-        with pd.ExcelWriter(out_path, engine="xlsxwriter", datetime_format="yy-mm-dd") as writer:
-            for key, sheet in SHEET_NAMES.items():
-                df_all = pd.concat(bag[key], ignore_index=True) if bag[key] else pd.DataFrame(columns=FINAL_COLS)
-
-                # 숫자/날짜 dtype 유지된 상태로 쓰기
-                df_all.to_excel(writer, sheet_name=sheet, index=False)
 
-                # 시트별 표시 서식 적용
-                set_sheet_formats(writer, sheet, df_all)
+        prev_state, base_path = None, None
+        if refresh:
+            prev_state, base_path = load_state(ym), latest_month_source(ym)
+            if not prev_state or base_path is None:
+                print(f"[i] {ym}: 이전 상태/파일 없음 → 전체 수집")
+                prev_state, base_path = None, None
+            else:
+                print(f"[i] {ym}: 증분 갱신 기준 파일 {base_path.name}")
 
-        print(f"[✓] Saved: {out_path}")
+        try:
+            with run_report.stage("fetch", ym=ym) as st:
+                results, state = collect_month(ym, REGIONS, workers, prev_state)
+                st["rows"] = sum(len(items) for items, _, _ in results.values())
+        except CacheMissError as e:  # 일부 지역이 빠진 달을 저장하지 않음(기존 결과 유지)
+            run_report.count("rtms_cache_missing_months")
+            print(f"[!] {ym}: 캐시 없음(--from-cache) → 이 달은 저장하지 않음 ({e})")
+            continue
+
+        if base_path is not None:
+            changed = [k for k, (_, _, ch) in results.items() if ch]
+            if not changed:
+                save_state(ym, state)
+                print(f"[i] {ym}: 변경 없음 → 저장 생략 ({base_path.name} 유지)")
+                continue
+            print(f"[i] {ym}: 변경 {len(changed)}/{len(results)}개 조합 → 해당 부분만 교체")
+            with run_report.stage("read_base", ym=ym) as st:
+                old = read_month_source(ym, base_path)
+                st["rows"] = sum(len(df) for df in old.values())
+            with run_report.stage("normalize", ym=ym) as st:
+                frames = {key: patch_sheet(old[key], key, REGIONS, results) for key in SHEET_NAMES.keys()}
+                st["rows"] = sum(len(df) for df in frames.values())
+        else:
+            with run_report.stage("normalize", ym=ym) as st:
+                frames = build_month_frames(REGIONS, results)
+                st["rows"] = sum(len(df) for df in frames.values())
+        rows = sum(len(df) for df in frames.values())
+
+        # 저장(해당 yyyymm: 시트별 Parquet, 요청 시 엑셀도)
+        version = make_version()
+        if use_dataset:
+            with run_report.stage("save_dataset", ym=ym) as st:
+                write_month_dataset(ym, frames, version)
+                st["rows"] = rows
+            print(f"[✓] Saved: {dataset.month_dir(DATASET_ROOT, dataset.TRADES, ym)} ({version})")
+            if write_xlsx:
+                with run_report.stage("export_xlsx", ym=ym) as st:
+                    out_path = export_month_xlsx(ym)
+                    st["rows"] = rows
+                print(f"[✓] Exported: {out_path}")
+        else:
+            out_path = make_output_path(ym, version)
+            with run_report.stage("save_xlsx", ym=ym) as st:
+                write_month_xlsx(out_path, frames)
+                st["rows"] = rows
+            print(f"[✓] Saved: {out_path}")
+        with run_report.stage("cube", ym=ym) as st:
+            price_cube.update_month(CUBE_DIR, ym, {SHEET_NAMES[k]: frames[k] for k in SHEET_NAMES.keys()}, version)
+            st["rows"] = rows
+        save_state(ym, state)  # 파일 저장 후에 상태 기록(중단 시 다음 실행에서 다시 비교)
 
 if __name__ == "__main__":
+    run_report.start("land")
+    status = "error"
     try:
         main()
+        status = "ok"
     except KeyboardInterrupt:
+        status = "interrupted"
         print("Interrupted by user")
+    finally:
+        report_path, prom_path = get_report_options_from_args()
+        run_report.finish(report_path, prom_path, status=status)
@@ -0,0 +1,370 @@
+# map_export.py
+# 지도 프런트엔드용 컴팩트 컬럼 포맷(.rtc) — GeoJSON 대체
+# - GeoJSON은 feature마다 한글 속성 키 ~26개를 반복하고 indent=2로 저장되어 크고 파싱이 느림
+# - .rtc: 속성을 컬럼 단위로 저장
+#     문자열(및 기타 값) → 사전(dictionary) 인코딩: 고유값 목록 + u8/u16/u32 코드 배열 (0 = null)
+#     정수 → i32 (null = -2^31), 소수 둘째 자리까지인 값(면적 등) → i32 × 1/100, 그 외 숫자 → f64
+#     좌표 → f64 [lng, lat, lng, lat, ...]
+# - 같은 내용의 .rtc.gz / .rtc.br(brotli 모듈이 있을 때) 미리 압축본도 생성
+#   (정적 서버의 gzip_static/brotli_static 용, 프런트엔드는 .gz를 직접 받아 풀 수도 있음)
+# - 디코더: data/compact.js (window.RealEstateCompact)
+# - GeoJSONWriter: 통합 GeoJSON을 시트 단위로 이어 쓰는 스트리밍 저장(임시 파일 → 교체, indent 없는 모드 지원)
+#
+# 바이너리 구조 (리틀 엔디언)
+#   "RTC1" | u32 헤더 길이 | 헤더(JSON, UTF-8) | 8바이트 정렬 패딩 | 데이터 영역
+#   헤더: {"count": N, "coords": {"offset"}, "columns": [{"name", "type", "offset", "scale"?, "values"?, "codes"?}, ...]}
+#   offset은 데이터 영역 시작 기준, 각 배열은 8바이트 정렬
+#
+# 사용 예) 기존 GeoJSON 변환
+#   python map_export.py data/2025/geojson/*.geojson   → data/2025/compact/<같은 이름>.rtc(.gz/.br)
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import math
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+
+import numpy as np
+
+import run_report
+
+try:
+    import brotli  # type: ignore
+except ModuleNotFoundError:
+    brotli = None
+
+MAGIC = b"RTC1"
+EXT = ".rtc"
+I32_NULL = -(2 ** 31)
+_I32_MAX = 2 ** 31 - 1
+
+# ==========================
+# 인코딩
+# ==========================
+def _is_number(v) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def _column_kind(vals: list) -> tuple[str, int]:
+    """값 목록 → (저장 형식, scale). 형식: null / i32 / f64 / dict"""
+    present = [v for v in vals if v is not None]
+    if not present:
+        return "null", 1
+    if not all(_is_number(v) for v in present):
+        return "dict", 1
+    if any(isinstance(v, float) and not math.isfinite(v) for v in present):
+        return "f64", 1
+    # 정수만 → i32, 소수 둘째 자리까지(면적 등) → i32 × 1/100 (디코딩 시 나눠서 같은 값)
+    scale = 1 if all(isinstance(v, int) for v in present) else 100
+    scaled = [v * scale for v in present]
+    if all(abs(s - round(s)) < 1e-6 and I32_NULL < round(s) <= _I32_MAX for s in scaled):
+        return "i32", scale
+    return "f64", 1
+
+
+def _code_type(n_values: int) -> str:
+    return "u8" if n_values < 2 ** 8 else "u16" if n_values < 2 ** 16 else "u32"
+
+
+def _value_key(v):
+    """int/float/bool/str 외 값(리스트 등)의 사전 인코딩 키 — JSON 텍스트"""
+    return json.dumps(v, ensure_ascii=False)
+
+
+class _Column:
+    """
+    빌더의 한 컬럼: 고유값 목록 + 행별 코드(u32 array, 0 = null).
+    고유값 사전은 값 타입별로 따로 (1 / 1.0 / True / "1"은 서로 다른 값, NaN끼리는 같은 값)
+    """
+
+    __slots__ = ("index", "values", "codes")
+
+    def __init__(self, index: dict, values: list, codes: array):
+        self.index, self.values, self.codes = index, values, codes
+
+    def extend(self, vals) -> None:
+        index, values, codes = self.index, self.values, []
+        put = codes.append
+        last, sub = None, None
+        for v in vals:
+            if v is None:
+                put(0)
+                continue
+            t = type(v)
+            if t is not last:
+                last, sub = t, index.setdefault(t, {})
+            if t is str or t is int or t is bool:
+                key = v
+            elif t is float:
+                key = v if v == v else "nan"
+            else:
+                key = _value_key(v)
+            code = sub.get(key)
+            if code is None:
+                values.append(v)
+                code = sub[key] = len(values)
+            put(code)
+        self.codes.extend(codes)
+
+    def array(self) -> np.ndarray:
+        return np.frombuffer(self.codes, dtype=np.uint32) if len(self.codes) else np.zeros(0, dtype=np.uint32)
+
+
+class CompactBuilder:
+    """
+    feature를 조금씩 받아 컬럼과 좌표만 모아 두는 인코더.
+    (시트 단위로 add → 마지막에 encode, feature dict 전체를 들고 있지 않아도 됨)
+    받는 대로 컬럼마다 사전 인코딩(고유값 1번 + 행당 u32 코드 4바이트, 좌표는 f64 array)
+    → 한 달치를 모아도 행당 값 객체/리스트 포인터를 들고 있지 않음.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.coords = array("d")
+        self._columns: dict[str, _Column] = {}
+
+    def add(self, features: list[dict]) -> "CompactBuilder":
+        props = [f.get("properties") or {} for f in features]
+        for f in features:
+            self.coords.extend(f["geometry"]["coordinates"][:2])
+        for key in dict.fromkeys(k for p in props for k in p):
+            if key not in self._columns:
+                self._columns[key] = _Column({}, [], array("I", bytes(4 * self.count)))
+        for key, col in self._columns.items():
+            col.extend(p.get(key) for p in props)
+        self.count += len(features)
+        return self
+
+    def column(self, name: str) -> np.ndarray:
+        """컬럼 값 (object 배열, 없는 값/컬럼은 None) — map_tiles.frame / search_index.summarize용"""
+        col = self._columns.get(name)
+        if col is None:
+            return np.full(self.count, None, dtype=object)
+        lookup = np.empty(len(col.values) + 1, dtype=object)
+        lookup[1:] = col.values
+        return lookup[col.array()]
+
+    def take(self, rows: list[int]) -> "CompactBuilder":
+        """rows(행 번호 목록)만 뽑은 새 빌더 (map_tiles.py 타일 분할용, 고유값 목록은 공유 — 인코딩 때 쓰인 값만 남김)"""
+        idx = np.asarray(rows, dtype=np.intp)
+        out = CompactBuilder()
+        out.count = len(idx)
+        out.coords = array("d", np.frombuffer(self.coords, dtype=float).reshape(-1, 2)[idx].tobytes())
+        out._columns = {
+            key: _Column(col.index, col.values, array("I", col.array()[idx].tobytes()))
+            for key, col in self._columns.items()
+        }
+        return out
+
+    def encode(self) -> bytes:
+        return _encode(self.count, self.coords, self._columns)
+
+
+def encode_compact(features: list[dict]) -> bytes:
+    """GeoJSON Point feature 목록 → .rtc 바이트"""
+    return CompactBuilder().add(features).encode()
+
+
+def _encode(n: int, coord_list, columns_in: dict[str, _Column]) -> bytes:
+    coords = np.frombuffer(coord_list, dtype="<f8") if len(coord_list) else np.zeros(0, dtype="<f8")
+    buffers: list[bytes] = [coords.tobytes()]
+    columns = []
+    for key, src in columns_in.items():
+        codes = src.array()
+        # 이 빌더에서 쓰인 코드만, 처음 나온 순서대로 (take로 뽑은 타일은 공유 사전의 일부만 씀)
+        used, first = np.unique(codes, return_index=True)
+        used = used[np.argsort(first, kind="stable")]
+        used = used[used != 0]
+        vals = [src.values[c - 1] for c in used]
+        kind, scale = _column_kind(vals)
+        col: dict = {"name": key, "type": kind}
+        if kind == "i32":
+            lut = np.full(len(src.values) + 1, I32_NULL, dtype="<i4")
+            lut[used] = [round(v * scale) for v in vals]
+            arr = lut[codes]
+            if scale != 1:
+                col["scale"] = scale
+        elif kind == "f64":
+            lut = np.full(len(src.values) + 1, math.nan, dtype="<f8")
+            lut[used] = vals
+            arr = lut[codes]
+        elif kind == "dict":
+            # 문자열은 그대로, 그 외(숫자 섞임/리스트 등)도 원래 값 (1 / 1.0 / "1"은 서로 다른 값 — _Column)
+            lut = np.zeros(len(src.values) + 1, dtype=np.uint32)
+            lut[used] = np.arange(1, len(used) + 1)
+            col["values"] = vals
+            col["codes"] = _code_type(len(used) + 1)
+            arr = lut[codes].astype({"u8": "<u1", "u16": "<u2", "u32": "<u4"}[col["codes"]])
+        else:
+            columns.append(col)
+            continue
+        columns.append(col)
+        buffers.append(arr.tobytes())
+
+    # 데이터 영역 배치(8바이트 정렬)
+    offsets, pos = [], 0
+    for b in buffers:
+        offsets.append(pos)
+        pos += len(b) + (-len(b)) % 8
+    header = {"count": n, "coords": {"offset": offsets[0]}, "columns": columns}
+    it = iter(offsets[1:])
+    for col in columns:
+        if col["type"] != "null":
+            col["offset"] = next(it)
+
+    head = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    prefix = MAGIC + struct.pack("<I", len(head)) + head
+    out = bytearray(prefix + b"\0" * ((-len(prefix)) % 8))
+    for b in buffers:
+        out += b + b"\0" * ((-len(b)) % 8)
+    return bytes(out)
+
+
+def read_header(path: Path) -> dict:
+    """.rtc 파일 헤더(JSON)만 읽기"""
+    with open(path, "rb") as fp:
+        if fp.read(4) != MAGIC:
+            raise ValueError(f"not an {EXT} file: {path}")
+        (size,) = struct.unpack("<I", fp.read(4))
+        return json.loads(fp.read(size).decode("utf-8"))
+
+# ==========================
+# 저장
+# ==========================
+def write_atomic(path: Path, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(data)
+        os.chmod(tmp, 0o644)  # mkstemp 기본 권한(0600)이면 정적 서버가 못 읽음
+        os.replace(tmp, path)
+        run_report.add_bytes(path, len(data))
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def write_compact(out_path: Path, features: list[dict] | CompactBuilder, br: bool = True) -> dict[str, Path]:
+    """
+    out_path(.rtc) + 미리 압축본(.rtc.gz, brotli 모듈이 있으면 .rtc.br) 저장.
+    features: feature 목록 또는 미리 채운 CompactBuilder
+    br=False: .br 생략 (타일처럼 작은 파일이 아주 많을 때 — quality 11 압축이 저장 시간 대부분을 차지)
+    반환: {"rtc": 경로, "gz": 경로, "br": 경로(있을 때)}
+    """
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    data = features.encode() if isinstance(features, CompactBuilder) else encode_compact(features)
+    paths = {"rtc": out_path, "gz": out_path.with_name(out_path.name + ".gz")}
+    write_atomic(paths["rtc"], data)
+    write_atomic(paths["gz"], gzip.compress(data, compresslevel=9, mtime=0))
+    br_path = out_path.with_name(out_path.name + ".br")
+    if brotli is not None and br:
+        write_atomic(br_path, brotli.compress(data, quality=11))
+        paths["br"] = br_path
+    else:
+        br_path.unlink(missing_ok=True)  # 이전 실행의 오래된 .br이 남지 않게
+    return paths
+
+
+class GeoJSONWriter:
+    """
+    FeatureCollection 스트리밍 저장: feature를 받는 대로 같은 폴더 임시 파일에 쓰고,
+    정상 종료 시 한 번에 교체(os.replace). 예외로 끝나면 임시 파일 삭제(기존 파일 유지).
+    indent=2: json.dumps(..., indent=2)와 같은 출력 / indent=None: 공백 없는 한 줄
+    쓰는 동안 count/size(바이트)/sha256/bbox([서, 남, 동, 북])도 함께 계산 (manifest용)
+    """
+
+    def __init__(self, path: Path, indent: int | None = 2):
+        self.path = Path(path)
+        self.indent = indent
+        self.count = 0
+        self.size = 0
+        self.bbox: list[float] | None = None
+        self._hash = hashlib.sha256()
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    def _emit(self, text: str) -> None:
+        data = text.encode("utf-8")
+        self._fp.write(data)
+        self._hash.update(data)
+        self.size += len(data)
+
+    def __enter__(self) -> "GeoJSONWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        self._fp = os.fdopen(fd, "wb")
+        if self.indent is None:
+            self._emit('{"type":"FeatureCollection","features":[')
+        else:
+            pad = " " * self.indent
+            self._emit(f'{{\n{pad}"type": "FeatureCollection",\n{pad}"features": [')
+        return self
+
+    def write(self, features: list[dict]) -> None:
+        if not features:
+            return
+        if self.indent is None:
+            parts = [json.dumps(f, ensure_ascii=False, separators=(",", ":")) for f in features]
+            self._emit(("," if self.count else "") + ",".join(parts))
+        else:
+            item_pad = "\n" + " " * (self.indent * 2)
+            parts = [item_pad + json.dumps(f, ensure_ascii=False, indent=self.indent).replace("\n", item_pad)
+                     for f in features]
+            self._emit(("," if self.count else "") + ",".join(parts))
+        self.count += len(features)
+        xy = np.array([f["geometry"]["coordinates"][:2] for f in features], dtype=float)
+        lo, hi = xy.min(axis=0), xy.max(axis=0)
+        if self.bbox is not None:
+            lo = np.minimum(lo, self.bbox[:2])
+            hi = np.maximum(hi, self.bbox[2:])
+        self.bbox = [*map(float, lo), *map(float, hi)]
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                if self.indent is None:
+                    self._emit("]}")
+                else:
+                    pad = " " * self.indent
+                    self._emit(f"\n{pad}]\n}}" if self.count else "]\n}")
+            self._fp.close()
+            if exc_type is None:
+                os.chmod(self._tmp, 0o644)
+                os.replace(self._tmp, self.path)
+                run_report.add_bytes(self.path, self.size)
+        finally:
+            Path(self._tmp).unlink(missing_ok=True)
+
+
+def compact_path_for(geojson_path: Path) -> Path:
+    """data/YYYY/geojson/<stem>.geojson → data/YYYY/compact/<stem>.rtc"""
+    geojson_path = Path(geojson_path)
+    return geojson_path.parent.parent / "compact" / f"{geojson_path.stem}{EXT}"
+
+# ==========================
+# CLI: 기존 GeoJSON 변환
+# ==========================
+def main(argv: list[str]) -> None:
+    if not argv:
+        print("사용법: python map_export.py <파일.geojson> [...]")
+        return
+    for arg in argv:
+        src = Path(arg)
+        features = json.loads(src.read_text(encoding="utf-8")).get("features", [])
+        paths = write_compact(compact_path_for(src), features)
+        sizes = ", ".join(f"{k}={p.stat().st_size:,}B" for k, p in paths.items())
+        print(f"[✓] {src.name} → {paths['rtc']} (features={len(features)}; geojson={src.stat().st_size:,}B, {sizes})")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,256 @@
+# map_tiles.py
+# 지도 타일 피라미드 — 한 달 거래를 웹 메르카토르 z/x/y 타일로 나눠 저장 (프런트엔드는 화면 안 타일만 요청)
+# - 리프 줌(LEAF_ZOOM) 타일: 그 타일 안 feature → 컴팩트 포맷(.rtc + .rtc.gz, map_export.py — .br은 만들지 않음)
+#     data/YYYY/tiles/<stem>/<버전>/<z>/<x>/<y>.rtc  (<버전>/ = index.json의 base)
+# - 집계(index.json): MIN_ZOOM~LEAF_ZOOM 각 줌의 타일별 건수/중심/매매 평당가 중앙값/유형별 건수
+#     {"leaf": 14, "zooms": [8, 14], "base": "<버전>/", "count": N, "ranges": {...}, "clusters": {"path", "sha256"},
+#      "tiles": {"14": {"x/y": {"n": 건수, "c": [lng, lat], "py": 매매 평당가 중앙값(만원), "k": {"아파트|매매": 건수}}}}}
+#     k(주택유형|거래구분별 건수) → 프런트엔드의 주택유형/거래유형 필터를 집계에도 적용
+#     ranges: 필터 슬라이더 초기 범위(타일을 다 받지 않아도 전체 범위를 알 수 있게)
+#       {"man": [최소, 최대] 가격(만원, 매매=거래금액, 그 외=보증금), "py": [최소, 최대] 전용면적(평), "yms": [YYYYMM, ...]}
+# - 군집/단지 그룹(<버전>/clusters.json): 클라이언트 MarkerClusterer/단지 그룹 계산 대신 쓰는 미리 계산한 결과
+#     {"kinds": ["아파트|매매", ...], "cell": 64,
+#      "groups": [[이름, lng, lat, "x/y"(리프 타일), [[kind 번호, 건수, 최고가(만원)], ...]], ...],
+#      "zooms": {"8": [[lng, lat, 셀 "cx/cy", [groups 번호, ...], [[kind 번호, 건수, 최고가], ...]], ...], ...}}
+#     단지 그룹: 이름(단지명/건물명 → 건물명 → 단지명 → 주소) × 리프 타일 단위 — 건수/좌표(거래 평균 위치)는 그 타일 안 거래만
+#       (프런트엔드는 받은 타일의 그룹을 이름으로 합침 → 받은 feature로 직접 묶은 것과 같은 기준)
+#     군집: 줌마다 CELL_PX 픽셀 격자로 단지 그룹을 묶음(건수 가중 중심) — 셀 번호가 같으면 여러 달을 합칠 수 있음
+#       groups 번호 → 이름으로 바꿔 여러 달의 단지를 중복 없이 셀 수 있음
+#     kind별 건수/최고가 → 주택유형/거래유형 필터를 적용해도 다시 계산할 필요 없음
+# - 화면이 넓어 리프 타일이 많으면 프런트엔드는 타일 대신 군집(없으면 타일별 집계)을 표시
+# - 같은 stem을 다시 만들면 새 버전 폴더에 만든 뒤 index.json만 교체(교체 중에도 피라미드가 비지 않음), 직전 버전 1개만 남김
+# - index.json/clusters.json은 .gz/.br 미리 압축본도 저장
+#
+# 사용 예) 기존 GeoJSON에서 타일 생성
+#   python map_tiles.py data/2025/geojson/*.geojson   → data/2025/tiles/<같은 이름>/...
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import math
+import shutil
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import map_export
+
+LEAF_ZOOM = 14        # feature 타일 줌 (서울 위도에서 한 변 ≈ 1.9km)
+MIN_ZOOM = 8          # 집계를 만드는 가장 낮은 줌
+INDEX_NAME = "index.json"
+CLUSTERS_NAME = "clusters.json"
+CELL_PX = 64          # 군집 격자 한 칸(화면 픽셀, 256px 타일 기준)
+PYEONG = 3.3058       # ㎡ → 평
+JSON_BROTLI_QUALITY = 9  # index.json/clusters.json .br (11은 clusters.json 1개에 수 초, 크기 차이는 15~20%)
+
+# ==========================
+# 타일 좌표
+# ==========================
+def tile_xy(lng: np.ndarray, lat: np.ndarray, zoom: int) -> tuple[np.ndarray, np.ndarray]:
+    """경위도 → 웹 메르카토르 타일 번호 (x, y)"""
+    n = 2 ** zoom
+    lat_rad = np.radians(np.clip(lat, -85.05112878, 85.05112878))
+    x = np.floor((np.asarray(lng) + 180.0) / 360.0 * n)
+    y = np.floor((1.0 - np.arcsinh(np.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return np.clip(x, 0, n - 1).astype(np.int64), np.clip(y, 0, n - 1).astype(np.int64)
+
+
+def tiles_dir_for(geojson_path: Path) -> Path:
+    """data/YYYY/geojson/<stem>.geojson → data/YYYY/tiles/<stem>"""
+    geojson_path = Path(geojson_path)
+    return geojson_path.parent.parent / "tiles" / geojson_path.stem
+
+# ==========================
+# 집계
+# ==========================
+def frame(builder: map_export.CompactBuilder) -> pd.DataFrame:
+    """CompactBuilder 컬럼 → 집계용 DataFrame (lng, lat, 분류 키, 단지 이름, 가격, 면적, 계약년월) — search_index.py도 사용"""
+    n = builder.count
+    col = lambda name: pd.Series(builder.column(name), dtype=object)
+    name = pd.Series([None] * n, dtype=object)
+    for c in ("단지명/건물명", "건물명", "단지명", "주소"):
+        v = col(c).astype(str).str.strip().where(col(c).notna() & col(c).astype(bool))
+        name = name.where(name.notna(), v)
+    xy = np.frombuffer(builder.coords, dtype=float).reshape(-1, 2)
+    deal = col("거래유형").fillna("기타").astype(str)
+    monthly = pd.to_numeric(col("월세"), errors="coerce").fillna(0)
+    deal = deal.where(deal != "전월세", np.where(monthly > 0, "월세", "전세"))
+    sale = deal.eq("매매")
+    price = pd.to_numeric(col("거래금액").where(sale, col("보증금")), errors="coerce")
+    py = pd.to_numeric(col("전용면적"), errors="coerce") / PYEONG
+    ym = col("년").astype(str).str.zfill(4) + col("월").astype(str).str.zfill(2)
+    ym = ym.where(col("년").notna() & col("월").notna(), col("계약년월").astype(str).str[:6])
+    return pd.DataFrame({
+        "lng": xy[:, 0], "lat": xy[:, 1],
+        "k": col("주택유형").fillna("기타").astype(str) + "|" + deal,
+        "name": name.fillna("미상").replace("", "미상"),
+        "man": price,
+        "py": py,
+        "ppy": (price / py).where(sale & (py > 0)),  # 매매 평당가(만원)
+        "ym": pd.to_numeric(ym, errors="coerce"),
+    })
+
+
+def _ranges(df: pd.DataFrame) -> dict:
+    # 값 없음 = 0 (kakao-map/app.js getPriceMan/getAreaPy와 같은 기준 → 슬라이더 전체 범위가 모든 거래를 포함)
+    span = lambda s: [float(s.min()), float(s.max())] if len(s) else [0, 0]
+    return {
+        "man": span(df["man"].fillna(0)), "py": span(df["py"].fillna(0)),
+        "yms": sorted(int(v) for v in df["ym"].dropna().unique()),
+    }
+
+
+def aggregate(df: pd.DataFrame, zoom: int) -> dict[str, dict]:
+    """한 줌의 타일별 집계 {"x/y": {"n", "c", "py", "k"}}"""
+    x, y = tile_xy(df["lng"].to_numpy(), df["lat"].to_numpy(), zoom)
+    tile = pd.Series([f"{a}/{b}" for a, b in zip(x, y)], index=df.index)
+    g = df.groupby(tile)
+    base = pd.DataFrame({"n": g.size(), "lng": g["lng"].mean(), "lat": g["lat"].mean(), "py": g["ppy"].median()})
+    kinds = df.groupby([tile, df["k"]]).size()
+    out = {}
+    for key, r in base.iterrows():
+        out[key] = {
+            "n": int(r["n"]),
+            "c": [round(r["lng"], 6), round(r["lat"], 6)],
+            "py": None if pd.isna(r["py"]) else round(float(r["py"]), 1),
+            "k": {k: int(v) for k, v in kinds[key].items()},
+        }
+    return out
+
+
+def clusters(df: pd.DataFrame) -> dict:
+    """단지 그룹 + 줌별 격자 군집 (clusters.json 내용)"""
+    kinds = list(dict.fromkeys(df["k"]))
+    kind_no = {k: i for i, k in enumerate(kinds)}
+    x, y = tile_xy(df["lng"].to_numpy(), df["lat"].to_numpy(), LEAF_ZOOM)
+    df = df.assign(tile=[f"{tx}/{ty}" for tx, ty in zip(x, y)], man=df["man"].fillna(0))
+    # 단지 그룹 = (이름, 리프 타일): 타일 하나만 받아도 그 타일 안 거래 수와 맞음
+    pos = df.groupby(["name", "tile"], sort=False)[["lng", "lat"]].mean()
+    pos = pos.assign(gi=np.arange(len(pos)))
+    per_kind = df.groupby(["name", "tile", "k"], sort=False)["man"].agg(["size", "max"])
+    per_kind = per_kind.reset_index().assign(kn=lambda t: t["k"].map(kind_no))
+
+    entries: list[list] = [[] for _ in range(len(pos))]
+    gk = per_kind.join(pos, on=["name", "tile"])
+    for gi, kn, n, mx in gk[["gi", "kn", "size", "max"]].itertuples(index=False):
+        entries[gi].append([int(kn), int(n), round(mx)])
+    groups = [
+        [name, round(lng, 6), round(lat, 6), tile, entries[gi]]
+        for (name, tile), lng, lat, gi in pos[["lng", "lat", "gi"]].itertuples()
+    ]
+
+    # 군집: 단지 그룹(kind별) 행을 셀 단위로 합침
+    lat_rad = np.radians(np.clip(gk["lat"].to_numpy(), -85.05112878, 85.05112878))
+    wx = (gk["lng"].to_numpy() + 180.0) / 360.0
+    wy = (1.0 - np.arcsinh(np.tan(lat_rad)) / math.pi) / 2.0
+    zooms = {}
+    for z in range(MIN_ZOOM, LEAF_ZOOM + 1):
+        scale = 256 * 2 ** z / CELL_PX
+        cell = pd.Series([f"{a}/{b}" for a, b in zip(np.floor(wx * scale).astype(np.int64),
+                                                      np.floor(wy * scale).astype(np.int64))], index=gk.index)
+        t = gk.assign(cell=cell, wlng=gk["lng"] * gk["size"], wlat=gk["lat"] * gk["size"])
+        by_cell = t.groupby("cell", sort=False).agg(n=("size", "sum"), wlng=("wlng", "sum"), wlat=("wlat", "sum"))
+        members = t.groupby("cell", sort=False)["gi"].unique()
+        by_kind = t.groupby(["cell", "kn"], sort=False).agg(n=("size", "sum"), mx=("max", "max"))
+        ks: dict[str, list] = {}
+        for (c, kn), n, mx in by_kind[["n", "mx"]].itertuples(name=None):
+            ks.setdefault(c, []).append([int(kn), int(n), round(mx)])
+        zooms[str(z)] = [
+            [round(r.wlng / r.n, 6), round(r.wlat / r.n, 6), c, sorted(int(i) for i in members[c]), ks[c]]
+            for c, r in by_cell.iterrows()
+        ]
+    return {"kinds": kinds, "cell": CELL_PX, "groups": groups, "zooms": zooms}
+
+# ==========================
+# 저장
+# ==========================
+def _write_json(path: Path, data: bytes) -> None:
+    """JSON + 미리 압축본(.gz, brotli 모듈이 있으면 .br) — index.json/clusters.json은 파일 수가 적어 .br도 만듦"""
+    map_export.write_atomic(path, data)
+    map_export.write_atomic(path.with_name(path.name + ".gz"), gzip.compress(data, compresslevel=9, mtime=0))
+    if map_export.brotli is not None:
+        map_export.write_atomic(path.with_name(path.name + ".br"), map_export.brotli.compress(data, quality=JSON_BROTLI_QUALITY))
+
+
+def _index_refs(out_dir: Path) -> set[str]:
+    """지금 index.json이 가리키는 out_dir 안 이름들 (예전 형식: 버전 폴더 없이 <z>/ + clusters.json)"""
+    try:
+        index = json.loads((out_dir / INDEX_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return set()
+    base = index.get("base")
+    return {base.rstrip("/")} if base else {str(index.get("leaf", LEAF_ZOOM)), CLUSTERS_NAME}
+
+
+def write_tiles(out_dir: Path, builder: map_export.CompactBuilder) -> Path:
+    """
+    out_dir(data/YYYY/tiles/<stem>)에 리프 타일(.rtc/.rtc.gz) + clusters.json + index.json 저장 → index.json 경로 반환.
+    builder: write_geojson이 모은 CompactBuilder (feature dict 없이 컬럼 값으로 분할)
+    교체: 새 버전 폴더(<out_dir>/<버전>/)에 타일·군집을 다 쓴 뒤 index.json(base = 버전 폴더)을 원자적으로 교체
+      → 읽는 쪽은 언제나 완성된 피라미드 하나를 봄. 직전 버전은 이전 index.json을 받은 클라이언트용으로 남기고 그 전 것은 삭제.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    prev = _index_refs(out_dir)
+    base = datetime.now().strftime("v%y%m%d%H%M%S%f")
+    ver_dir = out_dir / base
+    try:
+        df = frame(builder)
+        x, y = tile_xy(df["lng"].to_numpy(), df["lat"].to_numpy(), LEAF_ZOOM)
+        rows = pd.Series(np.arange(len(df))).groupby([x, y]).agg(list) if len(df) else {}
+        for (tx, ty), idx in rows.items():
+            path = ver_dir / str(LEAF_ZOOM) / str(tx) / f"{ty}{map_export.EXT}"
+            map_export.write_compact(path, builder.take(idx), br=False)  # 리프 타일은 .rtc + .gz (프런트엔드는 .gz를 받아 풂)
+
+        clusters_bytes = json.dumps(
+            clusters(df) if len(df) else {"kinds": [], "cell": CELL_PX, "groups": [], "zooms": {}},
+            ensure_ascii=False, separators=(",", ":"),
+        ).encode("utf-8")
+        ver_dir.mkdir(parents=True, exist_ok=True)
+        _write_json(ver_dir / CLUSTERS_NAME, clusters_bytes)
+
+        index = {
+            "leaf": LEAF_ZOOM,
+            "zooms": [MIN_ZOOM, LEAF_ZOOM],
+            "base": f"{base}/",
+            "count": builder.count,
+            "ranges": _ranges(df),
+            "tiles": {str(z): aggregate(df, z) if len(df) else {} for z in range(MIN_ZOOM, LEAF_ZOOM + 1)},
+            # 군집 파일 해시 → index.json 해시(manifest tiles.sha256)가 군집 변경도 반영
+            "clusters": {"path": f"{base}/{CLUSTERS_NAME}", "sha256": hashlib.sha256(clusters_bytes).hexdigest()},
+        }
+        _write_json(out_dir / INDEX_NAME, json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    except BaseException:
+        shutil.rmtree(ver_dir, ignore_errors=True)
+        raise
+
+    keep = {base, *prev} | {INDEX_NAME + ext for ext in ("", ".gz", ".br")}
+    for old in out_dir.iterdir():
+        if old.name not in keep:
+            shutil.rmtree(old, ignore_errors=True) if old.is_dir() else old.unlink(missing_ok=True)
+    shutil.rmtree(out_dir.with_name(out_dir.name + ".tmp"), ignore_errors=True)  # 예전 방식(임시 폴더 → 통째 교체)의 잔여물
+    return out_dir / INDEX_NAME
+
+# ==========================
+# CLI: 기존 GeoJSON → 타일
+# ==========================
+def main(argv: list[str]) -> None:
+    if not argv:
+        print("사용법: python map_tiles.py <파일.geojson> [...]")
+        return
+    for arg in argv:
+        src = Path(arg)
+        features = json.loads(src.read_text(encoding="utf-8")).get("features", [])
+        index_path = write_tiles(tiles_dir_for(src), map_export.CompactBuilder().add(features))
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+        print(f"[✓] {src.name} → {index_path.parent} (features={len(features)}, "
+              f"leaf tiles={len(index['tiles'][str(LEAF_ZOOM)])})")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,155 @@
+# parcel_index.py
+# 오프라인 지오코딩 색인 — 이미 받아 둔 좌표(geocode_store)로 근처 지번 좌표 추정
+# - 그룹(법정동 또는 도로) 단위로 [산 여부, 본번, 부번] 정렬 목록 → 좌표
+#     "서울특별시 강남구 개포동 1163-4" → 그룹 "강남구 개포동", 번지 (0, 1163, 4)
+#     시도 접두어는 그룹에서 빼서 예전 캐시 키("강남구 개포동 1163-4")와 같은 그룹으로 묶음
+# - 조회: 같은 번지 → 그대로, 없으면 앞뒤 번지로 보간
+#     같은 본번 안(부번 차이) → 부번 기준 선형 보간 / 한쪽만 있으면 그 좌표
+#     본번이 다르면 MAX_BON_GAP 이내일 때만, 두 이웃이 MAX_SPAN_M 이내로 가까울 때만 보간
+# - 선택: 도로명주소 DB 추출본(CSV)을 추가로 읽어 정확한 번지/건물번호 좌표로 사용
+#     컬럼: 시도, 시군구, 법정동, 본번, 부번, 도로명, 건물본번, 건물부번, lat, lng (없는 컬럼은 건너뜀)
+#     (도로명주소 위치정보 DB의 UTM-K 좌표는 미리 WGS84 lat/lng로 변환해 둘 것)
+#
+# 사용 예)
+#   idx = ParcelIndex.from_store(store)
+#   idx.load_road_db(Path("road_db.csv"))
+#   idx.lookup("서울특별시 강남구 개포동 1163-6")   → (lat, lng, "interp") 또는 None
+
+from __future__ import annotations
+
+import math
+import re
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+
+MAX_BON_GAP = 3       # 본번이 다를 때 보간 허용 차이
+MAX_SPAN_M = 400.0    # 보간에 쓰는 두 이웃 사이 최대 거리(m) — 더 멀면 번지 체계가 끊긴 것으로 봄
+
+_SIDO_RE = re.compile(r"^\S+(?:특별시|광역시|특별자치시|특별자치도|도)\s+")
+_GROUP_END_RE = re.compile(r"\s\S*(?:동|가|리|로|길)$")
+_KEY_RE = re.compile(r"^(?P<group>.+?)\s+(?P<san>산\s*)?0*(?P<bon>\d+)(?:-0*(?P<bu>\d+))?$")
+
+Lot = tuple[int, int, int]  # (산 여부, 본번, 부번)
+
+
+def split_key(key: str) -> tuple[str, Lot] | None:
+    """주소 키 → (그룹, 번지). 번지로 끝나지 않으면 None"""
+    m = _KEY_RE.match(" ".join(str(key).split()))
+    if not m:
+        return None
+    group = _SIDO_RE.sub("", m["group"])
+    if not _GROUP_END_RE.search(group):
+        return None  # "강남구 12"처럼 법정동/도로 없이 번호만 있으면 위치를 특정할 수 없음
+    return group, (1 if m["san"] else 0, int(m["bon"]), int(m["bu"] or 0))
+
+
+def _distance_m(a: tuple[float, float], b: tuple[float, float]) -> float:
+    lat = math.radians((a[0] + b[0]) / 2)
+    dy = (a[0] - b[0]) * 111_320.0
+    dx = (a[1] - b[1]) * 111_320.0 * math.cos(lat)
+    return math.hypot(dx, dy)
+
+
+class ParcelIndex:
+    """그룹별 정렬 번지 목록 → 좌표 (정확 일치 + 근처 번지 보간)"""
+
+    def __init__(self):
+        self._groups: dict[str, tuple[list[Lot], list[tuple[float, float]]]] = {}
+        self._pending: dict[str, dict[Lot, tuple[float, float]]] = {}
+
+    def __len__(self) -> int:
+        self._build()
+        return sum(len(lots) for lots, _ in self._groups.values())
+
+    def copy(self) -> "ParcelIndex":
+        self._build()
+        out = ParcelIndex()
+        out._groups = {g: (list(lots), list(coords)) for g, (lots, coords) in self._groups.items()}
+        return out
+
+    # ── 구축 ──
+    def add(self, key: str, lat: float | None, lng: float | None) -> bool:
+        """주소 키 1건 추가 (좌표 없음/번지 아님 → False). 같은 번지는 나중 값 우선"""
+        if lat is None or lng is None:
+            return False
+        parsed = split_key(key)
+        if parsed is None:
+            return False
+        group, lot = parsed
+        self._pending.setdefault(group, {})[lot] = (float(lat), float(lng))
+        return True
+
+    def add_many(self, rows: Iterable[tuple[str, list[float | None]]]) -> int:
+        return sum(self.add(k, *v[:2]) for k, v in rows)
+
+    @classmethod
+    def from_store(cls, store) -> "ParcelIndex":
+        """GeocodeStore(또는 {주소: [lat, lng]} dict)의 좌표 있는 번지 항목으로 색인"""
+        idx = cls()
+        idx.add_many(store.items())
+        return idx
+
+    def load_road_db(self, path: Path) -> int:
+        """도로명주소 DB 추출본(CSV, UTF-8) → 지번/건물번호 항목 추가. 반환: 추가한 항목 수"""
+        df = pd.read_csv(path, dtype=str, encoding="utf-8-sig").fillna("")
+        for c in ("시도", "시군구", "법정동", "본번", "부번", "도로명", "건물본번", "건물부번"):
+            if c not in df.columns:
+                df[c] = ""
+        n = 0
+        for r in df.itertuples(index=False):
+            lat, lng = pd.to_numeric(r.lat, errors="coerce"), pd.to_numeric(r.lng, errors="coerce")
+            if pd.isna(lat) or pd.isna(lng):
+                continue
+            area = f"{r.시도} {r.시군구}".strip()
+            if r.법정동 and r.본번:
+                n += self.add(f"{area} {r.법정동} {r.본번}-{r.부번 or 0}", lat, lng)
+            if r.도로명 and r.건물본번:
+                n += self.add(f"{area} {r.도로명} {r.건물본번}-{r.건물부번 or 0}", lat, lng)
+        return n
+
+    def _build(self) -> None:
+        for group, entries in self._pending.items():
+            if group in self._groups:
+                lots, coords = self._groups[group]
+                entries = {**dict(zip(lots, coords)), **entries}
+            lots = sorted(entries)
+            self._groups[group] = (lots, [entries[lot] for lot in lots])
+        self._pending.clear()
+
+    # ── 조회 ──
+    def lookup(self, key: str) -> tuple[float, float, str] | None:
+        """
+        주소 키 → (lat, lng, 방법). 방법: "exact" / "interp"(앞뒤 번지 보간) / "nearest"(같은 본번 한쪽 이웃)
+        추정할 수 없으면 None
+        """
+        self._build()
+        parsed = split_key(key)
+        if parsed is None or parsed[0] not in self._groups:
+            return None
+        group, lot = parsed
+        lots, coords = self._groups[group]
+        i = bisect_left(lots, lot)
+        if i < len(lots) and lots[i] == lot:
+            return (*coords[i], "exact")
+
+        lo = i - 1 if i > 0 and lots[i - 1][0] == lot[0] else None
+        hi = i if i < len(lots) and lots[i][0] == lot[0] else None
+        same_lo = lo is not None and lots[lo][1] == lot[1]
+        same_hi = hi is not None and lots[hi][1] == lot[1]
+
+        def near(j: int | None) -> bool:
+            return j is not None and abs(lots[j][1] - lot[1]) <= MAX_BON_GAP
+
+        if near(lo) and near(hi) and (same_lo == same_hi):
+            a, b = coords[lo], coords[hi]
+            if _distance_m(a, b) <= MAX_SPAN_M:
+                pos = lambda x: x[1] * 10_000 + x[2]  # 본번 → 부번 순 위치
+                t = (pos(lot) - pos(lots[lo])) / (pos(lots[hi]) - pos(lots[lo]))
+                return a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t, "interp"
+        if same_lo or same_hi:
+            j = lo if same_lo and (not same_hi or lot[2] - lots[lo][2] <= lots[hi][2] - lot[2]) else hi
+            return (*coords[j], "nearest")
+        return None
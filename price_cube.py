@@ -0,0 +1,252 @@
+# price_cube.py
+# 가격 집계 큐브 — 월별 원자료(land.py 시트)를 (지역, 단지, 주택유형, 거래유형, 계약년월)별 통계로 미리 계산
+# - 키: 시도, 구/시, 법정동, 단지, 주택유형, 거래유형(매매/전세/월세), 계약년월
+#     지역 위 수준은 "*"로 합친 행도 함께 저장(ROLLUP): 단지 → 법정동 → 구/시 → 시도 → 전체
+#     (중앙값/분위수는 아래 수준을 다시 합쳐 계산할 수 없으므로 수준마다 원자료에서 계산)
+#     단지: 단지명/건물명 (없으면 "" — 단독다가구 등은 법정동 이상 수준에서만 의미 있음)
+#     전월세 시트: 월세 > 0 → 월세, 아니면 전세
+# - 통계: n(건수), ppy25/ppy50/ppy75(평당가 25/50/75%, 만원/평 — 매매 = 거래금액, 전세·월세 = 보증금),
+#         price50(가격 중앙값, 만원), dep25/dep50/dep75(보증금, 전세·월세만), rent50(월세 중앙값, 월세만),
+#         area50(전용면적 중앙값, 평)
+# - 파일(data/cube/): 연도별로 나눈 작은 JSON(+ .gz) — 필요한 것만 받음
+#     _regions_<YYYY>.json           구/시·시도·전체 수준 (지역 추이 비교용)
+#     <시도>_<구/시>_<YYYY>.json     그 구/시의 단지·법정동 수준 (예: 경기도_성남시_분당구_2025.json)
+#     index.json                     {"columns", "months": {YYYYMM: 원자료 버전}, "files": {이름: {path, rows, sha256}}}
+#     각 파일: {"columns": [...], "rows": [[...], ...]}
+# - 증분 갱신: 한 달을 다시 받으면 그 연도 파일에서 그 달 행만 교체 (다른 달 원자료는 다시 읽지 않음)
+#     land.py가 달을 저장할 때마다 호출, index.json의 버전이 데이터셋과 같은 달은 CLI에서도 건너뜀
+#
+# 사용 예)
+#   python price_cube.py                         → data/dataset의 모든 달 중 바뀐 달만 data/cube에 반영
+#   python price_cube.py --months 202510 202511 --force
+#   python price_cube.py --xlsx data/2025/실거래_202511_v2511300150.xlsx   (Parquet 데이터셋이 없을 때)
+#   분석: 분당구 아파트 매매 평당가 중앙값 추이
+#     df = price_cube.load("data/cube")                      (구/시 이상 수준, 단지·법정동은 load(.., "경기도_성남시_분당구"))
+#     df[(df["구/시"] == "성남시 분당구") & (df["주택유형"] == "아파트") & (df["거래유형"] == "매매")][["계약년월", "ppy50"]]
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import dataset
+import map_export
+
+DEFAULT_DIR = Path("data") / "cube"
+INDEX_NAME = "index.json"
+REGIONS_NAME = "_regions"
+PYEONG = 3.3058
+ALL = "*"  # ROLLUP으로 합친 수준
+
+REGION_KEYS = ["시도", "구/시", "법정동", "단지"]
+KEYS = [*REGION_KEYS, "주택유형", "거래유형", "계약년월"]
+STATS = ["n", "ppy25", "ppy50", "ppy75", "price50", "dep25", "dep50", "dep75", "rent50", "area50"]
+COLUMNS = KEYS + STATS
+FLOAT_STATS = ("ppy25", "ppy50", "ppy75", "area50")
+
+
+def log(msg: str):  print(f"[i] {msg}")
+def warn(msg: str): print(f"[!] {msg}")
+
+# ==========================
+# 원자료 → 정규화 행
+# ==========================
+def normalize(sheets: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """{시트명("아파트_매매" 등): land.py FINAL_COLS DataFrame} → 키 + 가격/면적 컬럼"""
+    frames = []
+    for sheet, df in sheets.items():
+        if df is None or df.empty:
+            continue
+        htype, _, deal = sheet.partition("_")
+        col = lambda c: df[c] if c in df.columns else pd.Series(pd.NA, index=df.index, dtype=object)
+        text = lambda c: col(c).astype("string").fillna("").str.strip()
+        monthly = pd.to_numeric(col("월세"), errors="coerce")
+        if deal == "전월세":
+            kind = pd.Series(np.where(monthly.fillna(0) > 0, "월세", "전세"), index=df.index)
+        else:
+            kind = pd.Series(deal or "기타", index=df.index)
+        price = pd.to_numeric(col("거래금액") if deal == "매매" else col("보증금"), errors="coerce")
+        py = pd.to_numeric(col("전용면적"), errors="coerce") / PYEONG
+        ym = text("계약년월").str[:6]
+        ym = ym.where(ym != "", text("년").str.zfill(4) + text("월").str.zfill(2))
+        frames.append(pd.DataFrame({
+            "시도": text("시/도"), "구/시": text("구/시"), "법정동": text("법정동"), "단지": text("단지명/건물명"),
+            "주택유형": htype, "거래유형": kind, "계약년월": ym,
+            "price": price,
+            "ppy": price / py.where(py > 0),
+            "dep": price.where(kind != "매매"),
+            "rent": monthly.where(kind == "월세"),
+            "py": py,
+        }))
+    if not frames:
+        return pd.DataFrame(columns=[*KEYS, "price", "ppy", "dep", "rent", "py"])
+    rows = pd.concat(frames, ignore_index=True)
+    return rows[rows["계약년월"].str.fullmatch(r"\d{6}")]
+
+# ==========================
+# 집계
+# ==========================
+def _stats(rows: pd.DataFrame) -> pd.DataFrame:
+    g = rows.groupby(KEYS, sort=False)
+    q = lambda c, qs: g[c].quantile(qs).unstack() if len(rows) else pd.DataFrame(columns=qs)
+    ppy, dep = q("ppy", [0.25, 0.5, 0.75]), q("dep", [0.25, 0.5, 0.75])
+    out = pd.DataFrame({
+        "n": g.size(),
+        "ppy25": ppy[0.25], "ppy50": ppy[0.5], "ppy75": ppy[0.75],
+        "price50": g["price"].median(),
+        "dep25": dep[0.25], "dep50": dep[0.5], "dep75": dep[0.75],
+        "rent50": g["rent"].median(),
+        "area50": g["py"].median(),
+    })
+    return out.reset_index()
+
+
+def build(rows: pd.DataFrame) -> pd.DataFrame:
+    """정규화 행 → 큐브(지역 ROLLUP 전 수준), 키 순 정렬"""
+    levels = []
+    for depth in range(len(REGION_KEYS), -1, -1):  # 단지 → 법정동 → 구/시 → 시도 → 전체
+        level = rows.copy()
+        level[REGION_KEYS[depth:]] = ALL
+        levels.append(_stats(level))
+    cube = pd.concat(levels, ignore_index=True)
+    for c in STATS[1:]:
+        cube[c] = cube[c].astype(float).round(1 if c in FLOAT_STATS else 0)
+    return cube[COLUMNS].sort_values(KEYS, ignore_index=True)
+
+# ==========================
+# 파일
+# ==========================
+def region_name(sido: str, gu: str) -> str:
+    """(시도, 구/시) → 파일 이름 앞부분 (공백은 _ : "경기도_성남시_분당구")"""
+    name = "_".join(x for x in (sido, gu) if x) or "기타"
+    return re.sub(r"[\s/\\]+", "_", name)
+
+
+def split_files(cube: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """큐브 → {파일 이름: 행} (구/시 이상 수준은 _regions_<연도>, 나머지는 <시도>_<구/시>_<연도>)"""
+    year = cube["계약년월"].str[:4]
+    top = cube["법정동"] == ALL
+    out = {f"{REGIONS_NAME}_{y}": part for y, part in cube[top].groupby(year[top], sort=True)}
+    detail = cube[~top]
+    for (sido, gu, y), part in detail.groupby([detail["시도"], detail["구/시"], year[~top]], sort=True):
+        out[f"{region_name(sido, gu)}_{y}"] = part
+    return out
+
+
+def _read(path: Path) -> pd.DataFrame:
+    if not path.exists():
+        return pd.DataFrame(columns=COLUMNS)
+    body = json.loads(path.read_text(encoding="utf-8"))
+    return pd.DataFrame(body["rows"], columns=body["columns"])
+
+
+def _write(path: Path, rows: pd.DataFrame) -> dict:
+    cols = [rows[c].astype(str).tolist() for c in KEYS]
+    for c in STATS:  # 건수/금액은 정수, 평당가/면적은 소수 1자리, 값 없음 → null
+        conv = float if c in FLOAT_STATS else int
+        cols.append([None if pd.isna(v) else conv(v) for v in rows[c]])
+    values = [list(r) for r in zip(*cols)]
+    body = json.dumps({"columns": COLUMNS, "rows": values}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    map_export.write_atomic(path, body)
+    map_export.write_atomic(path.with_name(path.name + ".gz"), gzip.compress(body, compresslevel=9, mtime=0))
+    return {"path": path.name, "rows": len(values), "sha256": hashlib.sha256(body).hexdigest()}
+
+
+def load_index(cube_dir: Path) -> dict:
+    try:
+        return json.loads((Path(cube_dir) / INDEX_NAME).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {"columns": COLUMNS, "months": {}, "files": {}}
+
+
+def update_month(cube_dir: Path, ym: str, sheets: dict[str, pd.DataFrame], version: str | None = None) -> dict:
+    """
+    한 달 원자료 → 큐브 파일에서 그 달(계약년월 = ym, 그리고 새 자료에 나온 계약년월) 행만 교체.
+    그 연도 파일만 읽고 다시 씀(다른 연도 파일은 건드리지 않음) + index.json 갱신. 반환: index
+    """
+    cube_dir = Path(cube_dir)
+    cube_dir.mkdir(parents=True, exist_ok=True)
+    cube = build(normalize(sheets))
+    months = {ym, *cube["계약년월"].unique()}
+    years = {m[:4] for m in months}
+    index = load_index(cube_dir)
+    new = split_files(cube)
+
+    for name in sorted({n for n in index["files"] if n[-4:] in years} | set(new)):
+        path = cube_dir / f"{name}.json"
+        old = _read(path)
+        keep = old[~old["계약년월"].astype(str).isin(months)]
+        if name not in new and len(keep) == len(old):
+            continue  # 이 달 행이 없던 파일
+        rows = pd.concat([keep, new[name]], ignore_index=True) if name in new else keep
+        if rows.empty:
+            path.unlink(missing_ok=True)
+            path.with_name(path.name + ".gz").unlink(missing_ok=True)
+            index["files"].pop(name, None)
+            continue
+        index["files"][name] = _write(path, rows.sort_values(KEYS, ignore_index=True))
+
+    index["columns"] = COLUMNS
+    index["months"][ym] = version
+    index["months"] = dict(sorted(index["months"].items()))
+    index["files"] = dict(sorted(index["files"].items()))
+    map_export.write_atomic(cube_dir / INDEX_NAME,
+                            json.dumps(index, ensure_ascii=False, indent=2).encode("utf-8"))
+    log(f"큐브 갱신: {ym} → {cube_dir} (행={len(cube):,}, 파일={len(new)}개)")
+    return index
+
+
+def load(cube_dir: Path = DEFAULT_DIR, region: str = REGIONS_NAME, years: list[str] | None = None) -> pd.DataFrame:
+    """큐브 파일들 → DataFrame (region: "_regions" 또는 "<시도>_<구/시>", years: 연도 목록, 없으면 전체)"""
+    cube_dir = Path(cube_dir)
+    names = [n for n in load_index(cube_dir)["files"]
+             if n[:-5] == region and (years is None or n[-4:] in years)]
+    frames = [_read(cube_dir / f"{n}.json") for n in names]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=COLUMNS)
+
+# ==========================
+# CLI
+# ==========================
+def main() -> None:
+    ap = argparse.ArgumentParser(description="가격 집계 큐브(data/cube) 증분 갱신")
+    ap.add_argument("--root", default=str(dataset.DEFAULT_ROOT), help=f"Parquet 데이터셋 루트(기본: {dataset.DEFAULT_ROOT})")
+    ap.add_argument("--out", default=str(DEFAULT_DIR), help=f"큐브 폴더(기본: {DEFAULT_DIR})")
+    ap.add_argument("--months", nargs="*", help="처리할 월(YYYYMM). 지정 없으면 데이터셋 전체")
+    ap.add_argument("--force", action="store_true", help="버전이 같아도 다시 계산")
+    ap.add_argument("--xlsx", nargs="*", help="데이터셋 대신 land.py 엑셀(실거래_YYYYMM_v….xlsx)에서 계산")
+    args = ap.parse_args()
+    out = Path(args.out)
+
+    if args.xlsx:
+        for p in map(Path, args.xlsx):
+            m = re.search(r"_(\d{6})_(v\d{10})", p.stem)
+            if not m:
+                warn(f"파일명에서 월/버전을 찾을 수 없음: {p.name}")
+                continue
+            update_month(out, m.group(1), pd.read_excel(p, sheet_name=None, dtype={"계약년월": str}), m.group(2))
+        return
+
+    if not dataset.available():
+        warn("pyarrow가 없어 데이터셋을 읽을 수 없습니다 (--xlsx 사용 또는 pip install pyarrow)")
+        return
+    root = Path(args.root)
+    done = load_index(out)["months"]
+    for ym in args.months or dataset.list_months(root, dataset.TRADES):
+        version = dataset.month_version(root, dataset.TRADES, ym)
+        if version is None:
+            warn(f"{ym}: 데이터셋에 없음 → 건너뜀")
+            continue
+        if not args.force and done.get(ym) == version:
+            continue
+        update_month(out, ym, dataset.read_month(root, dataset.TRADES, ym), version)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+# query_server.py
+# 로컬 거래 조회 API — manifest.json의 월별 GeoJSON → SQLite(인덱스) → HTTP(JSON) 조회
+# - 브라우저가 월별 파일 전체를 받아 JS로 거르는 대신, 화면(bbox) + 필터에 맞는 행만 페이지 단위로 받음
+# - DB: data/query.sqlite
+#     sources: manifest 항목(GeoJSON)별 sha256 → build는 바뀐/새 달만 다시 적재, manifest에서 빠진 달은 삭제
+#     trades: 거래 1건 = 1행 (ym, 주택유형, 거래구분, 구/시, 법정동, 단지, 위치, 가격, 면적 + 원본 속성 JSON)
+#       거래구분: 매매/전세/월세/기타 (전월세 시트는 월세 > 0 → 월세, 아니면 전세)
+#       가격(man, 만원): 매매 = 거래금액, 그 외 = 보증금 / 면적(py): 전용면적(평)
+#     인덱스: ym, (구/시, 법정동, ym), (단지, ym), (거래구분, 가격), 면적, 위치 R*Tree(trades_rtree)
+# - 엔드포인트 (GET, JSON, CORS 허용)
+#     /api/months                         → [{month, path, count, sha256}]
+#     /api/trades?bbox=서,남,동,북&...      → GeoJSON FeatureCollection + "next"(다음 페이지 cursor, 마지막이면 null)
+#     /api/groups?bbox=서,남,동,북&...      → 단지별 {gu, dong, name, lng, lat, count, max} (건수 많은 순)
+#   공통 필터: htype=아파트,연립다세대  deal=매매,전세  ym_from=202501  ym_to=202512
+#              (htype= / deal= / source= 처럼 값 없이 주면 아무것도 고르지 않은 것 → 0건)
+#              price_min/price_max(만원)  area_min/area_max(평)  gu=강남구  dong=개포동  name=단지명
+#              source=manifest path(들) — 지도에서 고른 달만
+#   페이지: limit(기본 500, 최대 5000), cursor(앞 페이지의 next — id 기준 keyset, 뒤 페이지도 O(limit))
+#
+# 사용 예)
+#   python query_server.py build                     → data/manifest.json 기준으로 data/query.sqlite 갱신
+#   python query_server.py serve --port 8765         → http://127.0.0.1:8765/api/trades?bbox=127.0,37.4,127.1,37.5&deal=매매
+#   (serve는 시작할 때 build를 한 번 실행, --no-build로 생략)
+#   data/index.html?api=http://127.0.0.1:8765   → 지도가 월별 파일 대신 화면 안 거래만 API로 받음
+
+from __future__ import annotations
+
+import argparse
+import json
+import queue
+import sqlite3
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import dataset
+
+DB_NAME = "query.sqlite"
+MANIFEST_NAME = "manifest.json"
+PYEONG = 3.3058
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 5000
+RTREE_MAX_SHARE = 0.05  # bbox 거래가 전체의 이 비율 이하일 때만 R*Tree 사용
+POOL_SIZE = 8  # serve: 읽기 전용 연결 수 (요청마다 빌려 쓰고 반납)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    id        INTEGER PRIMARY KEY,
+    path      TEXT UNIQUE NOT NULL,
+    month     TEXT,
+    sha256    TEXT,
+    count     INTEGER,
+    loaded_at TEXT
+);
+CREATE TABLE IF NOT EXISTS trades (
+    id     INTEGER PRIMARY KEY,
+    source INTEGER NOT NULL,
+    ym     INTEGER,
+    htype  TEXT,
+    deal   TEXT,
+    gu     TEXT,
+    dong   TEXT,
+    name   TEXT,
+    lng    REAL,
+    lat    REAL,
+    man    REAL,
+    py     REAL,
+    props  TEXT
+);
+CREATE INDEX IF NOT EXISTS trades_source ON trades(source);
+CREATE INDEX IF NOT EXISTS trades_ym ON trades(ym);
+CREATE INDEX IF NOT EXISTS trades_region ON trades(gu, dong, ym);
+CREATE INDEX IF NOT EXISTS trades_name ON trades(name, ym);
+CREATE INDEX IF NOT EXISTS trades_deal_man ON trades(deal, man);
+CREATE INDEX IF NOT EXISTS trades_py ON trades(py);
+CREATE VIRTUAL TABLE IF NOT EXISTS trades_rtree USING rtree(id, min_lng, max_lng, min_lat, max_lat);
+"""
+
+_INSERT = (
+    "INSERT INTO trades (source, ym, htype, deal, gu, dong, name, lng, lat, man, py, props) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def log(msg: str):  print(f"[i] {msg}")
+def warn(msg: str): print(f"[!] {msg}")
+
+
+def connect(db_path: Path, readonly: bool = False) -> sqlite3.Connection:
+    if readonly:
+        conn = sqlite3.connect(f"file:{Path(db_path).resolve()}?mode=ro", uri=True, check_same_thread=False)
+    else:
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+    return conn
+
+# ==========================
+# 적재 (manifest → SQLite)
+# ==========================
+def _num(v) -> float | None:
+    try:
+        x = float(v)
+    except (TypeError, ValueError):
+        return None
+    return x if x == x else None
+
+
+def trade_row(source_id: int, feature: dict) -> tuple:
+    """GeoJSON feature → trades 행"""
+    p = feature.get("properties") or {}
+    lng, lat = feature["geometry"]["coordinates"][:2]
+    deal = p.get("거래유형") or "기타"
+    if deal == "전월세":
+        deal = "월세" if (_num(p.get("월세")) or 0) > 0 else "전세"
+    man = _num(p.get("거래금액") if deal == "매매" else p.get("보증금"))
+    area = _num(p.get("전용면적"))
+    ym = str(p.get("계약년월") or "")[:6]
+    if p.get("년") and p.get("월"):
+        ym = f"{str(p['년']).zfill(4)}{str(p['월']).zfill(2)}"
+    name = next((str(p[k]).strip() for k in ("단지명/건물명", "건물명", "단지명", "주소") if p.get(k)), "미상")
+    return (
+        source_id, int(ym) if ym.isdigit() else None, p.get("주택유형"), deal, p.get("구/시"), p.get("법정동"),
+        name, lng, lat, man, area / PYEONG if area else None,
+        json.dumps(p, ensure_ascii=False, separators=(",", ":")),
+    )
+
+
+def _load_source(conn: sqlite3.Connection, source_id: int, path: Path) -> int:
+    features = json.loads(path.read_text(encoding="utf-8")).get("features", [])
+    conn.executemany(_INSERT, (trade_row(source_id, f) for f in features))
+    conn.execute(
+        "INSERT INTO trades_rtree (id, min_lng, max_lng, min_lat, max_lat) "
+        "SELECT id, lng, lng, lat, lat FROM trades WHERE source = ?", (source_id,),
+    )
+    return len(features)
+
+
+def _drop_source(conn: sqlite3.Connection, source_id: int) -> None:
+    conn.execute("DELETE FROM trades_rtree WHERE id IN (SELECT id FROM trades WHERE source = ?)", (source_id,))
+    conn.execute("DELETE FROM trades WHERE source = ?", (source_id,))
+    conn.execute("DELETE FROM sources WHERE id = ?", (source_id,))
+
+
+def build(data_root: Path, db_path: Path | None = None) -> dict:
+    """
+    data/manifest.json의 항목과 DB를 맞춤: sha256이 바뀐/새 항목만 다시 적재, 빠진 항목 삭제.
+    항목 하나 = 트랜잭션 하나(중간에 멈춰도 적재된 달은 온전함). 반환: {"loaded", "dropped", "kept"}
+    """
+    data_root = Path(data_root)
+    db_path = Path(db_path) if db_path else data_root / DB_NAME
+    manifest = json.loads((data_root / MANIFEST_NAME).read_text(encoding="utf-8"))
+    kakao_map_dir = data_root.parent / "kakao-map"  # manifest 경로 기준
+
+    conn = connect(db_path)
+    have = {path: (sid, sha) for sid, path, sha in conn.execute("SELECT id, path, sha256 FROM sources")}
+    wanted = {item["path"]: item for item in manifest}
+    stats = {"loaded": 0, "dropped": 0, "kept": 0}
+
+    for path, (sid, _) in have.items():
+        if path not in wanted:
+            with conn:
+                _drop_source(conn, sid)
+            stats["dropped"] += 1
+            log(f"삭제: {path}")
+
+    for path, item in wanted.items():
+        sid, sha = have.get(path, (None, None))
+        if sid is not None and item.get("sha256") and sha == item["sha256"]:
+            stats["kept"] += 1
+            continue
+        src = (kakao_map_dir / path).resolve()
+        if not src.exists():
+            warn(f"GeoJSON 없음, 건너뜀: {src}")
+            continue
+        t0 = time.perf_counter()
+        with conn:
+            if sid is not None:
+                _drop_source(conn, sid)
+            cur = conn.execute(
+                "INSERT INTO sources (path, month, sha256, loaded_at) VALUES (?, ?, ?, datetime('now'))",
+                (path, item.get("month"), item.get("sha256")),
+            )
+            n = _load_source(conn, cur.lastrowid, src)
+            conn.execute("UPDATE sources SET count = ? WHERE id = ?", (n, cur.lastrowid))
+        stats["loaded"] += 1
+        log(f"적재: {item.get('label', path)} ({n}건, {time.perf_counter() - t0:.2f}s)")
+
+    conn.execute("ANALYZE")  # 인덱스 선택용 통계(적은 달/큰 bbox에서 잘못된 인덱스를 고르지 않게)
+    conn.close()
+    log(f"query DB 갱신 → {db_path} ({stats})")
+    return stats
+
+# ==========================
+# 조회
+# ==========================
+def _csv(qs: dict, key: str) -> list[str]:
+    return [v for raw in qs.get(key, []) for v in raw.split(",") if v]
+
+
+# 값 없이 주면(htype=) 전부가 아니라 0건 — 지도에서 체크를 모두 끈 상태
+_EMPTY_MATCHES_NONE = {"htype", "deal", "source"}
+
+
+def _float(qs: dict, key: str) -> float | None:
+    if not qs.get(key) or qs[key][0] == "":
+        return None
+    try:
+        return float(qs[key][0])
+    except ValueError:
+        raise ValueError(f"{key}: 숫자가 아님 ({qs[key][0]!r})") from None
+
+
+def _bbox_selective(conn: sqlite3.Connection | None, box: list[float]) -> bool:
+    """bbox에 드는 거래가 전체의 RTREE_MAX_SHARE 이하면 True (R*Tree로 좁히는 게 이득)
+
+    넓은 화면이면 R*Tree 결과 전체를 id로 정렬하느라 느려지므로(35만 건 기준 0.7초)
+    그때는 id 순으로 훑으며 lng/lat 범위만 검사하는 편이 limit에서 바로 끝남
+    """
+    if conn is None:
+        return True
+    total = conn.execute("SELECT COALESCE(SUM(count), 0) FROM sources").fetchone()[0]  # 적재 때 센 행 수
+    cap = int(total * RTREE_MAX_SHARE)
+    hits = conn.execute(
+        "SELECT COUNT(*) FROM (SELECT 1 FROM trades_rtree "
+        "WHERE min_lng >= ? AND max_lng <= ? AND min_lat >= ? AND max_lat <= ? LIMIT ?)", (*box, cap + 1)
+    ).fetchone()[0]  # cap을 넘는지만 보면 됨 — 넓은 화면에서 전부 세지 않음
+    return hits <= cap
+
+
+def where_clause(qs: dict, conn: sqlite3.Connection | None = None) -> tuple[str, list]:
+    """쿼리 파라미터 → (trades t 에 대한 WHERE 절, 바인드 값). 잘못된 값이면 ValueError
+
+    conn을 주면 bbox 선택도를 보고 R*Tree / 좌표 범위 중 빠른 쪽을 고름
+    """
+    clauses, args = [], []
+    if qs.get("bbox"):
+        parts = qs["bbox"][0].split(",")
+        if len(parts) != 4:
+            raise ValueError("bbox: 서,남,동,북 네 값이 필요")
+        try:
+            west, south, east, north = map(float, parts)
+        except ValueError:
+            raise ValueError(f"bbox: 숫자가 아님 ({qs['bbox'][0]!r})") from None
+        box = [west, east, south, north]
+        if _bbox_selective(conn, box):
+            clauses.append("t.id IN (SELECT id FROM trades_rtree "
+                           "WHERE min_lng >= ? AND max_lng <= ? AND min_lat >= ? AND max_lat <= ?)")
+        else:
+            clauses.append("t.lng >= ? AND t.lng <= ? AND t.lat >= ? AND t.lat <= ?")
+        args += box
+    for key, col in (("htype", "htype"), ("deal", "deal"), ("gu", "gu"), ("dong", "dong"), ("name", "name")):
+        vals = _csv(qs, key)
+        if vals:
+            clauses.append(f"t.{col} IN ({','.join('?' * len(vals))})")
+            args += vals
+        elif key in qs and key in _EMPTY_MATCHES_NONE:
+            clauses.append("0")
+    sources = _csv(qs, "source")
+    if sources:
+        clauses.append(f"t.source IN (SELECT id FROM sources WHERE path IN ({','.join('?' * len(sources))}))")
+        args += sources
+    elif "source" in qs:
+        clauses.append("0")
+    for key, col, op in (("ym_from", "ym", ">="), ("ym_to", "ym", "<="),
+                         ("price_min", "man", ">="), ("price_max", "man", "<="),
+                         ("area_min", "py", ">="), ("area_max", "py", "<=")):
+        v = _float(qs, key)
+        if v is not None:
+            clauses.append(f"t.{col} {op} ?")
+            args.append(v)
+    return " AND ".join(clauses) or "1", args
+
+
+def _limit(qs: dict) -> int:
+    v = _float(qs, "limit")
+    return DEFAULT_LIMIT if v is None else max(1, min(MAX_LIMIT, int(v)))
+
+
+def query_trades(conn: sqlite3.Connection, qs: dict) -> dict:
+    """bbox + 필터 → FeatureCollection 한 페이지 (id 오름차순, next = 다음 cursor)"""
+    where, args = where_clause(qs, conn)
+    cursor = _float(qs, "cursor")
+    if cursor is not None:
+        where += " AND t.id > ?"
+        args.append(int(cursor))
+    limit = _limit(qs)
+    rows = conn.execute(
+        f"SELECT t.id, t.lng, t.lat, t.props FROM trades t WHERE {where} ORDER BY t.id LIMIT ?", (*args, limit + 1)
+    ).fetchall()
+    more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "id": i, "geometry": {"type": "Point", "coordinates": [lng, lat]},
+             "properties": json.loads(props)}
+            for i, lng, lat, props in rows
+        ],
+        "next": rows[-1][0] if more else None,
+    }
+
+
+def query_groups(conn: sqlite3.Connection, qs: dict) -> dict:
+    """
+    bbox + 필터 → 단지별 건수/최고가(만원)/위치(거래 좌표 평균), 건수 많은 순 limit개
+    단지 = (구, 동, 단지명) — 다른 동의 같은 이름 단지는 따로 집계
+    """
+    where, args = where_clause(qs, conn)
+    rows = conn.execute(
+        f"SELECT t.gu, t.dong, t.name, MAX(t.man), AVG(t.lng), AVG(t.lat), COUNT(*) AS n FROM trades t WHERE {where} "
+        f"GROUP BY t.gu, t.dong, t.name ORDER BY n DESC, t.gu, t.dong, t.name LIMIT ?", (*args, _limit(qs))
+    ).fetchall()
+    return {"groups": [{"gu": gu, "dong": dong, "name": name, "max": mx, "lng": lng, "lat": lat, "count": n}
+                       for gu, dong, name, mx, lng, lat, n in rows]}
+
+
+def query_months(conn: sqlite3.Connection, qs: dict) -> list[dict]:
+    rows = conn.execute("SELECT month, path, count, sha256 FROM sources ORDER BY month, path").fetchall()
+    return [{"month": m, "path": p, "count": n, "sha256": h} for m, p, n, h in rows]
+
+# ==========================
+# HTTP
+# ==========================
+ROUTES = {"/api/trades": query_trades, "/api/groups": query_groups, "/api/months": query_months}
+
+
+class ConnectionPool:
+    """
+    읽기 전용 연결 풀 — ThreadingHTTPServer는 요청마다 새 스레드라 스레드별 연결은 재사용되지 않음.
+    빌린 연결은 with 블록이 끝나면 반납, 풀이 비어 있으면 새로 열고 size개까지만 보관.
+    """
+
+    def __init__(self, db_path: Path, size: int = POOL_SIZE):
+        self.db_path = Path(db_path)
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(maxsize=max(1, size))
+
+    def get(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return connect(self.db_path, readonly=True)
+
+    def put(self, conn: sqlite3.Connection) -> None:
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    pool: ConnectionPool  # serve()에서 지정
+
+    def _send(self, status: int, body) -> None:
+        data = json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        route = ROUTES.get(url.path.rstrip("/"))
+        if route is None:
+            self._send(404, {"error": f"없는 경로: {url.path}", "routes": sorted(ROUTES)})
+            return
+        conn = None
+        try:
+            t0 = time.perf_counter()
+            conn = self.pool.get()
+            body = route(conn, parse_qs(url.query, keep_blank_values=True))
+            self.log_message("%s %.1fms", url.path, (time.perf_counter() - t0) * 1000)
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+            return
+        except sqlite3.Error as e:  # DB 없음/잠김/손상 등 → 응답 없이 끊지 않고 JSON 오류로 (그 연결은 버림)
+            self.log_message("%s sqlite error: %s", url.path, e)
+            if conn is not None:
+                conn.close()
+                conn = None
+            self._send(500, {"error": f"DB 오류: {type(e).__name__}: {e}"})
+            return
+        finally:
+            if conn is not None:
+                self.pool.put(conn)
+        self._send(200, body)
+
+
+def serve(db_path: Path, host: str = "127.0.0.1", port: int = 8765, pool_size: int = POOL_SIZE) -> None:
+    pool = ConnectionPool(db_path, pool_size)
+    handler = type("Handler", (QueryHandler,), {"pool": pool})
+    httpd = ThreadingHTTPServer((host, port), handler)
+    log(f"조회 API: http://{host}:{port}/api/trades (DB: {db_path})")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        pool.close()
+
+# ==========================
+# CLI
+# ==========================
+def main() -> None:
+    ap = argparse.ArgumentParser(description="거래 조회 API: manifest.json의 GeoJSON → SQLite → HTTP(JSON)")
+    ap.add_argument("command", choices=["build", "serve"], help="build: DB 갱신 / serve: API 서버 실행")
+    ap.add_argument("--data", default=str(dataset.DEFAULT_ROOT.parent), help=f"data 폴더(기본: {dataset.DEFAULT_ROOT.parent})")
+    ap.add_argument("--db", help=f"SQLite 경로(기본: <data>/{DB_NAME})")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--pool-size", type=int, default=POOL_SIZE, help="serve: 재사용할 읽기 전용 DB 연결 수")
+    ap.add_argument("--no-build", action="store_true", help="serve: 시작할 때 build 생략")
+    args = ap.parse_args()
+
+    data_root = Path(args.data).expanduser().resolve()
+    db_path = Path(args.db).expanduser().resolve() if args.db else data_root / DB_NAME
+    if args.command == "build" or not args.no_build:
+        build(data_root, db_path)
+    if args.command == "serve":
+        serve(db_path, args.host, args.port, args.pool_size)
+
+
+if __name__ == "__main__":
+    main()
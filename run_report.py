@@ -0,0 +1,267 @@
+# run_report.py
+# land.py / geocode_and_export.py 공용 실행 계측 → 실행 보고서(JSON) + Prometheus 텍스트(선택)
+# - 단계(stage): 이름/라벨별 걸린 시간, 처리 행 수, 그 동안 쓴 바이트 — 어느 단계가 느렸는지
+# - 카운터(count): HTTP 요청(엔드포인트/상태별), RTMS 재시도/실패, 응답·지오코딩 캐시 적중/미스, 쓴 바이트(파일 종류별)
+# - 히스토그램(observe): HTTP 요청 지연(엔드포인트별, 호스트 한도 대기 제외)
+# - 최대 RSS(프로세스 최대 메모리)
+# 프로세스 공용 상태 1개(스레드 안전) — http_session처럼 모듈 함수로 사용
+#
+# 보고서(JSON):
+#   {"script", "argv", "status", "started", "finished", "wall_seconds", "peak_rss_bytes",
+#    "stages": [{"stage", "labels", "seconds", "rows", "bytes"}, ...],         ← 실행 순서
+#    "stage_totals": {"fetch": {"runs", "seconds", "rows", "bytes"}, ...},
+#    "cache": {"rtms_cache": {"hit", "miss", "hit_ratio"}, "geocode_cache": {...}},
+#    "counters": [{"name", "labels", "value"}, ...],
+#    "histograms": [{"name", "labels", "buckets": [[le, 누적 건수], ...], "sum", "count"}, ...]}
+# Prometheus: 이름 앞에 realestate_, 카운터는 _total, 단계는 realestate_stage_seconds/rows/bytes 게이지
+#   (node_exporter textfile collector에 그대로 둘 수 있는 형식)
+#
+# 사용 예)
+#   import run_report
+#   run_report.start("land")
+#   with run_report.stage("fetch", ym="202511") as s:
+#       items = ...
+#       s["rows"] = len(items)
+#   run_report.count("rtms_cache", result="hit")
+#   run_report.observe("http_request_seconds", 0.12, endpoint="getRTMSDataSvcAptRent")
+#   run_report.finish(Path("data/_cache/reports/land.json"), prometheus_path=Path("land.prom"))
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+# ==========================
+# 설정
+# ==========================
+PREFIX = "realestate_"
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)  # 초
+REPORT_DIR = Path("data") / "_cache" / "reports"  # 기본 보고서 위치 (.gitignore의 data/_cache/)
+
+_lock = threading.Lock()
+_script = ""
+_started = time.time()
+_t0 = time.perf_counter()
+_stages: list[dict] = []
+_counters: dict[tuple[str, tuple], float] = {}
+_hists: dict[tuple[str, tuple], dict] = {}
+
+
+def log(msg: str):  print(f"[i] {msg}")
+
+
+def _key(name: str, labels: dict) -> tuple[str, tuple]:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def start(script: str) -> None:
+    """계측 초기화 (스크립트 시작 시 1회)"""
+    global _script, _started, _t0
+    with _lock:
+        _script, _started, _t0 = script, time.time(), time.perf_counter()
+        _stages.clear()
+        _counters.clear()
+        _hists.clear()
+
+# ==========================
+# 기록
+# ==========================
+def count(name: str, n: float = 1, **labels) -> None:
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + n
+
+
+def observe(name: str, value: float, buckets: tuple[float, ...] = LATENCY_BUCKETS, **labels) -> None:
+    key = _key(name, labels)
+    with _lock:
+        h = _hists.get(key)
+        if h is None:
+            h = _hists[key] = {"le": buckets, "counts": [0] * len(buckets), "sum": 0.0, "count": 0}
+        for i, le in enumerate(h["le"]):
+            if value <= le:
+                h["counts"][i] += 1
+                break
+        h["sum"] += value
+        h["count"] += 1
+
+
+def add_bytes(path: Path | str, n: int) -> None:
+    """파일 n바이트를 씀 (종류 = 확장자, .gz/.br은 앞 확장자까지: .rtc.gz)"""
+    suffixes = Path(path).suffixes[-2:] if Path(path).suffix in (".gz", ".br") else Path(path).suffixes[-1:]
+    count("bytes_written", n, kind="".join(suffixes).lstrip(".") or "-")
+
+
+def _bytes_total() -> float:
+    return sum(v for (name, _), v in _counters.items() if name == "bytes_written")
+
+
+@contextmanager
+def stage(name: str, **labels) -> Iterator[dict]:
+    """
+    with 블록 하나 = 단계 1건 (순차 단계용 — 쓴 바이트는 블록 전후 합계 차이).
+    블록 안에서 s["rows"] = 처리 행 수 를 채우면 함께 기록. 예외가 나도 기록(error 필드).
+    """
+    s = {"stage": name, "labels": {k: str(v) for k, v in labels.items()}, "rows": None}
+    with _lock:
+        b0 = _bytes_total()
+    t0 = time.perf_counter()
+    try:
+        yield s
+    except BaseException as e:
+        s["error"] = type(e).__name__
+        raise
+    finally:
+        s["seconds"] = round(time.perf_counter() - t0, 4)
+        with _lock:
+            s["bytes"] = int(_bytes_total() - b0)
+            _stages.append(s)
+
+
+def peak_rss_bytes() -> int | None:
+    """프로세스 최대 RSS (resource 모듈이 없는 Windows는 None)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(rss if sys.platform == "darwin" else rss * 1024)  # macOS는 바이트, 리눅스는 KB
+
+# ==========================
+# 보고서
+# ==========================
+def report(status: str = "ok") -> dict:
+    with _lock:
+        stages = [dict(s) for s in _stages]
+        counters = sorted(_counters.items())
+        hists = sorted(_hists.items())
+
+    totals: dict[str, dict] = {}
+    for s in stages:
+        t = totals.setdefault(s["stage"], {"runs": 0, "seconds": 0.0, "rows": 0, "bytes": 0})
+        t["runs"] += 1
+        t["seconds"] = round(t["seconds"] + s["seconds"], 4)
+        t["rows"] += s["rows"] or 0
+        t["bytes"] += s["bytes"]
+
+    cache: dict[str, dict] = {}
+    for (name, labels), v in counters:
+        result = dict(labels).get("result")
+        if name.endswith("_cache") and result in ("hit", "miss"):
+            c = cache.setdefault(name, {"hit": 0, "miss": 0})
+            c[result] += int(v)
+    for c in cache.values():
+        c["hit_ratio"] = round(c["hit"] / (c["hit"] + c["miss"]), 4) if c["hit"] + c["miss"] else None
+
+    return {
+        "script": _script, "argv": sys.argv[1:], "status": status,
+        "started": datetime.fromtimestamp(_started).isoformat(timespec="seconds"),
+        "finished": datetime.now().isoformat(timespec="seconds"),
+        "wall_seconds": round(time.perf_counter() - _t0, 3),
+        "peak_rss_bytes": peak_rss_bytes(),
+        "stages": stages,
+        "stage_totals": totals,
+        "cache": cache,
+        "counters": [{"name": n, "labels": dict(l), "value": v} for (n, l), v in counters],
+        "histograms": [
+            {"name": n, "labels": dict(l), "sum": round(h["sum"], 6), "count": h["count"],
+             "buckets": [[le, c] for le, c in zip(h["le"], _cumulative(h["counts"]))] + [["+Inf", h["count"]]]}
+            for (n, l), h in hists
+        ],
+    }
+
+
+def _cumulative(counts: list[int]) -> list[int]:
+    out, acc = [], 0
+    for c in counts:
+        acc += c
+        out.append(acc)
+    return out
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    esc = lambda v: str(v).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in labels.items()) + "}"
+
+
+def prometheus_text(rep: dict) -> str:
+    """report() 결과 → Prometheus 텍스트 노출 형식 (같은 이름의 샘플은 한 묶음으로)"""
+    families: dict[str, tuple[str, list[str]]] = {}
+
+    def emit(name: str, kind: str, labels: dict, value, suffix: str = ""):
+        families.setdefault(name, (kind, []))[1].append(f"{name}{suffix}{_labels(labels)} {value}")
+
+    base = {"script": rep["script"]}
+    emit(PREFIX + "run_wall_seconds", "gauge", base, rep["wall_seconds"])
+    emit(PREFIX + "run_success", "gauge", base, int(rep["status"] == "ok"))
+    if rep["peak_rss_bytes"] is not None:
+        emit(PREFIX + "peak_rss_bytes", "gauge", base, rep["peak_rss_bytes"])
+
+    # 같은 단계·라벨이 여러 번이면 합산(시계열 중복 방지)
+    stages: dict[tuple, list] = {}
+    for s in rep["stages"]:
+        t = stages.setdefault((s["stage"], *sorted(s["labels"].items())), [0.0, None, 0])
+        t[0] += s["seconds"]
+        if s["rows"] is not None:
+            t[1] = (t[1] or 0) + s["rows"]
+        t[2] += s["bytes"]
+    for (name, *labels), (seconds, rows, nbytes) in stages.items():
+        labels = {**base, "stage": name, **dict(labels)}
+        emit(PREFIX + "stage_seconds", "gauge", labels, round(seconds, 4))
+        if rows is not None:
+            emit(PREFIX + "stage_rows", "gauge", labels, rows)
+        emit(PREFIX + "stage_bytes", "gauge", labels, nbytes)
+
+    for c in rep["counters"]:
+        emit(f"{PREFIX}{c['name']}_total", "counter", {**base, **c["labels"]}, round(c["value"], 6))
+    for h in rep["histograms"]:
+        name, labels = PREFIX + h["name"], {**base, **h["labels"]}
+        for le, c in h["buckets"]:
+            emit(name, "histogram", {**labels, "le": le}, c, "_bucket")
+        emit(name, "histogram", labels, h["sum"], "_sum")
+        emit(name, "histogram", labels, h["count"], "_count")
+
+    lines = []
+    for name, (kind, samples) in families.items():
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)  # textfile collector가 반쪽 파일을 읽지 않게
+
+
+def default_report_path() -> Path:
+    return REPORT_DIR / f"{_script or 'run'}_{datetime.fromtimestamp(_started):%Y%m%d_%H%M%S}.json"
+
+
+def finish(report_path: Path | None = None, prometheus_path: Path | None = None, status: str = "ok") -> dict:
+    """보고서 저장(JSON, 선택 시 Prometheus) + 단계별 합계 출력"""
+    rep = report(status)
+    report_path = report_path or default_report_path()
+    _write(report_path, json.dumps(rep, ensure_ascii=False, indent=2))
+    if prometheus_path is not None:
+        _write(prometheus_path, prometheus_text(rep))
+    for name, t in rep["stage_totals"].items():
+        log(f"  {name:<14} {t['seconds']:9.2f}s  rows={t['rows']:,}  bytes={t['bytes']:,}  (x{t['runs']})")
+    for name, c in rep["cache"].items():
+        if c["hit_ratio"] is not None:
+            log(f"  {name:<14} hit={c['hit']:,} miss={c['miss']:,} ({c['hit_ratio']:.1%})")
+    rss = rep["peak_rss_bytes"]
+    log(f"실행 보고서 → {report_path} (wall={rep['wall_seconds']:.1f}s"
+        + (f", peak RSS={rss / 2**20:,.0f}MB" if rss else "") + ")"
+        + (f" / Prometheus → {prometheus_path}" if prometheus_path else ""))
+    return rep
@@ -0,0 +1,168 @@
+# search_index.py
+# 단지/건물명 검색 색인 — 모든 달의 단지를 한 파일로 모아 자동완성 (월별 feature를 받지 않고 검색)
+# - 달별 요약(data/YYYY/search/<stem>.json): 그 달 단지 목록 (GeoJSON 저장 때 함께 생성)
+#     {"count": 단지 수, "items": [[이름, 지역("구/시 법정동"), lng, lat, 거래 건수, 마지막 계약년월], ...]}
+# - 통합 색인(data/search_index.json + .gz): manifest의 달별 요약을 합친 것 (GeoJSON은 다시 읽지 않음)
+#     {"version": 1, "count": 단지 수, "months": 달 수,
+#      "items": [[이름, 지역, lng, lat, 거래 건수, 마지막 계약년월], ...],   ← 건수 많은 순, 번호 = 단지 id
+#      "grams": {"래미": [id 차분...]},   ← 정규화 이름의 2글자 조각 → 단지 id (오름차순, 차분 인코딩)
+#      "cho":   {"ㄹㅁ": [id 차분...]}}   ← 초성 문자열의 2글자 조각 → 단지 id
+#     단지 = (이름, 지역) — 이름이 같아도 지역이 다르면 다른 단지. 좌표는 가장 최근 달 것
+#     정규화: NFC, 소문자, 공백/괄호/-_.,· 제거 (data/search.js normalize와 같은 규칙)
+# - 검색(data/search.js): 질의 조각 중 가장 짧은 id 목록만 훑으며 포함 여부 확인
+#     → id가 건수 순이라 앞에서 limit개 찾으면 끝 (전체 단지를 훑지 않음)
+#     한 글자 질의는 조각 없이 건수 순으로 훑음(흔한 글자라 금방 limit개가 참)
+#
+# 사용 예)
+#   python search_index.py                 → data/manifest.json 기준으로 data/search_index.json 재생성
+#   python search_index.py path/to/data    (요약이 없는 달은 GeoJSON을 읽어 요약부터 만듦)
+
+from __future__ import annotations
+
+import gzip
+import json
+import re
+import sys
+import unicodedata
+from pathlib import Path
+
+import pandas as pd
+
+import map_export
+import map_tiles
+
+INDEX_NAME = "search_index.json"
+MANIFEST_NAME = "manifest.json"
+VERSION = 1
+
+_STRIP_RE = re.compile(r"[\s()\[\]\-_.,·]+")
+_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+
+
+def log(msg: str):  print(f"[i] {msg}")
+def warn(msg: str): print(f"[!] {msg}")
+
+# ==========================
+# 정규화 / 초성
+# ==========================
+def normalize(name: str) -> str:
+    return _STRIP_RE.sub("", unicodedata.normalize("NFC", name).lower())
+
+
+def chosung(text: str) -> str:
+    """한글 음절 → 초성 (그 외 글자는 그대로): "래미안" → "ㄹㅁㅇ" """
+    return "".join(_CHO[(ord(c) - 0xAC00) // 588] if "가" <= c <= "힣" else c for c in text)
+
+
+def bigrams(text: str) -> set[str]:
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+# ==========================
+# 달별 요약
+# ==========================
+def summary_path_for(geojson_path: Path) -> Path:
+    """data/YYYY/geojson/<stem>.geojson → data/YYYY/search/<stem>.json"""
+    return geojson_path.parent.parent / "search" / f"{geojson_path.stem}.json"
+
+
+def summarize(builder: map_export.CompactBuilder) -> dict:
+    """CompactBuilder → 그 달 단지 목록 (이름·지역별 건수, 첫 거래 좌표, 마지막 계약년월)"""
+    df = map_tiles.frame(builder)
+    col = lambda name: pd.Series(builder.column(name), dtype=object)
+    region = (col("구/시").fillna("").astype(str).str.strip() + " " + col("법정동").fillna("").astype(str).str.strip())
+    df = df.assign(region=region.str.strip())
+    df = df[df["name"] != "미상"]
+    g = df.groupby(["name", "region"], sort=False).agg(
+        lng=("lng", "first"), lat=("lat", "first"), n=("lng", "size"), ym=("ym", "max"))
+    items = [
+        [name, region, round(lng, 6), round(lat, 6), int(n), None if pd.isna(ym) else int(ym)]
+        for (name, region), lng, lat, n, ym in g.itertuples(name=None)
+    ]
+    return {"count": len(items), "items": items}
+
+
+def write_summary(geojson_path: Path, builder: map_export.CompactBuilder) -> Path:
+    path = summary_path_for(geojson_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    body = json.dumps(summarize(builder), ensure_ascii=False, separators=(",", ":"))
+    map_export.write_atomic(path, body.encode("utf-8"))
+    return path
+
+
+def _load_summary(geojson_path: Path) -> dict | None:
+    """달별 요약 읽기 — 없거나 GeoJSON보다 오래됐으면 GeoJSON에서 다시 만듦"""
+    path = summary_path_for(geojson_path)
+    if path.exists() and (not geojson_path.exists() or path.stat().st_mtime >= geojson_path.stat().st_mtime):
+        return json.loads(path.read_text(encoding="utf-8"))
+    if not geojson_path.exists():
+        return None
+    features = json.loads(geojson_path.read_bytes()).get("features", [])
+    write_summary(geojson_path, map_export.CompactBuilder().add(features))
+    log(f"검색 요약 생성: {path}")
+    return json.loads(path.read_text(encoding="utf-8"))
+
+# ==========================
+# 통합 색인
+# ==========================
+def merge(summaries: list[dict]) -> list[list]:
+    """달별 요약 → 단지 목록 (건수 합, 좌표는 마지막 계약년월이 가장 늦은 달 것), 건수 많은 순"""
+    merged: dict[tuple[str, str], list] = {}
+    for s in summaries:
+        for name, region, lng, lat, n, ym in s["items"]:
+            cur = merged.get((name, region))
+            if cur is None:
+                merged[(name, region)] = [name, region, lng, lat, n, ym]
+                continue
+            cur[4] += n
+            if ym is not None and (cur[5] is None or ym > cur[5]):
+                cur[2], cur[3], cur[5] = lng, lat, ym
+    return sorted(merged.values(), key=lambda x: (-x[4], x[0], x[1]))
+
+
+def _postings(keys_by_id: list[set[str]]) -> dict[str, list[int]]:
+    """id별 조각 집합 → 조각별 id 목록(오름차순, 첫 값 뒤로는 앞 id와의 차)"""
+    ids: dict[str, list[int]] = {}
+    for i, keys in enumerate(keys_by_id):
+        for k in keys:
+            ids.setdefault(k, []).append(i)
+    return {k: [v[0], *(b - a for a, b in zip(v, v[1:]))] for k, v in sorted(ids.items())}
+
+
+def build_index(items: list[list], months: int = 0) -> dict:
+    norms = [normalize(x[0]) for x in items]
+    return {
+        "version": VERSION, "count": len(items), "months": months, "items": items,
+        "grams": _postings([bigrams(s) for s in norms]),
+        "cho": _postings([bigrams(chosung(s)) for s in norms]),
+    }
+
+
+def write_index(data_root: Path) -> Path:
+    """data/manifest.json의 달별 요약을 합쳐 data/search_index.json(+ .gz) 저장"""
+    data_root = Path(data_root)
+    manifest = json.loads((data_root / MANIFEST_NAME).read_text(encoding="utf-8"))
+    kakao_map_dir = data_root.parent / "kakao-map"  # manifest 경로 기준
+    summaries = []
+    for item in manifest:
+        s = _load_summary((kakao_map_dir / item["path"]).resolve())
+        if s is None:
+            warn(f"GeoJSON/검색 요약 없음, 건너뜀: {item['path']}")
+            continue
+        summaries.append(s)
+
+    index = build_index(merge(summaries), months=len(summaries))
+    body = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    out = data_root / INDEX_NAME
+    map_export.write_atomic(out, body)
+    map_export.write_atomic(out.with_name(out.name + ".gz"), gzip.compress(body, compresslevel=9, mtime=0))
+    log(f"검색 색인 갱신 → {out} (단지={index['count']:,}, 달={len(summaries)}, {len(body):,}B)")
+    return out
+
+
+def main(argv: list[str]) -> None:
+    data_root = Path(argv[0]) if argv else Path(__file__).resolve().parent / "data"
+    write_index(data_root.expanduser().resolve())
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])